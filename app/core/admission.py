@@ -0,0 +1,300 @@
+# app/core/admission.py
+"""
+Adaptive admission control (opt-in: ADMISSION_CONTROL=true).
+
+Each route ("GET /entries/{entry_id}", ...) gets a concurrency limit. Requests
+over the limit wait in a bounded FIFO queue. A request is shed at once with
+ADMISSION_REJECT_STATUS (503 or 429) and `Retry-After` when:
+  - ADMISSION_QUEUE_SIZE requests are already waiting on that route, or
+  - its estimated wait exceeds ADMISSION_MAX_WAIT_MS, or
+  - it waited that long without getting a slot.
+So when Postgres slows down, excess requests fail fast instead of piling up
+in the event loop until everything times out.
+
+The limit follows DB latency (a gradient controller, after Netflix's
+concurrency-limits "Gradient2"). Each finished request that ran SQL reports
+its mean time per statement (app.db.instrumentation). A short and a long
+moving average of that latency are kept. While the short one stays within
+`tolerance` times the long one, a busy route's limit grows by about sqrt(limit);
+when it rises above, the limit shrinks in proportion, down to half per step.
+Health checks and /metrics are never limited. `register_admission_metrics`
+puts every route's limit, in-flight, queued and rejected counts on /metrics.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import Counter, deque
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+from typing import Any
+
+from starlette.responses import JSONResponse
+from starlette.routing import Match, Router
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.db.instrumentation import current_stats
+
+logger = logging.getLogger(__name__)
+
+EXEMPT_PATHS = frozenset({"/healthz", "/readyz", "/metrics"})
+
+
+class Overloaded(Exception):
+    """A request was shed; `retry_after` is a hint in seconds."""
+
+    def __init__(self, reason: str, retry_after: float) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def _ewma(current: float | None, sample: float, alpha: float) -> float:
+    return sample if current is None else current + alpha * (sample - current)
+
+
+class AdaptiveLimiter:
+    """Concurrency limit with a bounded wait queue for one route; see the module docstring."""
+
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        queue_size: int = 50,
+        max_wait: float = 1.0,
+        tolerance: float = 1.5,
+        smoothing: float = 0.2,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, min_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.queue_size = queue_size
+        self.max_wait = max_wait
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.in_flight = 0
+        # Mean seconds per SQL statement: recent (short) and baseline (long)
+        self.short_latency: float | None = None
+        self.long_latency: float | None = None
+        # Seconds from admission to release, for wait estimates
+        self.service_time: float | None = None
+        self.rejected: Counter[str] = Counter()
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def capacity(self) -> int:
+        return int(self.limit)
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def estimated_wait(self) -> float:
+        """Seconds a new arrival would queue: everyone ahead, `capacity` at a time."""
+        return (len(self._waiters) + 1) * (self.service_time or 0.0) / self.capacity
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting in line if needed; raises Overloaded when shed."""
+        if self.in_flight < self.capacity and not self._waiters:
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self.queue_size:
+            self._shed("queue_full")
+        if self.estimated_wait() > self.max_wait:
+            self._shed("deadline")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait({waiter}, timeout=self.max_wait)
+        except asyncio.CancelledError:
+            # Client went away while queued; give back a slot handed over meanwhile
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._drop(waiter)
+            raise
+        if not waiter.done():
+            self._drop(waiter)
+            self._shed("deadline")
+        # release() handed this request its slot (in_flight already counts it)
+
+    def release(self, duration: float | None = None, db_latency: float | None = None) -> None:
+        """Give a slot back; `duration` and per-statement `db_latency` feed the limit."""
+        if duration is not None:
+            self.service_time = _ewma(self.service_time, duration, 0.2)
+        if db_latency is not None:
+            self._adapt(db_latency)
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < self.capacity:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _adapt(self, latency: float) -> None:
+        short = self.short_latency = _ewma(self.short_latency, latency, 0.3)
+        long = self.long_latency = _ewma(self.long_latency, latency, 0.02)
+        if long > 2 * short:
+            # Coming out of a slow phase the baseline is inflated; let it drop quickly
+            self.long_latency = long = long * 0.95
+        gradient = max(0.5, min(1.0, self.tolerance * long / short)) if short > 0 else 1.0
+        if gradient == 1.0 and self.in_flight < self.limit / 2:
+            return  # healthy but mostly idle: a larger limit would be untested
+        target = self.limit * gradient + math.sqrt(self.limit)
+        limit = (1 - self.smoothing) * self.limit + self.smoothing * target
+        self.limit = min(max(limit, self.min_limit), self.max_limit)
+
+    def _drop(self, waiter: asyncio.Future[None]) -> None:
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _shed(self, reason: str) -> None:
+        self.rejected[reason] += 1
+        raise Overloaded(reason, max(self.estimated_wait(), self.service_time or 0.0))
+
+
+class AdmissionController:
+    """Process-wide registry of one AdaptiveLimiter per route, created on first use."""
+
+    def __init__(self, limiter_factory: Callable[[], AdaptiveLimiter] = AdaptiveLimiter) -> None:
+        self.limiter_factory = limiter_factory
+        self.limiters: dict[str, AdaptiveLimiter] = {}
+
+    def limiter(self, route: str) -> AdaptiveLimiter:
+        limiter = self.limiters.get(route)
+        if limiter is None:
+            limiter = self.limiters[route] = self.limiter_factory()
+        return limiter
+
+
+class AdmissionMiddleware:
+    """
+    Applies `controller` to each request matched by `router`. Install it inside
+    QueryStatsMiddleware so the request's DB time is available on release.
+    Requests no route fully matches (404/405) pass straight through.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        controller: AdmissionController,
+        router: Router,
+        status_code: int = 503,
+        exempt: Iterable[str] = EXEMPT_PATHS,
+    ) -> None:
+        self.app = app
+        self.controller = controller
+        self.router = router
+        self.status_code = status_code
+        self.exempt = frozenset(exempt)
+
+    def route_key(self, scope: Scope) -> str | None:
+        # Same matching the router is about to do; only the template is kept
+        for route in self.router.routes:
+            match, _ = route.matches(scope)
+            if match is Match.FULL:
+                return f"{scope['method']} {getattr(route, 'path', '')}"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        key = None
+        if scope["type"] == "http" and scope["path"] not in self.exempt:
+            key = self.route_key(scope)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.controller.limiter(key)
+        try:
+            await limiter.acquire()
+        except Overloaded as e:
+            logger.debug("Shed %s (%s)", key, e.reason)
+            response = JSONResponse(
+                {"detail": "Server is busy, retry later"},
+                status_code=self.status_code,
+                headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+            )
+            await response(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            stats = current_stats()
+            db_latency = stats.db_seconds / stats.queries if stats and stats.queries else None
+            limiter.release(time.perf_counter() - start, db_latency)
+
+
+@lru_cache
+def get_admission_controller() -> AdmissionController | None:
+    """Process-wide controller per settings, or None when ADMISSION_CONTROL is off."""
+    settings = get_settings()
+    if not settings.admission_control:
+        return None
+    return AdmissionController(
+        lambda: AdaptiveLimiter(
+            initial_limit=settings.admission_initial_limit,
+            max_limit=settings.admission_max_limit,
+            queue_size=settings.admission_queue_size,
+            max_wait=settings.admission_max_wait_ms / 1000,
+        )
+    )
+
+
+def register_admission_metrics(controller: AdmissionController | None) -> None:
+    """Expose each route's limiter state on the default Prometheus registry."""
+    if controller is None:
+        return
+    try:
+        from prometheus_client import REGISTRY
+        from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+    except Exception as e:  # pragma: no cover
+        logger.warning("Admission metrics disabled: %s", e)
+        return
+    limiters = controller.limiters
+
+    class _AdmissionCollector:
+        def collect(self) -> Any:
+            limit = GaugeMetricFamily(
+                "admission_limit", "Current adaptive concurrency limit", labels=["route"]
+            )
+            in_flight = GaugeMetricFamily(
+                "admission_in_flight", "Requests holding a slot", labels=["route"]
+            )
+            queued = GaugeMetricFamily(
+                "admission_queued", "Requests waiting for a slot", labels=["route"]
+            )
+            latency = GaugeMetricFamily(
+                "admission_db_latency_seconds",
+                "Mean time per SQL statement the limit adapts to (short/long average)",
+                labels=["route", "window"],
+            )
+            rejected = CounterMetricFamily(
+                "admission_rejected",
+                "Requests shed (queue_full: queue at capacity, deadline: wait too long)",
+                labels=["route", "reason"],
+            )
+            for route, limiter in list(limiters.items()):
+                limit.add_metric([route], limiter.limit)
+                in_flight.add_metric([route], limiter.in_flight)
+                queued.add_metric([route], limiter.queued)
+                for window, value in (
+                    ("short", limiter.short_latency),
+                    ("long", limiter.long_latency),
+                ):
+                    if value is not None:
+                        latency.add_metric([route, window], value)
+                for reason in ("queue_full", "deadline"):
+                    rejected.add_metric([route, reason], limiter.rejected[reason])
+            yield from (limit, in_flight, queued, latency, rejected)
+
+    REGISTRY.register(_AdmissionCollector())
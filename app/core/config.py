@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import os
 from functools import lru_cache
-from typing import ClassVar
+from typing import TYPE_CHECKING, ClassVar, Literal
 
 from pydantic import AliasChoices, Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict  # Pydantic v2 settings
@@ -16,6 +16,15 @@ class Settings(BaseSettings):
     - Exposes a .sync_database_url for Alembic (strips +asyncpg).
     - Adds Ops/Monitoring toggles used by app.main:
         LOG_LEVEL, PROMETHEUS_ENABLED, SENTRY_DSN, DEV_BIND_ALL
+    - Connection pool sizing for app.db.session (DB_POOL, DB_POOL_SIZE, ...)
+    - Optional read replica for app.db.routing (DATABASE_REPLICA_URL, REPLICA_*)
+    - Entry read cache for app.services.cache (ENTRY_CACHE, ENTRY_CACHE_TTL, ...)
+    - Group commit for creates in app.services.group_commit (ENTRY_GROUP_COMMIT, ...)
+    - Per-request DB instrumentation (SERVER_TIMING, DB_QUERY_WARN_THRESHOLD)
+    - Startup warm-up for app.services.warmup (WARMUP, WARMUP_CONNECTIONS, WARMUP_TIMEOUT)
+    - Adaptive admission control in app.core.admission (ADMISSION_CONTROL, ...)
+    - Entry partition maintenance for app.db.partitions (ENTRY_PARTITIONS_AHEAD, ...)
+    - Production server for app.serve (WEB_CONCURRENCY, HOST, PORT, MAX_REQUESTS, ...)
     """
 
     # ---------------------- Database (pieces) ----------------------
@@ -33,6 +42,196 @@ class Settings(BaseSettings):
         validation_alias=AliasChoices("DATABASE_URL", "database_url"),
     )
 
+    # Optional read replica; GET list/search/get read from it when set (app.db.routing)
+    DATABASE_REPLICA_URL: str | None = Field(
+        default=None,
+        validation_alias=AliasChoices("DATABASE_REPLICA_URL", "database_replica_url"),
+    )
+    # Seconds a client keeps reading from the primary after its own write
+    replica_sticky_seconds: int = Field(
+        default=5,
+        ge=0,
+        validation_alias=AliasChoices("REPLICA_STICKY_SECONDS", "replica_sticky_seconds"),
+    )
+    # After a failed replica connect, seconds to read from the primary before retrying
+    replica_retry_seconds: float = Field(
+        default=30.0,
+        gt=0,
+        validation_alias=AliasChoices("REPLICA_RETRY_SECONDS", "replica_retry_seconds"),
+    )
+    replica_connect_timeout: float = Field(
+        default=2.0,
+        gt=0,
+        validation_alias=AliasChoices("REPLICA_CONNECT_TIMEOUT", "replica_connect_timeout"),
+    )
+
+    # ---------------------- Connection pool ----------------------
+    # "queue" = pooled connections (production); "null" = new connection per
+    # checkout, which stays safe when tests run on several event loops.
+    db_pool: Literal["queue", "null"] = Field(
+        default="queue", validation_alias=AliasChoices("DB_POOL", "db_pool")
+    )
+    db_pool_size: int = Field(
+        default=5, ge=1, validation_alias=AliasChoices("DB_POOL_SIZE", "db_pool_size")
+    )
+    db_max_overflow: int = Field(
+        default=10, ge=0, validation_alias=AliasChoices("DB_MAX_OVERFLOW", "db_max_overflow")
+    )
+    db_pool_timeout: float = Field(
+        default=30.0, gt=0, validation_alias=AliasChoices("DB_POOL_TIMEOUT", "db_pool_timeout")
+    )
+    db_pool_pre_ping: bool = Field(
+        default=True, validation_alias=AliasChoices("DB_POOL_PRE_PING", "db_pool_pre_ping")
+    )
+    # Seconds before a connection is replaced; -1 disables recycling
+    db_pool_recycle: int = Field(
+        default=1800, validation_alias=AliasChoices("DB_POOL_RECYCLE", "db_pool_recycle")
+    )
+    # asyncpg prepared statements kept per connection (LRU keyed by SQL text).
+    # Must hold every distinct statement the app runs; 0 disables (pgbouncer
+    # in transaction mode cannot keep prepared statements).
+    db_statement_cache_size: int = Field(
+        default=256,
+        ge=0,
+        validation_alias=AliasChoices("DB_STATEMENT_CACHE_SIZE", "db_statement_cache_size"),
+    )
+
+    # ---------------------- Startup warm-up ----------------------
+    warmup: bool = Field(default=True, validation_alias=AliasChoices("WARMUP", "warmup"))
+    # Pooled connections to open and prepare at startup; unset = DB_POOL_SIZE
+    warmup_connections: int | None = Field(
+        default=None,
+        ge=0,
+        validation_alias=AliasChoices("WARMUP_CONNECTIONS", "warmup_connections"),
+    )
+    # Upper bound on warm-up; the worker reports ready afterwards either way
+    warmup_timeout: float = Field(
+        default=15.0, gt=0, validation_alias=AliasChoices("WARMUP_TIMEOUT", "warmup_timeout")
+    )
+
+    # ---------------------- Entry cache ----------------------
+    # "memory" = per-process LRU (other workers see writes after the TTL);
+    # "redis" = shared via REDIS_URL; "none" = always read from Postgres.
+    entry_cache: Literal["memory", "redis", "none"] = Field(
+        default="memory", validation_alias=AliasChoices("ENTRY_CACHE", "entry_cache")
+    )
+    entry_cache_ttl: float = Field(
+        default=5.0, gt=0, validation_alias=AliasChoices("ENTRY_CACHE_TTL", "entry_cache_ttl")
+    )
+    entry_cache_max_entries: int = Field(
+        default=10_000,
+        ge=1,
+        validation_alias=AliasChoices("ENTRY_CACHE_MAX_ENTRIES", "entry_cache_max_entries"),
+    )
+    redis_url: str = Field(
+        default="redis://localhost:6379/0", validation_alias=AliasChoices("REDIS_URL", "redis_url")
+    )
+    # Seconds an exact X-Total-Count (?count=exact) is reused per query; 0 = never cached
+    entry_count_ttl: float = Field(
+        default=10.0, ge=0, validation_alias=AliasChoices("ENTRY_COUNT_TTL", "entry_count_ttl")
+    )
+
+    # ---------------------- Group commit ----------------------
+    # Batch concurrent POST /entries/ into one INSERT + COMMIT (off by default)
+    entry_group_commit: bool = Field(
+        default=False, validation_alias=AliasChoices("ENTRY_GROUP_COMMIT", "entry_group_commit")
+    )
+    entry_group_commit_max_items: int = Field(
+        default=100,
+        ge=1,
+        validation_alias=AliasChoices(
+            "ENTRY_GROUP_COMMIT_MAX_ITEMS", "entry_group_commit_max_items"
+        ),
+    )
+    entry_group_commit_max_wait_ms: float = Field(
+        default=5.0,
+        ge=0,
+        validation_alias=AliasChoices(
+            "ENTRY_GROUP_COMMIT_MAX_WAIT_MS", "entry_group_commit_max_wait_ms"
+        ),
+    )
+    # Creates queued at most; further ones wait for room
+    entry_group_commit_max_pending: int = Field(
+        default=1000,
+        ge=1,
+        validation_alias=AliasChoices(
+            "ENTRY_GROUP_COMMIT_MAX_PENDING", "entry_group_commit_max_pending"
+        ),
+    )
+
+    # ---------------------- Admission control (app.core.admission) ----------------------
+    # Per-route concurrency limits that shrink when DB latency rises (off by default)
+    admission_control: bool = Field(
+        default=False, validation_alias=AliasChoices("ADMISSION_CONTROL", "admission_control")
+    )
+    admission_initial_limit: int = Field(
+        default=20,
+        ge=1,
+        validation_alias=AliasChoices("ADMISSION_INITIAL_LIMIT", "admission_initial_limit"),
+    )
+    admission_max_limit: int = Field(
+        default=200,
+        ge=1,
+        validation_alias=AliasChoices("ADMISSION_MAX_LIMIT", "admission_max_limit"),
+    )
+    # Requests that may wait for a slot per route; beyond that they are shed at once
+    admission_queue_size: int = Field(
+        default=50,
+        ge=0,
+        validation_alias=AliasChoices("ADMISSION_QUEUE_SIZE", "admission_queue_size"),
+    )
+    # Longest a request may wait for a slot (also the cutoff for the estimated wait)
+    admission_max_wait_ms: float = Field(
+        default=1000.0,
+        ge=0,
+        validation_alias=AliasChoices("ADMISSION_MAX_WAIT_MS", "admission_max_wait_ms"),
+    )
+    admission_reject_status: Literal[429, 503] = Field(
+        default=503,
+        validation_alias=AliasChoices("ADMISSION_REJECT_STATUS", "admission_reject_status"),
+    )
+
+    # ---------------------- Entry partitions (app.db.partitions) ----------------------
+    # Monthly partitions kept ready beyond the current month
+    entry_partitions_ahead: int = Field(
+        default=3,
+        ge=0,
+        validation_alias=AliasChoices("ENTRY_PARTITIONS_AHEAD", "entry_partitions_ahead"),
+    )
+    # Detach (or drop, with --drop) partitions older than this many months; unset = keep all
+    entry_partition_retention_months: int | None = Field(
+        default=None,
+        ge=1,
+        validation_alias=AliasChoices(
+            "ENTRY_PARTITION_RETENTION_MONTHS", "entry_partition_retention_months"
+        ),
+    )
+
+    # ---------------------- Production server (app.serve) ----------------------
+    # Worker processes; unset = one per CPU available to this process/container
+    web_concurrency: int | None = Field(
+        default=None, ge=1, validation_alias=AliasChoices("WEB_CONCURRENCY", "web_concurrency")
+    )
+    web_host: str = Field(default="127.0.0.1", validation_alias=AliasChoices("HOST", "web_host"))
+    web_port: int = Field(default=8000, validation_alias=AliasChoices("PORT", "web_port"))
+    # Recycle a worker after this many requests (0 = never), +- random jitter so
+    # workers don't all restart at once
+    web_max_requests: int = Field(
+        default=0, ge=0, validation_alias=AliasChoices("MAX_REQUESTS", "web_max_requests")
+    )
+    web_max_requests_jitter: int = Field(
+        default=0,
+        ge=0,
+        validation_alias=AliasChoices("MAX_REQUESTS_JITTER", "web_max_requests_jitter"),
+    )
+    # Seconds a stopping worker waits for in-flight requests (SIGTERM / SIGHUP restart)
+    web_graceful_timeout: int = Field(
+        default=30, ge=0, validation_alias=AliasChoices("GRACEFUL_TIMEOUT", "web_graceful_timeout")
+    )
+    web_keepalive: int = Field(
+        default=5, ge=1, validation_alias=AliasChoices("KEEP_ALIVE", "web_keepalive")
+    )
+
     # ---------------------- Ops & Monitoring ----------------------
     log_level: str = Field(default="INFO", validation_alias=AliasChoices("LOG_LEVEL", "log_level"))
     prometheus_enabled: bool = Field(
@@ -41,6 +240,16 @@ class Settings(BaseSettings):
     sentry_dsn: str | None = Field(
         default=None, validation_alias=AliasChoices("SENTRY_DSN", "sentry_dsn")
     )
+    # Server-Timing header with per-request DB time/query count (app.core.server_timing)
+    server_timing: bool = Field(
+        default=True, validation_alias=AliasChoices("SERVER_TIMING", "server_timing")
+    )
+    # Log a warning when one request runs more queries than this; 0 disables
+    db_query_warn_threshold: int = Field(
+        default=20,
+        ge=0,
+        validation_alias=AliasChoices("DB_QUERY_WARN_THRESHOLD", "db_query_warn_threshold"),
+    )
     dev_bind_all: bool = Field(
         default=False, validation_alias=AliasChoices("DEV_BIND_ALL", "dev_bind_all")
     )
@@ -95,6 +304,14 @@ class Settings(BaseSettings):
             f"@{self.db_host}:{self.db_port}/{self.db_name}"
         )
 
+    @property
+    def replica_database_url(self) -> str | None:
+        """DATABASE_REPLICA_URL normalized to the async driver, or None if unset."""
+        url = self.DATABASE_REPLICA_URL
+        if url and url.startswith("postgresql://"):
+            url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+        return url or None
+
     @property
     def sync_database_url(self) -> str:
         """
@@ -109,4 +326,14 @@ def get_settings() -> Settings:
     return Settings()
 
 
-settings = get_settings()
+if TYPE_CHECKING:
+    settings: Settings
+
+
+def __getattr__(name: str) -> Settings:
+    # `settings` is built on first use rather than at import (reads env/.env once).
+    # Modules imported by app.main call get_settings() inside functions instead,
+    # so `import app.main` neither reads the environment nor builds engines.
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
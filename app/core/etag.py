@@ -0,0 +1,51 @@
+# app/core/etag.py
+"""
+Strong ETags for entries and entry pages.
+An entry's representation only changes when `updated_at` does, so
+`(id, updated_at)` identifies it without hashing the serialized body.
+"""
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable
+from datetime import datetime
+from uuid import UUID
+
+from app.schemas.entry import EntryOut, EntryPage
+
+
+def _etag(parts: Iterable[str]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\x00")
+    return f'"{digest.hexdigest()}"'
+
+
+def entry_etag(entry_id: UUID | str, updated_at: datetime) -> str:
+    return _etag((str(entry_id), updated_at.isoformat()))
+
+
+def page_etag(page: EntryPage) -> str:
+    """Aggregate ETag over every item's version plus the cursor to the next page."""
+    return _etag(_page_parts(page.items, page.next_cursor))
+
+
+def _page_parts(items: list[EntryOut], next_cursor: str | None) -> Iterable[str]:
+    for item in items:
+        yield str(item.id)
+        yield item.updated_at.isoformat()
+    yield next_cursor or ""
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    `If-None-Match` evaluation (RFC 9110 §13.1.2): weak comparison,
+    comma-separated candidates, `*` matches any current representation.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
@@ -0,0 +1,26 @@
+# app/core/ids.py
+"""
+Time-ordered entry ids: UUID version 7 (RFC 9562), until the stdlib has one.
+
+    | unix_ts_ms: 48 | ver: 4 | sub-ms: 12 | var: 2 | random: 62 |
+
+Ids sort by creation time, so new keys land at the right edge of the primary
+key B-tree instead of on a random leaf. The 12 bits after the version hold the
+sub-millisecond fraction (RFC 9562 method 3), which keeps ids from one process
+in order at ~250 ns resolution; 62 random bits keep them unique.
+"""
+from __future__ import annotations
+
+import os
+import time
+from uuid import UUID
+
+_RANDOM_BITS = (1 << 62) - 1
+
+
+def uuid7(ns: int | None = None) -> UUID:
+    """A new version 7 UUID for `ns` nanoseconds since the epoch (default: now)."""
+    ms, sub_ms = divmod(time.time_ns() if ns is None else ns, 1_000_000)
+    fraction = sub_ms * 4096 // 1_000_000
+    random = int.from_bytes(os.urandom(8)) & _RANDOM_BITS
+    return UUID(int=(ms << 80) | (7 << 76) | (fraction << 64) | (0b10 << 62) | random)
@@ -0,0 +1,111 @@
+# app/core/integrations.py
+"""
+Optional integrations (Prometheus, Sentry), imported and configured from the
+app lifespan instead of at import time. Importing `app.main` therefore stays
+cheap for CLIs, Alembic and freshly spawned workers.
+
+Starlette refuses `add_middleware()` once the app has started, which is before
+lifespan runs, so app.main installs a `MiddlewareSlot` up front; integrations
+add their middleware into the slot with the same call they would make on the app.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class MiddlewareSlot:
+    """
+    Placeholder in the middleware stack that can gain middleware after startup.
+    Install with `app.add_middleware(slot.bind)`; later `slot.add_middleware(cls, **kw)`
+    wraps whatever sits below the slot, as `app.add_middleware` would have.
+    """
+
+    def __init__(self) -> None:
+        self._app: ASGIApp | None = None
+        self._pending: list[tuple[Any, dict[str, Any]]] = []
+
+    def bind(self, app: ASGIApp) -> ASGIApp:
+        # Called by Starlette when it builds the middleware stack
+        self._app = app
+        for cls, options in self._pending:
+            self._app = cls(self._app, **options)
+        self._pending.clear()
+        return self._dispatch
+
+    def add_middleware(self, cls: Any, **options: Any) -> None:
+        if self._app is None:
+            self._pending.append((cls, options))  # stack not built yet
+        else:
+            self._app = cls(self._app, **options)
+
+    async def _dispatch(self, scope: Scope, receive: Receive, send: Send) -> None:
+        assert self._app is not None  # nosec B101: bind() always runs first
+        await self._app(scope, receive, send)
+
+
+_prometheus_ready = False
+
+
+def setup_prometheus(app: FastAPI, slot: MiddlewareSlot) -> None:
+    """
+    HTTP metrics middleware + /metrics route, plus the DB pool/statement-cache/query,
+    entry cache and admission control collectors.
+    """
+    global _prometheus_ready
+    if _prometheus_ready:
+        return  # lifespan ran before (tests); metrics live in the global registry
+    try:
+        from prometheus_fastapi_instrumentator import Instrumentator
+
+        from app.core.admission import get_admission_controller, register_admission_metrics
+        from app.core.config import settings
+        from app.db.metrics import (
+            register_pool_metrics,
+            register_request_db_metrics,
+            register_statement_cache_metrics,
+        )
+        from app.db.session import get_engine
+        from app.services.cache import get_entry_cache, register_cache_metrics
+
+        # instrument() only calls `.add_middleware`, which the slot provides
+        Instrumentator().instrument(slot).expose(  # type: ignore[arg-type]
+            app, endpoint="/metrics", include_in_schema=False
+        )
+        register_pool_metrics(get_engine())
+        register_statement_cache_metrics(get_engine(), settings.db_statement_cache_size)
+        register_request_db_metrics()
+        register_cache_metrics(get_entry_cache())
+        register_admission_metrics(get_admission_controller())
+        _prometheus_ready = True
+    except Exception as e:  # pragma: no cover
+        logger.warning("Prometheus metrics disabled: %s", e)
+
+
+def setup_sentry(dsn: str) -> None:
+    """
+    Init Sentry. Its FastAPI integration patches Starlette.__call__, which also
+    takes effect for an app that is already running.
+    """
+    try:
+        from sentry_sdk import init as sentry_init
+        from sentry_sdk.integrations.fastapi import FastApiIntegration
+
+        sentry_init(dsn=dsn, integrations=[FastApiIntegration()])
+        logger.info("Sentry initialized")
+    except Exception as e:  # pragma: no cover
+        logger.warning("Sentry disabled: %s", e)
+
+
+def setup_integrations(app: FastAPI, slot: MiddlewareSlot, cfg: Settings) -> None:
+    if cfg.prometheus_enabled:
+        setup_prometheus(app, slot)
+    if cfg.sentry_dsn:
+        setup_sentry(cfg.sentry_dsn)
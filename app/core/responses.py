@@ -0,0 +1,25 @@
+# app/core/responses.py
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic import BaseModel
+from starlette.responses import Response
+
+
+class ModelJSONResponse(Response):
+    """
+    JSON response rendered straight from an already-validated pydantic model.
+
+    Returning a Response from a handler makes FastAPI skip `response_model`
+    re-validation and its jsonable_encoder/json.dumps pass, so the model is
+    serialized exactly once, by pydantic-core. Keep `response_model=` on the
+    route so the OpenAPI schema still documents the body.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return super().render(content)
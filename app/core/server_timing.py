@@ -0,0 +1,74 @@
+# app/core/server_timing.py
+from __future__ import annotations
+
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db import metrics
+from app.db.instrumentation import QueryStats, track_queries
+
+logger = logging.getLogger(__name__)
+
+
+def route_label(scope: Scope) -> str:
+    """Route template (e.g. "/entries/{entry_id}") so metric labels stay bounded."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+def server_timing(stats: QueryStats, elapsed: float) -> str:
+    """`Server-Timing` value: DB time (with query count) and total handler time, in ms."""
+    return (
+        f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.queries} queries", '
+        f"app;dur={elapsed * 1000:.2f}"
+    )
+
+
+class QueryStatsMiddleware:
+    """
+    Per-request DB accounting (see app.db.instrumentation).
+    - adds a `Server-Timing` header (`db` = time in Postgres, `app` = time until
+      the response started), readable in browser devtools;
+    - records `db_queries_per_request` / `db_time_per_request_seconds` by route;
+    - logs a warning when a request runs more than `warn_threshold` queries
+      (0 disables), which usually means an N+1 loop.
+    Queries issued while a streaming body is sent are counted in the metrics
+    but not in the header, which has already gone out.
+    """
+
+    def __init__(self, app: ASGIApp, warn_threshold: int = 0, header: bool = True) -> None:
+        self.app = app
+        self.warn_threshold = warn_threshold
+        self.header = header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        with track_queries() as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                if self.header and message["type"] == "http.response.start":
+                    value = server_timing(stats, time.perf_counter() - start)
+                    MutableHeaders(scope=message).append("Server-Timing", value)
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                route = route_label(scope)
+                metrics.observe_request_db(route, stats.queries, stats.db_seconds)
+                if self.warn_threshold and stats.queries > self.warn_threshold:
+                    logger.warning(
+                        "%s %s ran %d queries (threshold %d, %.1f ms in DB)",
+                        scope["method"],
+                        route,
+                        stats.queries,
+                        self.warn_threshold,
+                        stats.db_seconds * 1000,
+                    )
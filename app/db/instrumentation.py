@@ -0,0 +1,126 @@
+# app/db/instrumentation.py
+"""
+Per-request query accounting via SQLAlchemy engine events.
+
+`track_queries()` opens a scope (one per HTTP request, see
+app.core.server_timing); every statement executed inside it bumps the scope's
+query count and DB time. The async engine runs its sync events in a greenlet
+that shares the caller's contextvars, so the scope follows the request task.
+Statements issued outside any scope are not counted; statements that fail are.
+A statement's start time lives on its execution context, so nothing is left
+behind on the pooled connection when it raises.
+
+The engine's connections are also tracked, so `prepared_statement_counts()`
+can report how full each connection's asyncpg prepared-statement cache is.
+"""
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+from weakref import WeakKeyDictionary, WeakSet
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine, ExceptionContext, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import ConnectionPoolEntry
+
+
+@dataclass
+class QueryStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+
+    def add(self, other: QueryStats) -> None:
+        """Count `other`'s work here too (DB work done on this request's behalf)."""
+        self.queries += other.queries
+        self.db_seconds += other.db_seconds
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+# ExecutionContext attribute holding the running cursor execute's start time
+_START = "_query_stats_start"
+
+# Pool entries per engine; an entry outlives reconnects, and is dropped with its pool
+_connections: WeakKeyDictionary[Engine, WeakSet[ConnectionPoolEntry]] = WeakKeyDictionary()
+
+
+def current_stats() -> QueryStats | None:
+    """Stats for the active scope, or None outside `track_queries()`."""
+    return _current.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count queries and DB time for everything executed inside the block."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _before_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: ExecutionContext | None,
+    executemany: bool,
+) -> None:
+    if context is not None and _current.get() is not None:
+        setattr(context, _START, time.perf_counter())
+
+
+def _record(context: ExecutionContext | None) -> None:
+    stats = _current.get()
+    start = getattr(context, _START, None)
+    if stats is None or start is None:
+        return
+    # Cleared: batched executemany runs several cursor executes in one context
+    setattr(context, _START, None)
+    stats.queries += 1
+    stats.db_seconds += time.perf_counter() - start
+
+
+def _after_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: ExecutionContext | None,
+    executemany: bool,
+) -> None:
+    _record(context)
+
+
+def _handle_error(exception_context: ExceptionContext) -> None:
+    _record(exception_context.execution_context)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attach the query counters to `engine` (idempotent)."""
+    target = engine.sync_engine
+    if not event.contains(target, "before_cursor_execute", _before_cursor_execute):
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target, "after_cursor_execute", _after_cursor_execute)
+        event.listen(target, "handle_error", _handle_error)
+    if target not in _connections:
+        entries: WeakSet[ConnectionPoolEntry] = WeakSet()
+        _connections[target] = entries
+        event.listen(target, "connect", lambda _dbapi_conn, entry: entries.add(entry))
+
+
+def prepared_statement_counts(engine: AsyncEngine) -> list[int]:
+    """Statements in the asyncpg prepared-statement cache of each open connection."""
+    counts = []
+    for entry in list(_connections.get(engine.sync_engine, ())):
+        cache = getattr(entry.dbapi_connection, "_prepared_statement_cache", None)
+        if cache is not None:
+            counts.append(len(cache))
+    return counts
@@ -0,0 +1,132 @@
+# app/db/metrics.py
+"""
+Prometheus metrics for the DB connection pool, the asyncpg prepared-statement
+cache and per-request query load.
+prometheus_client is optional (it ships with prometheus-fastapi-instrumentator);
+until the matching `register_*` runs, the observe helpers are no-ops.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+from app.db.instrumentation import prepared_statement_counts
+
+_pool_wait: Any = None
+_pool_connect: Any = None
+_request_queries: Any = None
+_request_db_time: Any = None
+
+
+def observe_pool_wait(seconds: float) -> None:
+    """Record how long a checkout waited for a pooled connection."""
+    if _pool_wait is not None:
+        _pool_wait.observe(seconds)
+
+
+def observe_pool_connect(seconds: float) -> None:
+    """Record how long the pool took to open a new connection."""
+    if _pool_connect is not None:
+        _pool_connect.observe(seconds)
+
+
+def observe_request_db(route: str, queries: int, seconds: float) -> None:
+    """Record one request's query count and time spent in the DB."""
+    if _request_queries is not None:
+        _request_queries.labels(route=route).observe(queries)
+        _request_db_time.labels(route=route).observe(seconds)
+
+
+def register_pool_metrics(engine: AsyncEngine) -> None:
+    """Expose pool gauges + checkout wait and connect histograms on the default registry."""
+    global _pool_wait, _pool_connect
+    pool = engine.sync_engine.pool
+    if _pool_wait is not None or not isinstance(pool, QueuePool):
+        return  # already registered, or NullPool (nothing to report)
+
+    try:
+        from prometheus_client import Gauge, Histogram
+    except Exception as e:  # pragma: no cover
+        logging.getLogger(__name__).warning("Pool metrics disabled: %s", e)
+        return
+
+    Gauge("db_pool_size", "Configured pool size").set_function(pool.size)
+    Gauge("db_pool_checked_out", "Connections currently checked out").set_function(pool.checkedout)
+    Gauge("db_pool_overflow", "Connections open beyond pool_size").set_function(
+        lambda: max(pool.overflow(), 0)
+    )
+    _pool_wait = Histogram(
+        "db_pool_wait_seconds",
+        "Time a checkout waited for an idle pooled connection (excludes opening new ones)",
+        buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+    )
+    _pool_connect = Histogram(
+        "db_pool_connect_seconds",
+        "Time the pool took to open a new connection (TCP, auth, asyncpg setup)",
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+    )
+
+
+def register_statement_cache_metrics(engine: AsyncEngine, capacity: int) -> None:
+    """
+    Expose the asyncpg prepared-statement cache: configured capacity per connection,
+    statements cached across open connections, and the fullest connection. A
+    fullest connection pinned at capacity means statements are being evicted and
+    re-prepared; raise DB_STATEMENT_CACHE_SIZE.
+    """
+    try:
+        from prometheus_client import REGISTRY
+        from prometheus_client.core import GaugeMetricFamily
+    except Exception as e:  # pragma: no cover
+        logging.getLogger(__name__).warning("Statement cache metrics disabled: %s", e)
+        return
+
+    class _StatementCacheCollector:
+        def collect(self) -> Any:
+            counts = prepared_statement_counts(engine)
+            yield GaugeMetricFamily(
+                "db_statement_cache_capacity",
+                "Prepared statements kept per connection (DB_STATEMENT_CACHE_SIZE)",
+                value=capacity,
+            )
+            yield GaugeMetricFamily(
+                "db_statement_cache_statements",
+                "Prepared statements cached across open connections",
+                value=sum(counts),
+            )
+            yield GaugeMetricFamily(
+                "db_statement_cache_fullest",
+                "Prepared statements cached on the fullest open connection",
+                value=max(counts, default=0),
+            )
+
+    REGISTRY.register(_StatementCacheCollector())
+
+
+def register_request_db_metrics() -> None:
+    """Expose per-request query count / DB time histograms, labelled by route template."""
+    global _request_queries, _request_db_time
+    if _request_queries is not None:
+        return
+
+    try:
+        from prometheus_client import Histogram
+    except Exception as e:  # pragma: no cover
+        logging.getLogger(__name__).warning("Request DB metrics disabled: %s", e)
+        return
+
+    _request_queries = Histogram(
+        "db_queries_per_request",
+        "SQL statements executed while handling one request",
+        ["route"],
+        buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+    )
+    _request_db_time = Histogram(
+        "db_time_per_request_seconds",
+        "Time one request spent waiting on SQL statements",
+        ["route"],
+        buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+    )
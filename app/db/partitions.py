@@ -0,0 +1,229 @@
+# app/db/partitions.py
+"""
+Maintenance of the monthly range partitions of `entry` (on created_at, UTC
+month bounds; see migration 8f3b2d6c1a57). Run it daily, e.g. from cron, and
+after each deploy:
+
+    python -m app.db.partitions [--ahead N] [--retain-months N] [--drop] [--dry-run]
+
+  - creates `entry_YYYY_MM` for the current month and ENTRY_PARTITIONS_AHEAD
+    months after it, so inserts never land in `entry_default`. Rows that did
+    land there for a month being created are moved into the new partition in
+    the same transaction;
+  - with ENTRY_PARTITION_RETENTION_MONTHS set, detaches partitions whose whole
+    month is older than that: they become plain tables to archive or drop by
+    hand. With --drop they are dropped instead.
+
+Detaching or dropping removes entries without DELETE triggers, so the
+/entries/stats rollup keeps their history. Every step runs in its own short
+transaction with a lock timeout, so a busy table makes the run fail instead of
+queueing writes behind it; the next run picks up where it stopped.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import re
+from collections.abc import Iterable
+from datetime import UTC, date, datetime, time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PARENT = "entry"
+DEFAULT_PARTITION = "entry_default"
+COLUMNS = "id, work, struggle, intention, created_at, updated_at"
+LOCK_TIMEOUT = "5s"
+
+_NAME = re.compile(rf"^{PARENT}_(\d{{4}})_(\d{{2}})$")
+
+_PARTITIONS = text(
+    """
+    SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = to_regclass(:parent)
+    """
+)
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month `months` after (or before, if negative) `month`'s."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_{month:%Y_%m}"
+
+
+def partition_month(name: str) -> date | None:
+    """First day of the month a partition named by convention holds; None for others."""
+    match = _NAME.match(name)
+    if match is None:
+        return None
+    return date(int(match[1]), int(match[2]), 1)
+
+
+def month_bounds(month: date) -> tuple[datetime, datetime]:
+    """[start, end) of the partition for `month`, in UTC."""
+    start = datetime.combine(month.replace(day=1), time(), UTC)
+    return start, datetime.combine(add_months(month, 1), time(), UTC)
+
+
+def plan(
+    existing: Iterable[str], today: date, ahead: int, retain_months: int | None = None
+) -> tuple[list[date], list[str]]:
+    """
+    (months to create, partitions to retire) for partitions named `existing`.
+    Creates the current month through `ahead` months later; retires partitions
+    whose month ended more than `retain_months` months before the current one.
+    """
+    current = today.replace(day=1)
+    months = {partition_month(name): name for name in existing}
+    missing = [
+        month for month in (add_months(current, n) for n in range(ahead + 1)) if month not in months
+    ]
+    expired: list[str] = []
+    if retain_months is not None:
+        oldest_kept = add_months(current, -retain_months)
+        expired = sorted(
+            name for month, name in months.items() if month is not None and month < oldest_kept
+        )
+    return missing, expired
+
+
+async def list_partitions(conn: AsyncConnection) -> list[str]:
+    return list((await conn.execute(_PARTITIONS, {"parent": PARENT})).scalars())
+
+
+async def create_partition(conn: AsyncConnection, month: date) -> int:
+    """Create the partition for `month`; returns how many rows moved out of the default one."""
+    name = partition_name(month)
+    start, end = month_bounds(month)
+    bounds = {"start": start, "end": end}
+    in_range = "created_at >= :start AND created_at < :end"
+    # The new partition can't be attached while the default one holds rows of
+    # its range: park them in a temp table, create the partition, put them back.
+    # Direct DML on partitions doesn't fire the parent's (stats) triggers.
+    await conn.execute(
+        text(
+            f"CREATE TEMP TABLE entry_moving ON COMMIT DROP AS "  # nosec B608: fixed names
+            f"SELECT {COLUMNS} FROM {DEFAULT_PARTITION} WHERE {in_range}"
+        ),
+        bounds,
+    )
+    moved = int((await conn.execute(text("SELECT count(*) FROM entry_moving"))).scalar_one())
+    if moved:
+        await conn.execute(
+            text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}"),  # nosec B608: fixed names
+            bounds,
+        )
+    # Bounds can't be bind parameters in DDL; they are formatted from a date
+    await conn.execute(
+        text(
+            f"CREATE TABLE {name} PARTITION OF {PARENT} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    )
+    if moved:
+        await conn.execute(
+            text(f"INSERT INTO {name} ({COLUMNS}) SELECT {COLUMNS} FROM entry_moving")  # nosec B608
+        )
+    return moved
+
+
+async def retire_partition(conn: AsyncConnection, name: str, *, drop: bool = False) -> None:
+    if drop:
+        await conn.execute(text(f"DROP TABLE {name}"))
+    else:
+        await conn.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+
+
+async def manage_partitions(
+    engine: AsyncEngine,
+    *,
+    today: date | None = None,
+    ahead: int = 3,
+    retain_months: int | None = None,
+    drop: bool = False,
+    dry_run: bool = False,
+) -> tuple[list[str], list[str]]:
+    """Create missing and retire expired partitions; returns (created, retired) names."""
+    today = today or datetime.now(UTC).date()
+    async with engine.connect() as conn:
+        missing, expired = plan(await list_partitions(conn), today, ahead, retain_months)
+    created = [partition_name(month) for month in missing]
+    if dry_run:
+        return created, expired
+
+    for month in missing:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+            moved = await create_partition(conn, month)
+        logger.info(
+            "Created partition %s (%d rows moved from %s)",
+            partition_name(month),
+            moved,
+            DEFAULT_PARTITION,
+        )
+    for name in expired:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+            await retire_partition(conn, name, drop=drop)
+        logger.info("%s partition %s", "Dropped" if drop else "Detached", name)
+    return created, expired
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from app.db.session import get_engine
+
+    engine = get_engine()
+    try:
+        created, retired = await manage_partitions(
+            engine,
+            ahead=args.ahead,
+            retain_months=args.retain_months,
+            drop=args.drop,
+            dry_run=args.dry_run,
+        )
+    finally:
+        await engine.dispose()
+    logger.info(
+        "%s %d partitions [%s], %s %d [%s]",
+        "Would create" if args.dry_run else "Created",
+        len(created),
+        ", ".join(created),
+        "dropped" if args.drop else "detached",
+        len(retired),
+        ", ".join(retired),
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Maintain the monthly partitions of entry.")
+    parser.add_argument(
+        "--ahead",
+        type=int,
+        default=settings.entry_partitions_ahead,
+        help="months to create beyond the current one (ENTRY_PARTITIONS_AHEAD)",
+    )
+    parser.add_argument(
+        "--retain-months",
+        type=int,
+        default=settings.entry_partition_retention_months,
+        help="retire partitions older than this (ENTRY_PARTITION_RETENTION_MONTHS)",
+    )
+    parser.add_argument("--drop", action="store_true", help="drop instead of detaching")
+    parser.add_argument("--dry-run", action="store_true", help="only log what would change")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=settings.log_level, format="%(levelname)s %(name)s: %(message)s")
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# app/db/routing.py
+"""
+Read/write routing between the primary and the optional read replica.
+
+`get_read_session` is the dependency for read-only endpoints. It hands out a
+replica session unless:
+  - no replica is configured (DATABASE_REPLICA_URL unset);
+  - the client asked to read its own writes, either explicitly with the
+    `X-Read-Your-Writes: 1` header or implicitly via the short-lived cookie
+    that write endpoints set with `stick_to_primary` (REPLICA_STICKY_SECONDS);
+  - the replica recently failed to connect; reads then go to the primary for
+    REPLICA_RETRY_SECONDS before the replica is tried again.
+Writes keep using `app.db.session.get_session` (always the primary).
+
+A replica may lag behind writes, so rows read through it must not be put in
+the shared entry cache (`from_replica` tells such sessions apart); clients that
+asked for their own writes bypass that cache entirely (see the journal router).
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import AsyncGenerator, Callable
+from functools import lru_cache
+
+from fastapi import Request, Response
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.session import get_replica_session_factory, get_session_factory
+
+logger = logging.getLogger(__name__)
+
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
+READ_PRIMARY_COOKIE = "read_primary"
+# Session.info key marking sessions bound to the replica
+REPLICA_SESSION = "replica"
+
+
+class ReplicaHealth:
+    """Circuit breaker for the replica: after a failure, skip it for `retry_after` seconds."""
+
+    def __init__(self, retry_after: float, clock: Callable[[], float] = time.monotonic):
+        self.retry_after = retry_after
+        self._clock = clock
+        self._down_until = 0.0
+
+    def available(self) -> bool:
+        return self._clock() >= self._down_until
+
+    def mark_down(self) -> None:
+        self._down_until = self._clock() + self.retry_after
+
+
+@lru_cache
+def get_replica_health() -> ReplicaHealth:
+    """Process-wide replica circuit breaker (REPLICA_RETRY_SECONDS)."""
+    return ReplicaHealth(get_settings().replica_retry_seconds)
+
+
+def wants_primary(request: Request) -> bool:
+    """True if this client must see its own writes (header or sticky cookie)."""
+    header = request.headers.get(READ_YOUR_WRITES_HEADER, "")
+    return header.lower() in {"1", "true", "yes"} or READ_PRIMARY_COOKIE in request.cookies
+
+
+def stick_to_primary(response: Response) -> None:
+    """Pin the client's reads to the primary for a moment after a write, past replica lag."""
+    sticky_seconds = get_settings().replica_sticky_seconds
+    if get_replica_session_factory() is not None and sticky_seconds:
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            "1",
+            max_age=sticky_seconds,
+            httponly=True,
+            samesite="lax",
+        )
+
+
+async def _open_replica_session() -> AsyncSession | None:
+    """A replica session with its connection already checked out, or None if it is down."""
+    factory = get_replica_session_factory()
+    replica_health = get_replica_health()
+    if factory is None or not replica_health.available():
+        return None
+    session = factory()
+    try:
+        await session.connection()
+    except (DBAPIError, OSError) as e:
+        await session.close()
+        replica_health.mark_down()
+        logger.warning(
+            "Read replica unavailable, using primary for %.0fs: %s",
+            replica_health.retry_after,
+            e,
+        )
+        return None
+    session.info[REPLICA_SESSION] = True
+    return session
+
+
+def from_replica(session: AsyncSession) -> bool:
+    """True if `session` reads from the replica (possibly behind the primary)."""
+    return session.info.get(REPLICA_SESSION, False) is True
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency: AsyncSession for read-only work (replica when possible)."""
+    session = None if wants_primary(request) else await _open_replica_session()
+    if session is None:
+        session = get_session_factory()()
+    try:
+        yield session
+    finally:
+        await session.close()
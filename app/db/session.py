@@ -1,34 +1,136 @@
+import time
 from collections.abc import AsyncGenerator
+from functools import lru_cache
+from typing import Any
 
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.pool import NullPool
-
-from app.core.config import settings
-
-# Use NullPool so connections are not reused across different event loops
-# during tests (prevents "future attached to a different loop" / asyncpg
-# "another operation is in progress" errors).
-engine = create_async_engine(
-    settings.database_url,  # must be postgresql+asyncpg per project rules
-    echo=False,
-    future=True,
-    poolclass=NullPool,
-)
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, NullPool
+from sqlalchemy.util.queue import AsyncAdaptedQueue
 
-SessionLocal = async_sessionmaker(
-    bind=engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
+from app.core.config import Settings, get_settings
+from app.db import metrics
+from app.db.instrumentation import instrument_engine
+
+
+class _TimedQueue(AsyncAdaptedQueue[ConnectionPoolEntry]):
+    """The pool's queue of idle connections; times each checkout's wait on it."""
+
+    def get(self, block: bool = True, timeout: float | None = None) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            metrics.observe_pool_wait(time.perf_counter() - start)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that reports how long each checkout waited for a free connection
+    (db_pool_wait_seconds) and, separately, how long opening a new connection
+    took (db_pool_connect_seconds), so cold starts and overflow connects do not
+    show up as pool contention.
+    """
+
+    _queue_class = _TimedQueue
+
+    def _create_connection(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            metrics.observe_pool_connect(time.perf_counter() - start)
+
+
+def create_engine(
+    cfg: Settings, url: str | None = None, connect_timeout: float | None = None
+) -> AsyncEngine:
+    """
+    Build the async engine for `url` (default: the primary, `cfg.database_url`)
+    according to `cfg.db_pool`:
+      - "queue": pooled connections sized by DB_POOL_SIZE / DB_MAX_OVERFLOW (production)
+      - "null":  NullPool, so connections are never reused across event loops
+                 (prevents "future attached to a different loop" / asyncpg
+                 "another operation is in progress" errors in tests)
+    Either way the engine is instrumented for per-request query counts, and each
+    connection keeps up to DB_STATEMENT_CACHE_SIZE prepared statements.
+    `connect_timeout` bounds asyncpg's connect (the replica uses it to fail fast).
+    """
+    url = url or cfg.database_url
+    connect_args: dict[str, Any] = {"prepared_statement_cache_size": cfg.db_statement_cache_size}
+    if connect_timeout is not None:
+        connect_args["timeout"] = connect_timeout
+    if cfg.db_pool == "null":
+        engine = create_async_engine(
+            url,  # must be postgresql+asyncpg per project rules
+            echo=False,
+            future=True,
+            poolclass=NullPool,
+            connect_args=connect_args,
+        )
+    else:
+        engine = create_async_engine(
+            url,
+            echo=False,
+            future=True,
+            poolclass=TimedQueuePool,
+            connect_args=connect_args,
+            pool_size=cfg.db_pool_size,
+            max_overflow=cfg.db_max_overflow,
+            pool_timeout=cfg.db_pool_timeout,
+            pool_pre_ping=cfg.db_pool_pre_ping,
+            pool_recycle=cfg.db_pool_recycle,
+        )
+    instrument_engine(engine)
+    return engine
+
+
+# Engines and session factories are built on first use, not at import: that
+# reads the settings and loads the asyncpg dialect, which importing the app
+# (tests, tooling, `python -X importtime`) should not pay for.
+@lru_cache
+def get_engine() -> AsyncEngine:
+    """The process-wide engine for the primary."""
+    return create_engine(get_settings())
+
+
+@lru_cache
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    Sessions on the primary. Also a FastAPI dependency for handlers that outlive
+    the request-scoped session, e.g. StreamingResponse bodies, which run after
+    yield-dependencies close.
+    """
+    return async_sessionmaker(bind=get_engine(), class_=AsyncSession, expire_on_commit=False)
+
+
+@lru_cache
+def get_replica_engine() -> AsyncEngine | None:
+    """Engine for the read replica (DATABASE_REPLICA_URL), or None when not configured."""
+    settings = get_settings()
+    if not settings.replica_database_url:
+        return None
+    return create_engine(
+        settings, settings.replica_database_url, connect_timeout=settings.replica_connect_timeout
+    )
+
+
+@lru_cache
+def get_replica_session_factory() -> async_sessionmaker[AsyncSession] | None:
+    """Sessions on the read replica, or None. Routing lives in app.db.routing."""
+    replica = get_replica_engine()
+    if replica is None:
+        return None
+    return async_sessionmaker(bind=replica, class_=AsyncSession, expire_on_commit=False)
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """FastAPI dependency that yields an AsyncSession."""
-    async with SessionLocal() as session:
+    async with get_session_factory()() as session:
         yield session
 
 
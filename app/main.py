@@ -6,10 +6,17 @@ import os
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
-
-from app.core.config import settings
+from fastapi import FastAPI, Response, status
+from starlette.types import ASGIApp
+
+from app.core.admission import AdmissionMiddleware, get_admission_controller
+from app.core.config import get_settings
+from app.core.integrations import MiddlewareSlot, setup_integrations
+from app.core.server_timing import QueryStatsMiddleware
+from app.db.session import get_engine, get_replica_engine
 from app.routers.journal_router import router as journal_router
+from app.services.group_commit import get_group_committer
+from app.services.warmup import warm_up
 
 # Ensure we at least have INFO logs if nothing else configures logging.
 root_logger = logging.getLogger()
@@ -20,17 +27,71 @@ if not root_logger.hasHandlers():
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """
-    FastAPI lifespan handler. Logs DB URLs on startup.
-    Add any shutdown logic after the `yield`.
+    FastAPI lifespan handler. Sets up the optional integrations, logs DB URLs
+    and warms up (see app.services.warmup) on startup; /readyz turns ready only
+    after that. Disposes the engines' connection pools on shutdown.
     """
+    app.state.ready = False
+    settings = get_settings()
+    engine, replica_engine = get_engine(), get_replica_engine()
+    setup_integrations(app, integrations_slot, settings)
     logger = logging.getLogger("uvicorn")
     logger.info("DB URL in use (async): %s", settings.database_url)
     if hasattr(settings, "sync_database_url"):
         logger.info("DB URL in use (sync): %s", settings.sync_database_url)
-    yield  # place shutdown logic here later if needed
+    logger.info("DB pool mode: %s", settings.db_pool)
+    logger.info("Prepared statement cache: %d per connection", settings.db_statement_cache_size)
+    logger.info("Read replica: %s", "enabled" if replica_engine is not None else "disabled")
+    if settings.warmup:
+        await warm_up(
+            engine,
+            connections=(
+                settings.db_pool_size
+                if settings.warmup_connections is None
+                else settings.warmup_connections
+            ),
+            timeout=settings.warmup_timeout,
+            replica=replica_engine,
+        )
+    app.state.ready = True
+    yield
+    app.state.ready = False  # stop taking traffic while draining
+    committer = get_group_committer()
+    if committer is not None:
+        await committer.aclose()  # flush queued creates before the pool goes away
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
+
+def _admission_middleware(inner: ASGIApp) -> ASGIApp:
+    controller = get_admission_controller()
+    if controller is None:
+        return inner
+    return AdmissionMiddleware(
+        inner,
+        controller=controller,
+        router=app.router,
+        status_code=get_settings().admission_reject_status,
+    )
+
+
+def _query_stats_middleware(inner: ASGIApp) -> ASGIApp:
+    settings = get_settings()
+    return QueryStatsMiddleware(
+        inner, warn_threshold=settings.db_query_warn_threshold, header=settings.server_timing
+    )
 
 
 app = FastAPI(title="Journal API", version="0.1.0", lifespan=lifespan)
+# Middleware factories run when Starlette builds the stack (first ASGI event,
+# i.e. startup), so the settings are read then rather than at import.
+# Innermost, so QueryStatsMiddleware has the request's DB time when a slot is released
+app.add_middleware(_admission_middleware)
+app.add_middleware(_query_stats_middleware)
+# Outermost app middleware: filled by the integrations at startup (e.g. Prometheus)
+integrations_slot = MiddlewareSlot()
+app.add_middleware(integrations_slot.bind)
 
 
 @app.get("/healthz", tags=["Health"], summary="Healthcheck")
@@ -38,6 +99,19 @@ async def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get(
+    "/readyz",
+    tags=["Health"],
+    summary="Readiness (startup warm-up finished)",
+    responses={503: {"description": "Starting up or shutting down"}},
+)
+async def readiness(response: Response) -> dict[str, str]:
+    if not getattr(app.state, "ready", False):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "starting"}
+    return {"status": "ready"}
+
+
 # -------------------- Ops & Monitoring --------------------
 # 1) Logging level from env (defaults to INFO)
 _level = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -45,26 +119,9 @@ logging.getLogger().setLevel(_level)
 for _name in ("uvicorn", "uvicorn.access", "uvicorn.error", "sqlalchemy"):
     logging.getLogger(_name).setLevel(_level)
 
-# 2) Prometheus metrics at /metrics (guarded by env + optional dep)
-if os.getenv("PROMETHEUS_ENABLED", "true").lower() in {"1", "true", "yes"}:
-    try:
-        from prometheus_fastapi_instrumentator import Instrumentator
-
-        Instrumentator().instrument(app).expose(app, endpoint="/metrics", include_in_schema=False)
-    except Exception as e:  # pragma: no cover
-        logging.getLogger(__name__).warning("Prometheus metrics disabled: %s", e)
-
-# 3) Sentry (enabled only if SENTRY_DSN is set)
-_dsn = os.getenv("SENTRY_DSN")
-if _dsn:
-    try:
-        from sentry_sdk import init as sentry_init
-        from sentry_sdk.integrations.fastapi import FastApiIntegration
-
-        sentry_init(dsn=_dsn, integrations=[FastApiIntegration()])
-        logging.getLogger(__name__).info("Sentry initialized")
-    except Exception as e:  # pragma: no cover
-        logging.getLogger(__name__).warning("Sentry disabled: %s", e)
+# 2) Prometheus metrics at /metrics and 3) Sentry (if SENTRY_DSN is set) are
+#    imported and set up in `lifespan` (see app.core.integrations), so that
+#    importing this module stays cheap.
 # ----------------------------------------------------------
 
 
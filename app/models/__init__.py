@@ -1,3 +1,4 @@
 from .entry import Entry
+from .entry_stats import EntryDailyStats
 
-__all__ = ["Entry"]
+__all__ = ["Entry", "EntryDailyStats"]
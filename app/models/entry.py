@@ -1,19 +1,57 @@
-from uuid import uuid4
-
-from sqlalchemy import Column, DateTime, String
+from sqlalchemy import Column, Computed, DateTime, Index, String
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 
+from app.core.ids import uuid7
 from app.db.base import Base
 
+# Text search configuration shared by the generated column and queries
+SEARCH_CONFIG = "english"
+
 
 class Entry(Base):
     __tablename__ = "entry"
+    # Mirrors the indexes and monthly partitioning (app.db.partitions) created by
+    # migrations so autogenerate leaves them alone
+    __table_args__ = (
+        Index("ix_entry_created_at_id", "created_at", "id"),
+        Index("ix_entry_updated_at", "updated_at"),
+        Index("ix_entry_search_vector", "search_vector", postgresql_using="gin"),
+        *(
+            Index(
+                f"ix_entry_{col}_trgm",
+                col,
+                postgresql_using="gin",
+                postgresql_ops={col: "gin_trgm_ops"},
+            )
+            for col in ("work", "struggle", "intention")
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid4()))
+    # The partition key has to be part of the primary key. id is unique by
+    # itself and, being client-generated, is what bulk INSERT ... RETURNING uses
+    # to match returned rows to their parameters. UUIDv7 (time-ordered), so
+    # inserts append to the primary key index (see migration 2b7e4c9a1d36).
+    id = Column(UUID(as_uuid=True), primary_key=True, insert_sentinel=True, default=uuid7)
     work = Column(String(256), nullable=False)
     struggle = Column(String(256), nullable=False)
     intention = Column(String(256), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False
+    )
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
+    # Generated by Postgres (see migration bdd0d362a25c); deferred so it is never loaded
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                f"to_tsvector('{SEARCH_CONFIG}'::regconfig, "
+                "work || ' ' || struggle || ' ' || intention)",
+                persisted=True,
+            ),
+        )
+    )
@@ -0,0 +1,27 @@
+from sqlalchemy import BigInteger, Column, Date, SmallInteger, text
+
+from app.db.base import Base
+
+# Writers spread over this many rows per day (see EntryDailyStats.slot)
+STATS_SLOTS = 16
+
+
+class EntryDailyStats(Base):
+    """
+    Per-day rollup of `entry` for GET /entries/stats, maintained by statement-level
+    triggers on `entry` (migration 5c1e7a9d2f40); the app only reads it.
+
+    Each writer adds its deltas to the row for (UTC day of created_at,
+    pg_backend_pid() % STATS_SLOTS), so concurrent inserts on the same day do not
+    all queue on one row lock. Readers sum the slots.
+    """
+
+    __tablename__ = "entry_daily_stats"
+
+    day = Column(Date, primary_key=True)
+    slot = Column(SmallInteger, primary_key=True)
+    entries = Column(BigInteger, nullable=False, server_default=text("0"))
+    # Sums of length() per field, for average lengths
+    work_chars = Column(BigInteger, nullable=False, server_default=text("0"))
+    struggle_chars = Column(BigInteger, nullable=False, server_default=text("0"))
+    intention_chars = Column(BigInteger, nullable=False, server_default=text("0"))
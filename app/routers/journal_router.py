@@ -1,19 +1,88 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, datetime
+from typing import Any
 
-from app.db.session import get_db
-from app.schemas.entry import EntryCreate, EntryOut, EntryUpdate
-from app.services.entry_service import EntryService
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.etag import entry_etag, etag_matches, page_etag
+from app.core.responses import ModelJSONResponse
+from app.db.routing import from_replica, get_read_session, stick_to_primary, wants_primary
+from app.db.session import get_db, get_session_factory
+from app.schemas.entry import (
+    BulkItemError,
+    EntryBatch,
+    EntryBulkResult,
+    EntryCreate,
+    EntryOut,
+    EntryPage,
+    EntryStats,
+    EntryUpdate,
+)
+from app.services.cache import get_count_cache, get_entry_cache
+from app.services.entry_service import CountMode, EntryService, SortOrder, StatsBucket
+from app.services.export import MEDIA_TYPES, ExportFormat, stream_export
+from app.services.group_commit import get_group_committer
 
 router = APIRouter(prefix="/entries", tags=["Journal Entries"])
 
+NOT_MODIFIED: dict[int | str, dict[str, Any]] = {
+    304: {"description": "Not Modified (`If-None-Match` matched the ETag)"}
+}
+
+BULK_MAX_ITEMS = 1000
+BATCH_GET_MAX_IDS = 100
+
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_COUNT_MODE_HEADER = "X-Total-Count-Mode"
+CREATED_AFTER_QUERY = Query(None, description="Only entries created at or after this time")
+CREATED_BEFORE_QUERY = Query(None, description="Only entries created before this time")
+COUNT_QUERY = Query(
+    None,
+    description=(
+        f"Also send the total number of results in `{TOTAL_COUNT_HEADER}`: `exact` "
+        "(COUNT, cached briefly per query) or `estimated` (planner statistics). "
+        f"`{TOTAL_COUNT_MODE_HEADER}` says which one produced it."
+    ),
+)
+
 
 def get_entry_service(db: AsyncSession = Depends(get_db)) -> EntryService:
     """
     Constructs the service with the real DB session.
     In tests, we will monkey-patch this function to return a mock.
     """
-    return EntryService(db)
+    return EntryService(db, cache=get_entry_cache(), group_commit=get_group_committer())
+
+
+def get_read_entry_service(
+    request: Request, db: AsyncSession = Depends(get_read_session)
+) -> EntryService:
+    """
+    Service for read-only endpoints; its session may point at the read replica
+    (see app.db.routing). Never use it for writes.
+
+    Replica rows may predate a write that just invalidated the entry cache, so
+    they are served but never cached. Read-your-writes clients skip the cache
+    altogether: it may still hold a row older than their write.
+    """
+    return EntryService(
+        db,
+        cache=None if wants_primary(request) else get_entry_cache(),
+        counts=get_count_cache(),
+        fill_cache=not from_replica(db),
+    )
 
 
 @router.post(
@@ -24,32 +93,199 @@ def get_entry_service(db: AsyncSession = Depends(get_db)) -> EntryService:
 async def create_entry(
     entry: EntryCreate,
     service: EntryService = Depends(get_entry_service),
-) -> EntryOut:
-    return await service.create_entry(entry)
+) -> Response:
+    created = await service.create_entry(entry)
+    response = ModelJSONResponse(created, status_code=status.HTTP_201_CREATED)
+    stick_to_primary(response)
+    return response
+
+
+@router.post(
+    "/bulk",
+    response_model=EntryBulkResult,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_entries_bulk(
+    payload: list[dict[str, Any]] = Body(..., min_length=1, max_length=BULK_MAX_ITEMS),
+    service: EntryService = Depends(get_entry_service),
+) -> Response:
+    """
+    Create many entries in one transaction. Items are validated one by one so a
+    bad item is reported in `errors` (by index) instead of rejecting the batch.
+    Returns 422 only if no item is valid.
+    """
+    valid: list[EntryCreate] = []
+    errors: list[BulkItemError] = []
+    for index, item in enumerate(payload):
+        try:
+            valid.append(EntryCreate.model_validate(item))
+        except ValidationError as e:
+            errors.append(BulkItemError(index=index, errors=e.errors(include_url=False)))
+
+    if not valid:
+        raise HTTPException(status_code=422, detail=[err.model_dump(mode="json") for err in errors])
+    created = await service.create_entries(valid)
+    response = ModelJSONResponse(
+        EntryBulkResult(created=created, errors=errors), status_code=status.HTTP_201_CREATED
+    )
+    stick_to_primary(response)
+    return response
+
+
+@router.post(
+    "/batch-get",
+    response_model=EntryBatch,
+)
+async def batch_get_entries(
+    ids: list[str] = Body(..., embed=True, min_length=1, max_length=BATCH_GET_MAX_IDS),
+    service: EntryService = Depends(get_read_entry_service),
+) -> Response:
+    """
+    Up to BATCH_GET_MAX_IDS entries by id in one round trip, in the requested
+    order. Ids that match no entry (or aren't UUIDs) are listed in `missing`.
+    """
+    return ModelJSONResponse(await service.get_entries_by_ids(ids))
+
+
+def _conditional(
+    content: EntryOut | EntryPage,
+    etag: str,
+    if_none_match: str | None,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Bare 304 if the client already has `etag` (nothing is serialized); else the tagged body."""
+    headers = {"ETag": etag, **(headers or {})}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return ModelJSONResponse(content, headers=headers)
+
+
+async def _total_count_headers(
+    service: EntryService,
+    count: CountMode | None,
+    q: str | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+) -> dict[str, str]:
+    if count is None:
+        return {}
+    total, mode = await service.count_entries(
+        q=q, created_after=created_after, created_before=created_before, mode=count
+    )
+    return {TOTAL_COUNT_HEADER: str(total), TOTAL_COUNT_MODE_HEADER: mode}
 
 
 @router.get(
     "/",
-    response_model=list[EntryOut],
+    response_model=EntryPage,
+    responses=NOT_MODIFIED,
 )
 async def list_entries(
-    service: EntryService = Depends(get_entry_service),
-) -> list[EntryOut]:
-    return await service.get_all_entries()
+    limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = None,
+    created_after: datetime | None = CREATED_AFTER_QUERY,
+    created_before: datetime | None = CREATED_BEFORE_QUERY,
+    count: CountMode | None = COUNT_QUERY,
+    if_none_match: str | None = Header(None),
+    service: EntryService = Depends(get_read_entry_service),
+) -> Response:
+    try:
+        page = await service.list_entries(
+            limit=limit,
+            cursor=cursor,
+            created_after=created_after,
+            created_before=created_before,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+    headers = await _total_count_headers(
+        service, count, created_after=created_after, created_before=created_before
+    )
+    return _conditional(page, page_etag(page), if_none_match, headers)
+
+
+@router.get(
+    "/search",
+    response_model=EntryPage,
+    responses=NOT_MODIFIED,
+)
+async def search_entries(
+    limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = None,
+    q: str | None = None,
+    sort: SortOrder = "new",
+    created_after: datetime | None = CREATED_AFTER_QUERY,
+    created_before: datetime | None = CREATED_BEFORE_QUERY,
+    count: CountMode | None = COUNT_QUERY,
+    if_none_match: str | None = Header(None),
+    service: EntryService = Depends(get_read_entry_service),
+) -> Response:
+    try:
+        page = await service.list_entries(
+            limit=limit,
+            cursor=cursor,
+            q=q,
+            sort=sort,
+            created_after=created_after,
+            created_before=created_before,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+    headers = await _total_count_headers(service, count, q, created_after, created_before)
+    return _conditional(page, page_etag(page), if_none_match, headers)
+
+
+@router.get(
+    "/stats",
+    response_model=EntryStats,
+)
+async def entry_stats(
+    bucket: StatsBucket = "day",
+    created_after: date | None = Query(None, description="First day included (UTC)"),
+    created_before: date | None = Query(None, description="First day excluded (UTC)"),
+    service: EntryService = Depends(get_read_entry_service),
+) -> Response:
+    """
+    Entries per UTC day or week, with average field lengths. Served from a rollup
+    that triggers keep current, so the cost depends on the number of days, not entries.
+    """
+    stats = await service.entry_stats(
+        bucket=bucket, created_after=created_after, created_before=created_before
+    )
+    return ModelJSONResponse(stats)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {media: {} for media in MEDIA_TYPES.values()}}},
+)
+async def export_entries(
+    format: ExportFormat = "ndjson",
+    chunk_size: int = Query(1000, ge=1, le=10_000),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+) -> StreamingResponse:
+    return StreamingResponse(
+        stream_export(session_factory, format, chunk_size),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="entries.{format}"'},
+    )
 
 
 @router.get(
     "/{entry_id}",
     response_model=EntryOut,
+    responses=NOT_MODIFIED,
 )
 async def get_entry(
     entry_id: str,
-    service: EntryService = Depends(get_entry_service),
-) -> EntryOut:
+    if_none_match: str | None = Header(None),
+    service: EntryService = Depends(get_read_entry_service),
+) -> Response:
     entry = await service.get_entry_by_id(entry_id)
     if not entry:
         raise HTTPException(status_code=404, detail="Entry not found")
-    return entry
+    return _conditional(entry, entry_etag(entry.id, entry.updated_at), if_none_match)
 
 
 @router.put(
@@ -60,11 +296,13 @@ async def update_entry(
     entry_id: str,
     updated: EntryUpdate,
     service: EntryService = Depends(get_entry_service),
-) -> EntryOut:
+) -> Response:
     entry = await service.update_entry(entry_id, updated)
     if not entry:
         raise HTTPException(status_code=404, detail="Entry not found")
-    return entry
+    response = ModelJSONResponse(entry)
+    stick_to_primary(response)
+    return response
 
 
 @router.delete(
@@ -73,38 +311,12 @@ async def update_entry(
 )
 async def delete_entry(
     entry_id: str,
+    response: Response,
     service: EntryService = Depends(get_entry_service),
 ) -> None:
     success = await service.delete_entry(entry_id)
     if not success:
         raise HTTPException(status_code=404, detail="Entry not found")
+    stick_to_primary(response)
     # Returning None is fine for 204 No Content.
     return None
-
-# --- added by one-shot: /entries/search endpoint ---
-from fastapi import Query
-try:
-    from typing import Literal
-except Exception:  # typing_extensions fallback if needed
-    from typing_extensions import Literal
-from typing import Optional
-from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import Depends
-
-try:
-    # If already imported above, these won't error at runtime
-    from app.schemas.entry import EntryRead
-    from app.db.session import get_session
-except Exception:
-    pass
-
-@router.get("/search", response_model=list["EntryRead"] if "EntryRead" in globals() else list)
-async def search_entries(
-    limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-    q: Optional[str] = None,
-    sort: Literal["new", "old"] = "new",
-    session: AsyncSession = Depends(get_session),
-):
-    from app.services.entry_service import query_entries
-    return await query_entries(session, limit=limit, offset=offset, q=q, sort=sort)
@@ -1,4 +1,5 @@
-from datetime import datetime
+from datetime import date, datetime
+from typing import Any, Literal
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -34,3 +35,41 @@ class EntryOut(EntryBase):
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# Keyset-paginated listing: `next_cursor` is opaque; pass it back to get the next page
+class EntryPage(BaseModel):
+    items: list[EntryOut]
+    next_cursor: str | None = None
+
+
+# Batch get: found entries in the requested order; `missing` lists requested ids
+# (as sent) that match no entry
+class EntryBatch(BaseModel):
+    items: list[EntryOut]
+    missing: list[str] = []
+
+
+# Bulk create: one error record per rejected input item (index into the request list)
+class BulkItemError(BaseModel):
+    index: int
+    errors: list[dict[str, Any]]
+
+
+class EntryBulkResult(BaseModel):
+    created: list[EntryOut]
+    errors: list[BulkItemError] = []
+
+
+# GET /entries/stats: one bucket per UTC day or ISO week (Monday start) with entries
+class EntryStatsBucket(BaseModel):
+    start: date
+    entries: int
+    avg_work_length: float
+    avg_struggle_length: float
+    avg_intention_length: float
+
+
+class EntryStats(BaseModel):
+    bucket: Literal["day", "week"]
+    buckets: list[EntryStatsBucket]
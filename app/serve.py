@@ -0,0 +1,95 @@
+# app/serve.py
+"""
+Production launcher: `python -m app.serve`.
+
+Runs WEB_CONCURRENCY uvicorn workers (default: one per CPU this process may
+use, honouring cgroup quotas) under uvicorn's process supervisor, with uvloop
+and httptools when installed. Everything comes from Settings (HOST, PORT,
+MAX_REQUESTS, ...).
+
+- Worker recycling: with MAX_REQUESTS > 0 a worker exits after that many
+  requests (plus 0..MAX_REQUESTS_JITTER so workers don't recycle in lockstep);
+  the supervisor starts a replacement, which bounds slow memory growth.
+- Graceful restart: `kill -HUP <parent>` replaces workers one at a time, each
+  finishing in-flight requests for up to GRACEFUL_TIMEOUT seconds.
+  SIGTTIN / SIGTTOU add / remove a worker. SIGTERM / SIGINT drain and stop.
+
+`python -m app.main` (and `make run`) remain the single-process reload server
+for development.
+"""
+from __future__ import annotations
+
+import importlib.util
+import logging
+import math
+import os
+import random
+from functools import partial
+from pathlib import Path
+from socket import socket
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from app.core.config import Settings, get_settings
+
+APP = "app.main:app"
+CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+
+
+def available_cpus(cpu_max: Path = CGROUP_CPU_MAX) -> int:
+    """CPUs this process may run on: affinity mask, capped by a cgroup v2 quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - not on Linux
+        cpus = os.cpu_count() or 1
+    try:
+        quota, period = cpu_max.read_text().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(cpus, 1)
+
+
+def build_config(cfg: Settings) -> uvicorn.Config:
+    workers = cfg.web_concurrency or available_cpus()
+    return uvicorn.Config(
+        APP,
+        host=cfg.web_host,
+        port=cfg.web_port,
+        workers=workers,
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "auto",
+        http="httptools" if importlib.util.find_spec("httptools") else "auto",
+        limit_max_requests=cfg.web_max_requests or None,
+        timeout_graceful_shutdown=cfg.web_graceful_timeout,
+        timeout_keep_alive=cfg.web_keepalive,
+        log_level=cfg.log_level.lower(),
+        proxy_headers=True,
+    )
+
+
+def _worker(config: uvicorn.Config, jitter: int, sockets: list[socket] | None = None) -> None:
+    # Runs in each spawned worker process; jitter is drawn per worker
+    if config.limit_max_requests and jitter:
+        config.limit_max_requests += random.randint(0, jitter)  # nosec B311: not security
+    uvicorn.Server(config).run(sockets=sockets)
+
+
+def main() -> None:
+    cfg = get_settings()
+    config = build_config(cfg)
+    logging.getLogger("uvicorn.error").info(
+        "Starting %d workers on %s:%d (max_requests=%s)",
+        config.workers,
+        config.host,
+        config.port,
+        config.limit_max_requests or "off",
+    )
+    # Workers are spawned processes, so the target must be picklable (module-level + partial)
+    target = partial(_worker, config, cfg.web_max_requests_jitter)
+    Multiprocess(config, target=target, sockets=[config.bind_socket()]).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+# app/services/cache.py
+"""
+Read-through cache for single entries (see EntryService.get_entry_by_id and
+get_entries_by_ids), and a small TTL cache for exact result counts (`CountCache`).
+
+Backends:
+  - LRUCache:   in-process, bounded size + TTL. Each worker has its own copy, so
+                another worker's write is only seen once the TTL expires.
+  - RedisCache: any client speaking the redis-py asyncio API (get/mget/set/delete/
+                pipeline); shared across workers. Backend errors are logged and
+                treated as misses so the cache can never take the API down; so
+                are values that no longer parse as EntryOut (e.g. written by
+                another deploy), which are deleted.
+
+`delete` (called after a write commits) leaves an invalidation marker for one
+TTL instead of just dropping the key, and `set` never replaces a marker. A read
+that loaded the row before the commit but fills the cache after the delete
+would otherwise re-cache the old version for a whole TTL. Only a read slower
+than the TTL itself can still do that. The price is that a written entry
+is not cached again until its marker expires.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Protocol
+
+from pydantic import ValidationError
+
+from app.core.config import get_settings
+from app.schemas.entry import EntryOut
+
+logger = logging.getLogger(__name__)
+
+# RedisCache value standing for "invalidated" (never valid EntryOut JSON)
+_INVALIDATED = b"-"
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    # Entries dropped by the cache itself (capacity or TTL), not by invalidation
+    evictions: int = 0
+
+
+class EntryCache(Protocol):
+    stats: CacheStats
+
+    async def get(self, key: str) -> EntryOut | None: ...
+
+    async def get_many(self, keys: Sequence[str]) -> list[EntryOut | None]: ...
+
+    async def set(self, key: str, value: EntryOut) -> None: ...
+
+    async def set_many(self, items: Mapping[str, EntryOut]) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+
+class LRUCache:
+    """Bounded in-process LRU with a per-item TTL (seconds)."""
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        # None values are invalidation markers (see `delete`)
+        self._items: OrderedDict[str, tuple[float, EntryOut | None]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def get(self, key: str) -> EntryOut | None:
+        item = self._items.get(key)
+        if item is None:
+            self.stats.misses += 1
+            return None
+        expires_at, value = item
+        if expires_at <= self._clock():
+            del self._items[key]
+            if value is not None:
+                self.stats.evictions += 1
+            self.stats.misses += 1
+            return None
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    async def get_many(self, keys: Sequence[str]) -> list[EntryOut | None]:
+        return [await self.get(key) for key in keys]
+
+    async def set(self, key: str, value: EntryOut | None) -> None:
+        item = self._items.get(key)
+        now = self._clock()
+        if value is not None and item is not None and item[1] is None and item[0] > now:
+            return  # invalidated less than a TTL ago; this value may predate the write
+        self._items[key] = (now + self.ttl, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_entries:
+            _, (_, dropped) = self._items.popitem(last=False)
+            if dropped is not None:
+                self.stats.evictions += 1
+
+    async def set_many(self, items: Mapping[str, EntryOut]) -> None:
+        for key, value in items.items():
+            await self.set(key, value)
+
+    async def delete(self, key: str) -> None:
+        await self.set(key, None)
+
+
+class RedisCache:
+    """
+    Entry cache on a Redis-protocol server; values are EntryOut JSON with a TTL.
+    Invalidation markers are stored under the entry's own key, and fills use
+    SET NX, so a fill can never replace a marker, even across workers.
+    """
+
+    def __init__(self, client: Any, ttl: float = 30.0, prefix: str = "entry:") -> None:
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        # Redis expires keys itself, so evictions are not observable from here
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> EntryOut | None:
+        try:
+            raw = await self.client.get(self.prefix + key)
+        except Exception as e:
+            logger.warning("Entry cache get failed: %s", e)
+            raw = None
+        (value,) = await self._load_many([key], [raw])
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return value
+
+    async def get_many(self, keys: Sequence[str]) -> list[EntryOut | None]:
+        """One MGET round trip for all `keys`."""
+        try:
+            raws = await self.client.mget([self.prefix + key for key in keys])
+        except Exception as e:
+            logger.warning("Entry cache get failed: %s", e)
+            raws = [None] * len(keys)
+        values = await self._load_many(keys, raws)
+        hits = sum(value is not None for value in values)
+        self.stats.hits += hits
+        self.stats.misses += len(values) - hits
+        return values
+
+    async def set(self, key: str, value: EntryOut) -> None:
+        try:
+            await self.client.set(
+                self.prefix + key, value.model_dump_json(), px=int(self.ttl * 1000), nx=True
+            )
+        except Exception as e:
+            logger.warning("Entry cache set failed: %s", e)
+
+    async def set_many(self, items: Mapping[str, EntryOut]) -> None:
+        """All SETs in one pipelined round trip (not a transaction)."""
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.set(
+                        self.prefix + key,
+                        value.model_dump_json(),
+                        px=int(self.ttl * 1000),
+                        nx=True,
+                    )
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Entry cache set failed: %s", e)
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self.client.set(self.prefix + key, _INVALIDATED, px=int(self.ttl * 1000))
+        except Exception as e:
+            logger.warning("Entry cache delete failed: %s", e)
+
+    async def _load_many(
+        self, keys: Sequence[str], raws: Sequence[bytes | str | None]
+    ) -> list[EntryOut | None]:
+        """Parse `raws`; unparseable ones are misses and their keys are deleted."""
+        values: list[EntryOut | None] = []
+        unreadable = []
+        for key, raw in zip(keys, raws, strict=True):
+            if raw is None or raw in (_INVALIDATED, _INVALIDATED.decode()):
+                values.append(None)
+                continue
+            try:
+                values.append(EntryOut.model_validate_json(raw))
+            except ValidationError:
+                values.append(None)
+                unreadable.append(self.prefix + key)
+        if unreadable:
+            logger.warning("Dropping %d unreadable entry cache value(s)", len(unreadable))
+            try:
+                await self.client.delete(*unreadable)
+            except Exception as e:
+                logger.warning("Entry cache delete failed: %s", e)
+        return values
+
+
+class CountCache:
+    """
+    Exact result counts per query key (see EntryService.count_entries), bounded,
+    with a TTL. In-process only: a count is cheap to keep and cheap to be stale.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 10.0,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._items: OrderedDict[str, tuple[float, int]] = OrderedDict()
+
+    def get(self, key: str) -> int | None:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= self._clock():
+            del self._items[key]
+            return None
+        return value
+
+    def set(self, key: str, value: int) -> None:
+        self._items[key] = (self._clock() + self.ttl, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+
+
+@lru_cache
+def get_entry_cache() -> EntryCache | None:
+    """Process-wide cache chosen by ENTRY_CACHE (memory | redis | none)."""
+    settings = get_settings()
+    if settings.entry_cache == "none":
+        return None
+    if settings.entry_cache == "redis":
+        try:
+            from redis.asyncio import Redis
+
+            return RedisCache(Redis.from_url(settings.redis_url), ttl=settings.entry_cache_ttl)
+        except Exception as e:  # pragma: no cover
+            logger.warning("Redis entry cache unavailable, using in-process LRU: %s", e)
+    return LRUCache(max_entries=settings.entry_cache_max_entries, ttl=settings.entry_cache_ttl)
+
+
+def register_cache_metrics(cache: EntryCache | None) -> None:
+    """Expose hit/miss/eviction counters for `cache` on the default Prometheus registry."""
+    if cache is None:
+        return
+    try:
+        from prometheus_client import REGISTRY
+        from prometheus_client.core import CounterMetricFamily
+    except Exception as e:  # pragma: no cover
+        logger.warning("Entry cache metrics disabled: %s", e)
+        return
+
+    stats = cache.stats
+
+    class _CacheCollector:
+        def collect(self) -> Any:
+            yield CounterMetricFamily("entry_cache_hits", "Entry cache hits", value=stats.hits)
+            yield CounterMetricFamily(
+                "entry_cache_misses", "Entry cache misses", value=stats.misses
+            )
+            yield CounterMetricFamily(
+                "entry_cache_evictions",
+                "Entries dropped by the cache for capacity or TTL",
+                value=stats.evictions,
+            )
+
+    REGISTRY.register(_CacheCollector())
+
+
+@lru_cache
+def get_count_cache() -> CountCache | None:
+    """Process-wide cache for exact totals, or None when ENTRY_COUNT_TTL is 0."""
+    settings = get_settings()
+    if not settings.entry_count_ttl:
+        return None
+    return CountCache(ttl=settings.entry_count_ttl)
@@ -1,87 +1,632 @@
-from uuid import uuid4
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple
+from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Date,
+    DateTime,
+    Integer,
+    Select,
+    String,
+    Update,
+    any_,
+    bindparam,
+    cast,
+    column,
+    delete,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    table,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, REGCONFIG
+from sqlalchemy.engine import Dialect
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.compiler import SQLCompiler
 
+from app.core.ids import uuid7
+from app.models.entry import SEARCH_CONFIG
 from app.models.entry import Entry as EntryModel
-from app.schemas.entry import EntryCreate, EntryOut, EntryUpdate
+from app.models.entry_stats import EntryDailyStats
+from app.schemas.entry import (
+    EntryBatch,
+    EntryCreate,
+    EntryOut,
+    EntryPage,
+    EntryStats,
+    EntryStatsBucket,
+    EntryUpdate,
+)
+from app.services.cache import CountCache, EntryCache
+from app.services.pagination import (
+    decode_cursor,
+    decode_offset_cursor,
+    encode_cursor,
+    encode_offset_cursor,
+)
+
+if TYPE_CHECKING:
+    from app.services.group_commit import GroupCommitter
+
+SortOrder = Literal["new", "old", "relevance"]
+# How a total count was produced (X-Total-Count-Mode)
+CountMode = Literal["exact", "estimated"]
+StatsBucket = Literal["day", "week"]
+
+# Columns handed back by INSERT/UPDATE ... RETURNING (everything EntryOut needs;
+# skips the generated search_vector)
+RETURNING_COLUMNS = (
+    EntryModel.id,
+    EntryModel.work,
+    EntryModel.struggle,
+    EntryModel.intention,
+    EntryModel.created_at,
+    EntryModel.updated_at,
+)
+
+# Rows per INSERT statement for bulk creates (asyncpg caps a statement at 32767 params)
+BULK_CHUNK_SIZE = 500
+
+# Hot statements are built once, with bound parameters, and executed with a
+# params dict. Building a construct and computing its cache key is a large part
+# of SQLAlchemy's per-query Python cost; a reused statement memoizes its key, so
+# each call only looks up the compiled form. The SQL text is identical on every
+# call too, which is what asyncpg's per-connection prepared-statement cache is
+# keyed on (DB_STATEMENT_CACHE_SIZE).
+_ENTRY_BY_ID = select(EntryModel).where(EntryModel.id == bindparam("entry_id"))
+# One array parameter, so any number of ids shares one statement (an expanding
+# IN would produce different SQL per count)
+_ENTRIES_BY_IDS = select(EntryModel).where(
+    EntryModel.id == any_(bindparam("entry_ids", type_=ARRAY(EntryModel.id.type)))
+)
+_INSERT_ENTRY = insert(EntryModel).returning(*RETURNING_COLUMNS)
+_DELETE_ENTRY = (
+    delete(EntryModel).where(EntryModel.id == bindparam("entry_id")).returning(EntryModel.id)
+)
+
+# `q` matches full-text (stemmed words) or a case-insensitive substring of any
+# field; binds `q` and `pattern` (see _filter_params)
+_TS_QUERY = func.websearch_to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), bindparam("q", type_=String))
+_PATTERN = bindparam("pattern", type_=String)
+_MATCHES_Q = or_(
+    EntryModel.search_vector.bool_op("@@")(_TS_QUERY),
+    EntryModel.work.ilike(_PATTERN),
+    EntryModel.struggle.ilike(_PATTERN),
+    EntryModel.intention.ilike(_PATTERN),
+)
+
+# Half-open creation-time range: created_after <= created_at < created_before
+_CREATED_AFTER = EntryModel.created_at >= bindparam(
+    "created_after", type_=EntryModel.created_at.type
+)
+_CREATED_BEFORE = EntryModel.created_at < bindparam(
+    "created_before", type_=EntryModel.created_at.type
+)
+
+# Planner estimate for the unfiltered table (count_entries, "estimated"): the
+# sum over entry's partitions, or entry itself if it isn't partitioned. A
+# partitioned parent's own reltuples is -1 or, once analyzed, the total again.
+# reltuples is -1 until a table is first vacuumed or analyzed: no estimate (NULL)
+# if none of them has been.
+_pg_class = table("pg_class", column("oid"), column("relkind"), column("reltuples"))
+_pg_inherits = table("pg_inherits", column("inhrelid"), column("inhparent"))
+_ENTRY_OID = func.to_regclass(EntryModel.__tablename__)
+_TABLE_ROWS_ESTIMATE = select(cast(func.sum(_pg_class.c.reltuples), BigInteger)).where(
+    _pg_class.c.reltuples >= 0,
+    or_(
+        (_pg_class.c.oid == _ENTRY_OID) & (_pg_class.c.relkind != "p"),
+        _pg_class.c.oid.in_(
+            select(_pg_inherits.c.inhrelid).where(_pg_inherits.c.inhparent == _ENTRY_OID)
+        ),
+    ),
+)
 
 
 class EntryService:
-    def __init__(self, db: AsyncSession):
+    def __init__(
+        self,
+        db: AsyncSession,
+        cache: EntryCache | None = None,
+        group_commit: "GroupCommitter | None" = None,
+        counts: CountCache | None = None,
+        fill_cache: bool = True,
+    ):
         self.db = db
+        self.cache = cache
+        # False for sessions that may return stale rows (a lagging replica):
+        # the cache is still read, but never filled from them
+        self.fill_cache = fill_cache
+        self.group_commit = group_commit
+        self.counts = counts
 
     async def create_entry(self, entry_in: EntryCreate) -> EntryOut:
-        new_entry = EntryModel(
-            id=str(uuid4()),
-            work=entry_in.work,
-            struggle=entry_in.struggle,
-            intention=entry_in.intention,
-        )
-        self.db.add(new_entry)
+        if self.group_commit is not None:
+            # Batched with concurrent creates into one INSERT + COMMIT (ENTRY_GROUP_COMMIT);
+            # resolves only once that commit has succeeded.
+            return await self.group_commit.submit(entry_in)
+        # INSERT ... RETURNING hands back the server defaults (created_at/updated_at)
+        # so no refresh round trip is needed after commit.
+        result = await self.db.execute(_INSERT_ENTRY, {"id": uuid7(), **entry_in.model_dump()})
+        new_entry = result.one()
         await self.db.commit()
-        await self.db.refresh(new_entry)
         return EntryOut.model_validate(new_entry)
 
-    async def get_entry_by_id(self, entry_id: str) -> EntryOut | None:
-        result = await self.db.execute(select(EntryModel).where(EntryModel.id == entry_id))
+    async def create_entries(self, entries_in: list[EntryCreate]) -> list[EntryOut]:
+        """
+        Insert many entries in one transaction using multi-row INSERT ... RETURNING,
+        chunked at BULK_CHUNK_SIZE rows. Results keep the input order.
+        """
+        return await insert_entries(self.db, entries_in)
+
+    async def get_entry_by_id(self, entry_id: UUID | str) -> EntryOut | None:
+        uid = _parse_id(entry_id)
+        if uid is None:
+            return None
+        if self.cache is not None:
+            cached = await self.cache.get(str(uid))
+            if cached is not None:
+                return cached
+        result = await self.db.execute(_ENTRY_BY_ID, {"entry_id": uid})
         entry = result.scalar_one_or_none()
-        return EntryOut.model_validate(entry) if entry else None
+        if not entry:
+            return None
+        out = EntryOut.model_validate(entry)
+        if self.cache is not None and self.fill_cache:
+            await self.cache.set(str(uid), out)
+        return out
+
+    async def get_entries_by_ids(self, entry_ids: Sequence[UUID | str]) -> EntryBatch:
+        """
+        Entries for `entry_ids` in the requested order (repeats once), plus the
+        requested ids that match nothing. Served from the entry cache where
+        possible; the rest is one `id = ANY(:entry_ids)` query, then cached.
+        """
+        wanted = {str(entry_id): _parse_id(entry_id) for entry_id in entry_ids}
+        keys = list(dict.fromkeys(str(uid) for uid in wanted.values() if uid is not None))
+        found: dict[str, EntryOut] = {}
+        if self.cache is not None and keys:
+            cached = await self.cache.get_many(keys)
+            found = {key: out for key, out in zip(keys, cached, strict=True) if out is not None}
+
+        misses = [UUID(key) for key in keys if key not in found]
+        if misses:
+            result = await self.db.execute(_ENTRIES_BY_IDS, {"entry_ids": misses})
+            fetched = {str(entry.id): EntryOut.model_validate(entry) for entry in result.scalars()}
+            if self.cache is not None and self.fill_cache and fetched:
+                await self.cache.set_many(fetched)
+            found.update(fetched)
+
+        return EntryBatch(
+            items=[found[key] for key in keys if key in found],
+            missing=[
+                entry_id for entry_id, uid in wanted.items() if uid is None or str(uid) not in found
+            ],
+        )
 
     async def get_all_entries(self) -> list[EntryOut]:
         result = await self.db.execute(select(EntryModel))
         entries = result.scalars().all()
         return [EntryOut.model_validate(entry) for entry in entries]
 
-    async def update_entry(self, entry_id: str, entry_in: EntryUpdate) -> EntryOut | None:
-        result = await self.db.execute(select(EntryModel).where(EntryModel.id == entry_id))
-        entry = result.scalar_one_or_none()
+    async def list_entries(
+        self,
+        *,
+        limit: int = 50,
+        cursor: str | None = None,
+        q: str | None = None,
+        sort: SortOrder = "new",
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> EntryPage:
+        return await query_entries(
+            self.db,
+            limit=limit,
+            cursor=cursor,
+            q=q,
+            sort=sort,
+            created_after=created_after,
+            created_before=created_before,
+        )
+
+    async def count_entries(
+        self,
+        *,
+        q: str | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        mode: CountMode = "exact",
+    ) -> tuple[int, CountMode]:
+        return await total_entries(
+            self.db,
+            q=q,
+            created_after=created_after,
+            created_before=created_before,
+            mode=mode,
+            cache=self.counts,
+        )
+
+    async def entry_stats(
+        self,
+        *,
+        bucket: StatsBucket = "day",
+        created_after: date | None = None,
+        created_before: date | None = None,
+    ) -> EntryStats:
+        """
+        Entry counts and average field lengths per day or week (UTC), read from the
+        trigger-maintained `entry_daily_stats` rollup, so `entry` is never scanned.
+        `created_after` is inclusive and `created_before` exclusive, as whole days.
+        """
+        params: dict[str, Any] = {}
+        if created_after is not None:
+            params["after_day"] = created_after
+        if created_before is not None:
+            params["before_day"] = created_before
+        stmt = _stats_statement(
+            bucket, after=created_after is not None, before=created_before is not None
+        )
+        result = await self.db.execute(stmt, params)
+        return EntryStats(
+            bucket=bucket,
+            buckets=[
+                EntryStatsBucket(
+                    start=row.start,
+                    entries=row.entries,
+                    avg_work_length=row.work_chars / row.entries,
+                    avg_struggle_length=row.struggle_chars / row.entries,
+                    avg_intention_length=row.intention_chars / row.entries,
+                )
+                for row in result
+            ],
+        )
+
+    async def iter_entries(self, chunk_size: int = 1000) -> AsyncIterator[list[EntryOut]]:
+        """
+        Yield every entry, oldest first, in lists of at most `chunk_size`.
+        Uses a server-side cursor so memory stays flat regardless of table size.
+        """
+        stmt = (
+            select(EntryModel)
+            .order_by(EntryModel.created_at.asc(), EntryModel.id.asc())
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.db.stream(stmt)
+        async for rows in result.scalars().partitions():
+            yield [EntryOut.model_validate(row) for row in rows]
+
+    async def update_entry(self, entry_id: UUID | str, entry_in: EntryUpdate) -> EntryOut | None:
+        values = entry_in.model_dump(exclude_unset=True)
+        if not values:
+            # Nothing to change; matches the old behaviour of not touching updated_at
+            return await self.get_entry_by_id(entry_id)
+        uid = _parse_id(entry_id)
+        if uid is None:
+            return None
+
+        # Single UPDATE ... RETURNING; `updated_at` is bumped by the column's onupdate.
+        params = {f"v_{field}": value for field, value in values.items()}
+        result = await self.db.execute(
+            _update_statement(tuple(sorted(values))), {"entry_id": uid, **params}
+        )
+        entry = result.one_or_none()
         if not entry:
             return None
-        for field, value in entry_in.model_dump(exclude_unset=True).items():
-            setattr(entry, field, value)
         await self.db.commit()
-        await self.db.refresh(entry)
+        await self._invalidate(uid)
         return EntryOut.model_validate(entry)
 
-    async def delete_entry(self, entry_id: str) -> bool:
-        result = await self.db.execute(select(EntryModel).where(EntryModel.id == entry_id))
-        entry = result.scalar_one_or_none()
-        if not entry:
+    async def delete_entry(self, entry_id: UUID | str) -> bool:
+        uid = _parse_id(entry_id)
+        if uid is None:
+            return False
+        result = await self.db.execute(_DELETE_ENTRY, {"entry_id": uid})
+        if result.scalar_one_or_none() is None:
             return False
-        await self.db.delete(entry)
         await self.db.commit()
+        await self._invalidate(uid)
         return True
 
-# --- added by one-shot: flexible listing helper ---
-from typing import Optional
+    async def _invalidate(self, entry_id: UUID) -> None:
+        # After commit, so reads that start later miss the cache and see the new row.
+        # A read that loaded the row before the commit may still try to cache it;
+        # the invalidation marker left by `delete` keeps it out (see app.services.cache).
+        if self.cache is not None:
+            await self.cache.delete(str(entry_id))
+
+
+def _parse_id(entry_id: UUID | str) -> UUID | None:
+    """Ids arrive as path strings; one that isn't a UUID matches no entry."""
+    if isinstance(entry_id, UUID):
+        return entry_id
+    try:
+        return UUID(entry_id)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=16)
+def _update_statement(fields: tuple[str, ...]) -> Update:
+    """
+    UPDATE ... RETURNING for one combination of changed fields, built once per
+    combination. Values bind as `v_<field>` (a bind name may not match a column).
+    """
+    return (
+        update(EntryModel)
+        .where(EntryModel.id == bindparam("entry_id"))
+        .values({field: bindparam(f"v_{field}") for field in fields})
+        .returning(*RETURNING_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def insert_entries(
+    session: AsyncSession, entries_in: Sequence[EntryCreate], *, commit: bool = True
+) -> list[EntryOut]:
+    """
+    Multi-row INSERT ... RETURNING in BULK_CHUNK_SIZE chunks, then one COMMIT
+    (left to the caller with commit=False). Results keep the input order.
+    Shared by bulk create and group commit.
+    """
+    stmt = insert(EntryModel).returning(*RETURNING_COLUMNS, sort_by_parameter_order=True)
+    created: list[EntryOut] = []
+    for start in range(0, len(entries_in), BULK_CHUNK_SIZE):
+        params = [
+            {"id": uuid7(), **entry_in.model_dump()}
+            for entry_in in entries_in[start : start + BULK_CHUNK_SIZE]
+        ]
+        result = await session.execute(stmt, params)
+        created.extend(EntryOut.model_validate(row) for row in result.all())
+    if commit:
+        await session.commit()
+    return created
+
 
-# Note: local imports keep this patch self-contained
 async def query_entries(
-    session, *,
+    session: AsyncSession,
+    *,
     limit: int = 50,
-    offset: int = 0,
-    q: Optional[str] = None,
-    sort: str = "new",  # "new" | "old"
-):
-    from sqlalchemy import select, or_
-    from app.models.entry import Entry
+    cursor: str | None = None,
+    q: str | None = None,
+    sort: SortOrder = "new",
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+) -> EntryPage:
+    """
+    Paginated listing/search.
+    - "new"/"old": keyset pagination on `(created_at, id)`; seeks past `cursor`
+      instead of using OFFSET, so every page costs the same regardless of depth.
+    - "relevance" (needs `q`): ranked by ts_rank_cd over the full-text index;
+      the cursor carries an offset since rank has no stable keyset.
+    `q` matches full-text (stemmed words) or a case-insensitive substring of any
+    field; both are index-backed (GIN tsvector / pg_trgm). `created_after`
+    (inclusive) and `created_before` (exclusive) bound `created_at`. Raises
+    ValueError for a malformed cursor.
+    """
+    stmt, params = entries_query(
+        limit=limit,
+        cursor=cursor,
+        q=q,
+        sort=sort,
+        created_after=created_after,
+        created_before=created_before,
+    )
+    res = await session.execute(stmt, params)
+    rows = list(res.scalars().all())
+    items = [EntryOut.model_validate(row) for row in rows[:limit]]
 
-    stmt = select(Entry)
+    next_cursor = None
+    if len(rows) > limit:
+        if _ranked(q, sort):
+            offset = decode_offset_cursor(cursor) if cursor else 0
+            next_cursor = encode_offset_cursor(offset + limit)
+        else:
+            last = items[-1]
+            next_cursor = encode_cursor(last.created_at, str(last.id))
+    return EntryPage(items=items, next_cursor=next_cursor)
 
-    if q:
-        pattern = f"%{q}%"
-        stmt = stmt.where(
-            or_(
-                Entry.work.ilike(pattern),
-                Entry.struggle.ilike(pattern),
-                Entry.intention.ilike(pattern),
-            )
+
+def entries_query(
+    *,
+    limit: int = 50,
+    cursor: str | None = None,
+    q: str | None = None,
+    sort: SortOrder = "new",
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+) -> tuple[Select[tuple[EntryModel]], dict[str, Any]]:
+    """
+    The statement behind `query_entries` and its parameters. Fetches `limit + 1`
+    rows so the caller can tell whether another page exists.
+    """
+    params = {"limit": limit + 1, **_filter_params(q, created_after, created_before)}
+    ranked = _ranked(q, sort)
+    if ranked:
+        params["offset"] = decode_offset_cursor(cursor) if cursor else 0
+    elif cursor:
+        params["after_ts"], after_id = decode_cursor(cursor)
+        params["after_id"] = UUID(after_id)  # ValueError for a forged id, like the rest
+    stmt = _page_statement(
+        search=bool(q),
+        ranked=ranked,
+        seek=bool(cursor) and not ranked,
+        ascending=sort == "old",
+        after=created_after is not None,
+        before=created_before is not None,
+    )
+    return stmt, params
+
+
+@lru_cache(maxsize=64)
+def _page_statement(
+    *, search: bool, ranked: bool, seek: bool, ascending: bool, after: bool, before: bool
+) -> Select[tuple[EntryModel]]:
+    """One prebuilt statement per query shape; every value is a bound parameter."""
+    stmt = select(EntryModel).where(*_filters(search=search, after=after, before=before))
+
+    if ranked:  # only with `search`
+        rank = func.ts_rank_cd(EntryModel.search_vector, _TS_QUERY)
+        return (
+            stmt.order_by(rank.desc(), EntryModel.created_at.desc(), EntryModel.id.desc())
+            .offset(bindparam("offset", type_=Integer))
+            .limit(bindparam("limit", type_=Integer))
         )
 
-    stmt = stmt.order_by(
-        Entry.created_at.desc() if sort == "new" else Entry.created_at.asc()
-    ).limit(limit).offset(offset)
+    if seek:
+        key = tuple_(EntryModel.created_at, EntryModel.id)
+        after_ts = bindparam("after_ts", type_=EntryModel.created_at.type)
+        last_seen = tuple_(after_ts, bindparam("after_id", type_=EntryModel.id.type))
+        # The plain created_at bound is implied by the row comparison, but only
+        # it lets the planner skip partitions on the far side of the cursor
+        if ascending:
+            stmt = stmt.where(key > last_seen, EntryModel.created_at >= after_ts)
+        else:
+            stmt = stmt.where(key < last_seen, EntryModel.created_at <= after_ts)
+
+    if ascending:
+        stmt = stmt.order_by(EntryModel.created_at.asc(), EntryModel.id.asc())
+    else:
+        stmt = stmt.order_by(EntryModel.created_at.desc(), EntryModel.id.desc())
+    return stmt.limit(bindparam("limit", type_=Integer))
+
+
+async def total_entries(
+    session: AsyncSession,
+    *,
+    q: str | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    mode: CountMode = "exact",
+    cache: CountCache | None = None,
+) -> tuple[int, CountMode]:
+    """
+    Rows matching the filters (every row without any) and the mode that produced
+    the number.
+    - "exact": COUNT(*), reused from `cache` per filter set until its TTL runs out.
+    - "estimated": the planner's row estimate, never a scan: pg_class.reltuples
+      (kept current by autovacuum/ANALYZE) when unfiltered, else the EXPLAIN
+      estimate of the filtered query. Falls back to "exact" while the table has
+      never been analyzed.
+    """
+    params = _filter_params(q, created_after, created_before)
+    shape = _Shape(
+        search=bool(q), after=created_after is not None, before=created_before is not None
+    )
+    if mode == "estimated":
+        estimate = await (_planner_rows(session, shape, params) if params else _table_rows(session))
+        if estimate is not None:
+            return estimate, "estimated"
+
+    key = repr((q or "", created_after, created_before))
+    total = cache.get(key) if cache is not None else None
+    if total is None:
+        result = await session.execute(_count_statement(shape), params)
+        total = int(result.scalar_one())
+        if cache is not None:
+            cache.set(key, total)
+    return total, "exact"
+
+
+async def _table_rows(session: AsyncSession) -> int | None:
+    rows = (await session.execute(_TABLE_ROWS_ESTIMATE)).scalar_one_or_none()
+    return None if rows is None else int(rows)
+
+
+async def _planner_rows(session: AsyncSession, shape: "_Shape", params: dict[str, Any]) -> int:
+    conn = await session.connection()
+    sql, compiled = _explain_matching(conn.dialect, shape)
+    values = compiled.construct_params(params)
+    result = await conn.exec_driver_sql(
+        sql, tuple(values[name] for name in compiled.positiontup or ())
+    )
+    plan = result.scalar_one()
+    if isinstance(plan, str):  # json arrives as text unless the driver decodes it
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class _Shape(NamedTuple):
+    """Which filters a query has (their values are bound parameters)."""
+
+    search: bool
+    after: bool
+    before: bool
+
+
+@lru_cache(maxsize=16)
+def _count_statement(shape: _Shape) -> Select[tuple[int]]:
+    return select(func.count()).select_from(EntryModel).where(*_filters(**shape._asdict()))
+
+
+@lru_cache(maxsize=16)
+def _explain_matching(dialect: Dialect, shape: _Shape) -> tuple[str, SQLCompiler]:
+    # EXPLAIN is not a SQLAlchemy construct: compile the query once per shape
+    stmt = select(EntryModel.id).where(*_filters(**shape._asdict()))
+    compiled = stmt.compile(dialect=dialect)
+    assert isinstance(compiled, SQLCompiler)  # nosec B101: a SELECT compiles to one
+    return f"EXPLAIN (FORMAT JSON) {compiled}", compiled
+
+
+@lru_cache(maxsize=8)
+def _stats_statement(bucket: StatsBucket, *, after: bool, before: bool) -> Select[Any]:
+    # The rollup has one row per UTC day and writer slot; fold them into buckets
+    day = EntryDailyStats.day
+    start = cast(
+        func.date_trunc(literal_column(f"'{bucket}'"), cast(day, DateTime(timezone=False))),
+        Date,
+    ).label("start")
+    # sum(bigint) is numeric in Postgres; the totals fit a bigint
+    stmt = select(
+        start,
+        *(
+            cast(func.sum(col), BigInteger).label(col.key)
+            for col in (
+                EntryDailyStats.entries,
+                EntryDailyStats.work_chars,
+                EntryDailyStats.struggle_chars,
+                EntryDailyStats.intention_chars,
+            )
+        ),
+    )
+    if after:
+        stmt = stmt.where(day >= bindparam("after_day", type_=Date))
+    if before:
+        stmt = stmt.where(day < bindparam("before_day", type_=Date))
+    # Days whose entries were all deleted keep a zeroed row
+    return stmt.group_by(start).having(func.sum(EntryDailyStats.entries) > 0).order_by(start)
+
+
+def _filters(*, search: bool, after: bool, before: bool) -> list[ColumnElement[bool]]:
+    conditions = []
+    if search:
+        conditions.append(_MATCHES_Q)
+    if after:
+        conditions.append(_CREATED_AFTER)
+    if before:
+        conditions.append(_CREATED_BEFORE)
+    return conditions
+
+
+def _filter_params(
+    q: str | None, created_after: datetime | None, created_before: datetime | None
+) -> dict[str, Any]:
+    params: dict[str, Any] = {}
+    if q:
+        params.update(q=q, pattern=f"%{q}%")
+    if created_after is not None:
+        params["created_after"] = created_after
+    if created_before is not None:
+        params["created_before"] = created_before
+    return params
+
 
-    res = await session.execute(stmt)
-    return list(res.scalars().all())
+def _ranked(q: str | None, sort: SortOrder) -> bool:
+    return bool(q) and sort == "relevance"
@@ -0,0 +1,59 @@
+import csv
+import io
+from collections.abc import AsyncIterator
+from typing import Literal
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.schemas.entry import EntryOut
+from app.services.entry_service import EntryService
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+CSV_COLUMNS = ("id", "work", "struggle", "intention", "created_at", "updated_at")
+
+
+def _ndjson(chunk: list[EntryOut]) -> bytes:
+    return "".join(f"{item.model_dump_json()}\n" for item in chunk).encode()
+
+
+def _csv(chunk: list[EntryOut], header: bool) -> bytes:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    if header:
+        writer.writerow(CSV_COLUMNS)
+    for item in chunk:
+        writer.writerow(
+            [
+                item.id,
+                item.work,
+                item.struggle,
+                item.intention,
+                item.created_at.isoformat(),
+                item.updated_at.isoformat(),
+            ]
+        )
+    return buf.getvalue().encode()
+
+
+async def stream_export(
+    session_factory: async_sessionmaker[AsyncSession],
+    fmt: ExportFormat = "ndjson",
+    chunk_size: int = 1000,
+) -> AsyncIterator[bytes]:
+    """
+    Encode all entries as NDJSON or CSV, one bytes chunk per DB fetch.
+    Owns its session: a StreamingResponse body runs after the request's
+    dependencies have been torn down.
+    """
+    async with session_factory() as session:
+        service = EntryService(session)
+        if fmt == "csv":
+            yield _csv([], header=True)
+        async for chunk in service.iter_entries(chunk_size):
+            yield _csv(chunk, header=False) if fmt == "csv" else _ndjson(chunk)
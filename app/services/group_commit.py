@@ -0,0 +1,188 @@
+# app/services/group_commit.py
+"""
+Group commit for single-entry creates (opt-in: ENTRY_GROUP_COMMIT=true).
+
+Concurrent `EntryService.create_entry` calls are queued and a background task
+flushes them together: it waits up to ENTRY_GROUP_COMMIT_MAX_WAIT_MS after the
+first queued item, or until ENTRY_GROUP_COMMIT_MAX_ITEMS are queued. The batch
+is written with one multi-row INSERT ... RETURNING and one COMMIT on its own
+session. That is one transaction and one WAL fsync instead of N.
+
+Durability is unchanged: a caller's result is only returned after that COMMIT
+succeeded, so a 201 still means the row is on disk. If an INSERT fails, the
+batch's items are retried one transaction each, so a bad row only fails its
+own request. If the COMMIT itself fails, the batch may or may not be on disk,
+so it is not retried (that could insert it twice) and every caller gets the
+error. Under light load the added latency is at most the max wait.
+
+At most ENTRY_GROUP_COMMIT_MAX_PENDING creates are queued; past that `submit`
+waits for room, so a stalled database holds callers back instead of piling up
+rows in memory.
+
+The worker runs in a context of its own, outside any request's query scope.
+Each batch's queries and DB time are added to the scope of every request in
+it (app.db.instrumentation), so Server-Timing, the per-request DB metrics and
+admission control see the INSERT their request waited for.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+from contextlib import suppress
+from functools import lru_cache
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.db.instrumentation import QueryStats, current_stats, track_queries
+from app.db.session import get_session_factory
+from app.schemas.entry import EntryCreate, EntryOut
+from app.services.entry_service import insert_entries
+
+logger = logging.getLogger(__name__)
+
+# (entry, its caller's result, its caller's query scope)
+_Pending = tuple[EntryCreate, asyncio.Future[EntryOut], QueryStats | None]
+
+
+class _CommitFailed(Exception):
+    """The batch's COMMIT raised `error`; whether it was applied is unknown."""
+
+    def __init__(self, error: Exception) -> None:
+        super().__init__(str(error))
+        self.error = error
+
+
+class GroupCommitter:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        max_items: int = 100,
+        max_wait: float = 0.005,
+        max_pending: int = 1000,
+    ):
+        self.session_factory = session_factory
+        self.max_items = max_items
+        self.max_wait = max_wait
+        self.max_pending = max_pending
+        self._queue: asyncio.Queue[_Pending | None] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    async def submit(self, entry_in: EntryCreate) -> EntryOut:
+        """Queue one create (waiting for room) and wait until its batch has committed."""
+        queue = self._ensure_worker()
+        future: asyncio.Future[EntryOut] = asyncio.get_running_loop().create_future()
+        await queue.put((entry_in, future, current_stats()))
+        return await future
+
+    async def aclose(self) -> None:
+        """Flush whatever is queued, then stop the worker (app shutdown)."""
+        if self._task is None or self._queue is None or self._task.done():
+            return
+        await self._queue.put(None)
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = self._queue = None
+
+    def _ensure_worker(self) -> asyncio.Queue[_Pending | None]:
+        # (Re)started lazily so the queue and task belong to the running loop
+        if (
+            self._queue is None
+            or self._task is None
+            or self._task.done()
+            or self._task.get_loop() is not asyncio.get_running_loop()
+        ):
+            self._queue = asyncio.Queue(self.max_pending)
+            # A fresh context: created from inside a request, the task would otherwise
+            # inherit that request's query scope and bill every later batch to it
+            self._task = asyncio.create_task(
+                self._run(self._queue), name="entry-group-commit", context=contextvars.Context()
+            )
+        return self._queue
+
+    async def _run(self, queue: asyncio.Queue[_Pending | None]) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await queue.get()
+            if first is None:
+                return
+            batch = [first]
+            closing = False
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_items:
+                try:
+                    if queue.empty():
+                        timeout = deadline - loop.time()
+                        if timeout <= 0:
+                            break
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    else:
+                        item = queue.get_nowait()
+                except TimeoutError:
+                    break
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+            if closing:
+                return
+
+    async def _flush(self, batch: list[_Pending]) -> None:
+        try:
+            created = await self._insert(batch)
+        except _CommitFailed as e:
+            logger.error("Group commit of %d entries failed at COMMIT: %s", len(batch), e)
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e.error)
+            return
+        except Exception as e:
+            if len(batch) == 1:
+                future = batch[0][1]
+                if not future.done():
+                    future.set_exception(e)
+                return
+            logger.warning("Group commit of %d entries failed; retrying one by one", len(batch))
+            for pending in batch:
+                await self._flush([pending])
+            return
+        for (_, future, _), out in zip(batch, created, strict=True):
+            # A waiter may have been cancelled (client went away); its row stays committed.
+            if not future.done():
+                future.set_result(out)
+
+    async def _insert(self, batch: list[_Pending]) -> list[EntryOut]:
+        """
+        One INSERT + COMMIT for `batch`, counted in every caller's query scope.
+        Raises _CommitFailed when the COMMIT itself fails.
+        """
+        with track_queries() as stats:
+            try:
+                async with self.session_factory() as session:
+                    entries = [entry_in for entry_in, _, _ in batch]
+                    created = await insert_entries(session, entries, commit=False)
+                    try:
+                        await session.commit()
+                    except Exception as e:
+                        raise _CommitFailed(e) from e
+                    return created
+            finally:
+                for _, _, request_stats in batch:
+                    if request_stats is not None:
+                        request_stats.add(stats)
+
+
+@lru_cache
+def get_group_committer() -> GroupCommitter | None:
+    """Process-wide committer per settings, or None when ENTRY_GROUP_COMMIT is off."""
+    settings = get_settings()
+    if not settings.entry_group_commit:
+        return None
+    return GroupCommitter(
+        get_session_factory(),
+        max_items=settings.entry_group_commit_max_items,
+        max_wait=settings.entry_group_commit_max_wait_ms / 1000,
+        max_pending=settings.entry_group_commit_max_pending,
+    )
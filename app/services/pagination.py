@@ -0,0 +1,46 @@
+import base64
+import binascii
+from datetime import datetime
+
+
+def encode_cursor(created_at: datetime, entry_id: str) -> str:
+    """Encode a keyset position `(created_at, id)` as an opaque, URL-safe token."""
+    raw = f"{created_at.isoformat()}|{entry_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """
+    Decode a token produced by `encode_cursor`.
+    Raises ValueError if the token is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        created_at, entry_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), entry_id
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Opaque token for orderings with no stable keyset (e.g. search relevance)."""
+    return base64.urlsafe_b64encode(f"#{offset}".encode()).decode().rstrip("=")
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    """
+    Decode a token produced by `encode_offset_cursor`.
+    Raises ValueError if the token is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        if not raw.startswith("#"):
+            raise ValueError("not an offset cursor")
+        offset = int(raw[1:])
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+    if offset < 0:
+        raise ValueError("Invalid cursor")
+    return offset
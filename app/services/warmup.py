@@ -0,0 +1,128 @@
+# app/services/warmup.py
+"""
+Startup warm-up, run from the app lifespan before the worker reports ready.
+
+Without it the first requests on a fresh worker pay for connection setup,
+SQLAlchemy statement compilation (cached per engine), asyncpg statement
+preparation (cached per connection) and pydantic's first validation and
+serialization. The warm-up:
+  - opens `connections` pooled connections at once, so they stay in the pool;
+  - runs the EntryService queries on each of them, so each connection has them
+    prepared. Writes run in a transaction that is rolled back: service commits
+    only release a savepoint, so nothing persists;
+  - validates and serializes EntryOut/EntryPage once.
+Failures are logged but never block startup: the worker then behaves as it
+would without warm-up.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from sqlalchemy.pool import QueuePool
+
+from app.core.etag import page_etag
+from app.core.responses import ModelJSONResponse
+from app.db.instrumentation import prepared_statement_counts
+from app.schemas.entry import EntryCreate, EntryOut, EntryPage, EntryUpdate
+from app.services.entry_service import EntryService, SortOrder
+from app.services.pagination import encode_cursor
+
+logger = logging.getLogger(__name__)
+
+# Never matches a row; only used for the read/update/delete statements
+WARMUP_ID = "00000000-0000-0000-0000-000000000000"
+
+
+def warm_schemas() -> None:
+    """One validation/serialization pass through the schemas the endpoints use."""
+    now = datetime.now(UTC)
+    EntryCreate.model_validate({"work": "w", "struggle": "s", "intention": "i"})
+    EntryUpdate.model_validate({"work": "w"})
+    row = SimpleNamespace(
+        id=WARMUP_ID, work="w", struggle="s", intention="i", created_at=now, updated_at=now
+    )
+    page = EntryPage(items=[EntryOut.model_validate(row)], next_cursor=None)
+    ModelJSONResponse(page)
+    page_etag(page)
+
+
+async def warm_connection(conn: AsyncConnection, *, writes: bool = True) -> None:
+    """Run every EntryService statement once on `conn`, leaving no trace."""
+    trans = await conn.begin()
+    try:
+        session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+        async with session:
+            service = EntryService(session)
+            await service.get_entry_by_id(WARMUP_ID)
+            await service.get_entries_by_ids([WARMUP_ID])
+            orders: tuple[SortOrder, ...] = ("new", "old")
+            for sort in orders:
+                await service.list_entries(limit=1, sort=sort)
+                await service.list_entries(
+                    limit=1, sort=sort, cursor=encode_cursor(datetime.now(UTC), WARMUP_ID)
+                )
+            await service.list_entries(limit=1, q="warmup")
+            await service.list_entries(limit=1, q="warmup", sort="relevance")
+            await service.list_entries(
+                limit=1, created_after=datetime.now(UTC), created_before=datetime.now(UTC)
+            )
+            await service.entry_stats(created_after=datetime.now(UTC).date())
+            if writes:
+                created = await service.create_entry(
+                    EntryCreate(work="warmup", struggle="warmup", intention="warmup")
+                )
+                await service.update_entry(str(created.id), EntryUpdate(work="warmup"))
+                await service.delete_entry(str(created.id))
+    finally:
+        await trans.rollback()
+
+
+async def warm_pool(engine: AsyncEngine, connections: int, *, writes: bool = True) -> int:
+    """
+    Check out up to `connections` connections concurrently (so they are distinct)
+    and warm each. Returns how many were warmed; 0 for NullPool, which keeps nothing.
+    """
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, QueuePool) or connections <= 0:
+        return 0
+    count = min(connections, pool.size())
+
+    async def one() -> None:
+        async with engine.connect() as conn:
+            await warm_connection(conn, writes=writes)
+
+    await asyncio.gather(*(one() for _ in range(count)))
+    return count
+
+
+async def warm_up(
+    engine: AsyncEngine,
+    connections: int,
+    timeout: float,
+    replica: AsyncEngine | None = None,
+) -> bool:
+    """Full warm-up; True if it completed, False if it failed or timed out (logged)."""
+    start = time.perf_counter()
+    try:
+        warm_schemas()
+        async with asyncio.timeout(timeout):
+            warmed = await warm_pool(engine, connections)
+            if replica is not None:
+                await warm_pool(replica, connections, writes=False)
+    except Exception as e:
+        logger.warning(
+            "Warm-up incomplete after %.0f ms: %r", (time.perf_counter() - start) * 1000, e
+        )
+        return False
+    logger.info(
+        "Warm-up done in %.0f ms (%d pooled connections prepared, up to %d cached statements each)",
+        (time.perf_counter() - start) * 1000,
+        warmed,
+        max(prepared_statement_counts(engine), default=0),
+    )
+    return True
@@ -0,0 +1,109 @@
+# benchmarks/bench_insert_keys.py
+"""
+Insert throughput by primary key scheme, against a real Postgres:
+  - "text-uuid4": `id VARCHAR` filled with str(uuid4()) (how entry.id was stored)
+  - "uuid-v7":    native `id UUID` filled with app.core.ids.uuid7() (current)
+
+Each scheme gets its own table (id primary key, created_at, a text payload the
+size of a typical entry) in BENCH_DATABASE_URL (see benchmarks.suite). Rows
+go in as multi-row INSERTs of --batch rows, one transaction each, the way bulk
+create and group commit write them. Reported per scheme: rows/s overall, the
+median batch time over the last 10% of batches (once the index is large), and
+the primary key index size. Random keys touch a different leaf page per row,
+so the gap widens once the index outgrows shared_buffers; raise --rows to see it.
+
+Never point this at a database you care about: it drops and recreates its
+bench_key_* tables.
+
+Usage:
+    python -m benchmarks.bench_insert_keys [--rows 200000] [--batch 500]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Callable
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, func, insert, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.types import TypeEngine
+
+from app.core.ids import uuid7
+from benchmarks.suite import bench_database_url, ensure_database
+
+PAYLOAD = "worked on keyset pagination and struggled with partition pruning " * 3
+
+SCHEMES: dict[str, tuple[TypeEngine[Any], Callable[[], Any]]] = {
+    "text-uuid4": (String(), lambda: str(uuid4())),
+    "uuid-v7": (UUID(as_uuid=True), uuid7),
+}
+
+
+def bench_table(name: str, key_type: TypeEngine[Any]) -> Table:
+    return Table(
+        f"bench_key_{name.replace('-', '_')}",
+        MetaData(),
+        Column("id", key_type, primary_key=True),
+        Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+        Column("payload", String, nullable=False),
+    )
+
+
+async def run_scheme(engine: AsyncEngine, name: str, rows: int, batch: int) -> dict[str, float]:
+    key_type, new_id = SCHEMES[name]
+    table = bench_table(name, key_type)
+    async with engine.begin() as conn:
+        await conn.run_sync(table.drop, checkfirst=True)
+        await conn.run_sync(table.create)
+
+    stmt = insert(table)
+    batch_ms: list[float] = []
+    start = time.perf_counter()
+    for _ in range(0, rows, batch):
+        params = [{"id": new_id(), "payload": PAYLOAD} for _ in range(batch)]
+        batch_start = time.perf_counter()
+        async with engine.begin() as conn:
+            await conn.execute(stmt, params)
+        batch_ms.append((time.perf_counter() - batch_start) * 1000)
+    elapsed = time.perf_counter() - start
+
+    async with engine.connect() as conn:
+        index_bytes = await conn.scalar(
+            text("SELECT pg_relation_size(CAST(:index AS regclass))"),
+            {"index": f"{table.name}_pkey"},
+        )
+    tail = batch_ms[-max(1, len(batch_ms) // 10) :]
+    return {
+        "rows_per_s": rows / elapsed,
+        "tail_batch_ms": statistics.median(tail),
+        "pkey_mb": (index_bytes or 0) / 2**20,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    url = bench_database_url()
+    await ensure_database(url)
+    engine = create_async_engine(url, pool_size=1)
+    try:
+        print(f"{'scheme':>11}  {'rows/s':>9}  {'tail batch':>11}  {'pkey size':>10}")
+        for name in SCHEMES:
+            r = await run_scheme(engine, name, args.rows, args.batch)
+            print(
+                f"{name:>11}  {r['rows_per_s']:>9.0f}  {r['tail_batch_ms']:>8.1f} ms"
+                f"  {r['pkey_mb']:>7.1f} MB",
+                flush=True,
+            )
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=500)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,84 @@
+# benchmarks/bench_json_responses.py
+"""
+CPU cost of returning an EntryPage through FastAPI:
+  - "response_model": handler returns the model; FastAPI re-validates it against
+    response_model, runs jsonable_encoder and json.dumps (the old router path)
+  - "serialize-once": handler returns ModelJSONResponse (the current router path)
+
+No database is involved: both apps return a pre-built page, so the numbers
+isolate framework + serialization overhead per request.
+
+Usage:
+    python -m benchmarks.bench_json_responses [--requests 200]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from datetime import UTC, datetime
+from uuid import uuid4
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core.responses import ModelJSONResponse
+from app.schemas.entry import EntryOut, EntryPage
+
+
+def make_page(size: int) -> EntryPage:
+    now = datetime.now(UTC)
+    items = [
+        EntryOut(
+            id=uuid4(),
+            work=f"work item {i} " * 8,
+            struggle="struggled with something moderately long " * 3,
+            intention="tomorrow I will keep going",
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(size)
+    ]
+    return EntryPage(items=items, next_cursor="cursor")
+
+
+def build_apps(page: EntryPage) -> dict[str, FastAPI]:
+    baseline = FastAPI()
+    fast = FastAPI()
+
+    @baseline.get("/entries/", response_model=EntryPage)
+    async def list_baseline() -> EntryPage:
+        return page
+
+    @fast.get("/entries/", response_model=EntryPage)
+    async def list_fast() -> ModelJSONResponse:
+        return ModelJSONResponse(page)
+
+    return {"response_model": baseline, "serialize-once": fast}
+
+
+async def measure(app: FastAPI, requests: int) -> float:
+    """Mean CPU milliseconds per request (process time, so I/O waits don't count)."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        for _ in range(10):  # warm-up
+            await client.get("/entries/")
+        start = time.process_time()
+        for _ in range(requests):
+            response = await client.get("/entries/")
+            response.raise_for_status()
+        return (time.process_time() - start) * 1000 / requests
+
+
+async def main(requests: int) -> None:
+    print(f"{'items':>6}  {'response_model':>15}  {'serialize-once':>15}  {'saved':>8}")
+    for size in (100, 1000):
+        apps = build_apps(make_page(size))
+        results = {name: await measure(app, requests) for name, app in apps.items()}
+        base, fast = results["response_model"], results["serialize-once"]
+        print(f"{size:>6}  {base:>12.3f} ms  {fast:>12.3f} ms  {(1 - fast / base) * 100:>7.1f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    asyncio.run(main(parser.parse_args().requests))
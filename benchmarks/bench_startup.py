@@ -0,0 +1,66 @@
+# benchmarks/bench_startup.py
+"""
+Cold start of a worker, measured in fresh interpreters (what a scale-from-zero
+spawn or `python -m app.serve` worker pays):
+  - "import":        `import app.main`
+  - "lifespan":      import + lifespan startup (integrations set up)
+  - "first request": import + lifespan + GET /healthz answered
+
+Each phase is timed from interpreter start (time.perf_counter in the child),
+so Python's own startup is excluded; pass --with-interpreter to include it.
+The lifespan opens no DB connection by default, so no Postgres is needed.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 10]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess  # nosec B404
+import sys
+import time
+
+CHILD = """
+import json, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+from starlette.testclient import TestClient
+with TestClient(app.main.app) as client:
+    t2 = time.perf_counter()
+    client.get("/healthz")
+    t3 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "lifespan": t2 - t0, "first request": t3 - t0}))
+"""
+
+
+def run_once(with_interpreter: bool) -> dict[str, float]:
+    start = time.perf_counter()
+    proc = subprocess.run(  # nosec B603
+        [sys.executable, "-c", CHILD], capture_output=True, text=True, check=True
+    )
+    spawn = time.perf_counter() - start
+    timings: dict[str, float] = json.loads(proc.stdout.strip().splitlines()[-1])
+    if with_interpreter:
+        timings["process total"] = spawn
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--with-interpreter", action="store_true")
+    args = parser.parse_args()
+
+    run_once(args.with_interpreter)  # warm the OS page cache / .pyc files
+    runs = [run_once(args.with_interpreter) for _ in range(args.runs)]
+    print(f"{'phase':<16} {'median ms':>10} {'min ms':>8}")
+    for phase in runs[0]:
+        values = [r[phase] * 1000 for r in runs]
+        print(f"{phase:<16} {statistics.median(values):>10.1f} {min(values):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
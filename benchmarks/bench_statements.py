@@ -0,0 +1,125 @@
+# benchmarks/bench_statements.py
+"""
+Python-side cost per query of preparing a statement for the driver:
+  - "per-call": the statement is built on every call with the values inlined
+    (how EntryService worked before; reproduced below)
+  - "prebuilt": the module-level / cached bound-parameter statements that
+    EntryService uses now, executed with a params dict
+
+Each iteration does what SQLAlchemy does before handing SQL to asyncpg:
+build the construct (per-call only), compute its cache key, fetch the compiled
+form from the engine's compiled cache and process the parameters. No database
+is involved, so the numbers isolate that overhead for get, list and search.
+
+Usage:
+    python -m benchmarks.bench_statements [--iterations 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import Executable, cast, func, literal, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+from sqlalchemy.util import LRUCache
+
+from app.models.entry import SEARCH_CONFIG
+from app.models.entry import Entry as EntryModel
+from app.services.entry_service import _ENTRY_BY_ID, entries_query
+from app.services.pagination import encode_cursor
+
+ENTRY_ID = "123e4567-e89b-12d3-a456-426614174000"
+CURSOR = encode_cursor(datetime.now(UTC), ENTRY_ID)
+
+Query = Callable[[], tuple[Executable, dict[str, Any]]]
+
+
+def per_call_get() -> tuple[Executable, dict[str, Any]]:
+    return select(EntryModel).where(EntryModel.id == ENTRY_ID), {}
+
+
+def per_call_list() -> tuple[Executable, dict[str, Any]]:
+    after_ts = datetime.now(UTC)
+    key = tuple_(EntryModel.created_at, EntryModel.id)
+    stmt = (
+        select(EntryModel)
+        .where(key < tuple_(literal(after_ts), literal(ENTRY_ID)))
+        .order_by(EntryModel.created_at.desc(), EntryModel.id.desc())
+        .limit(51)
+    )
+    return stmt, {}
+
+
+def per_call_search() -> tuple[Executable, dict[str, Any]]:
+    q = "fastapi"
+    ts_query = func.websearch_to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), q)
+    pattern = f"%{q}%"
+    stmt = (
+        select(EntryModel)
+        .where(
+            or_(
+                EntryModel.search_vector.bool_op("@@")(ts_query),
+                EntryModel.work.ilike(pattern),
+                EntryModel.struggle.ilike(pattern),
+                EntryModel.intention.ilike(pattern),
+            )
+        )
+        .order_by(EntryModel.created_at.desc(), EntryModel.id.desc())
+        .limit(51)
+    )
+    return stmt, {}
+
+
+QUERIES: dict[str, dict[str, Query]] = {
+    "get": {
+        "per-call": per_call_get,
+        "prebuilt": lambda: (_ENTRY_BY_ID, {"entry_id": ENTRY_ID}),
+    },
+    "list": {
+        "per-call": per_call_list,
+        "prebuilt": lambda: entries_query(limit=50, cursor=CURSOR),
+    },
+    "search": {
+        "per-call": per_call_search,
+        "prebuilt": lambda: entries_query(limit=50, q="fastapi"),
+    },
+}
+
+
+def prepare(query: Query, dialect: Any, cache: LRUCache[Any, Any]) -> Any:
+    """Everything up to the driver call, as `Connection._execute_clauseelement` does it."""
+    stmt, params = query()
+    compiled, extracted, _ = stmt._compile_w_cache(  # type: ignore[attr-defined]
+        dialect, compiled_cache=cache, column_keys=sorted(params)
+    )
+    return compiled.construct_params(params, extracted_parameters=extracted)
+
+
+def measure(query: Query, iterations: int) -> float:
+    """Mean microseconds per query with a warm compiled cache."""
+    dialect = asyncpg_dialect()
+    cache: LRUCache[Any, Any] = LRUCache(500)
+    for _ in range(100):
+        prepare(query, dialect, cache)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        prepare(query, dialect, cache)
+    return (time.perf_counter() - start) * 1e6 / iterations
+
+
+def main(iterations: int) -> None:
+    print(f"{'query':>7}  {'per-call':>12}  {'prebuilt':>12}  {'saved':>8}")
+    for name, variants in QUERIES.items():
+        base = measure(variants["per-call"], iterations)
+        fast = measure(variants["prebuilt"], iterations)
+        print(f"{name:>7}  {base:>9.1f} µs  {fast:>9.1f} µs  {(1 - fast / base) * 100:>7.1f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    main(parser.parse_args().iterations)
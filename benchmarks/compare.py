@@ -0,0 +1,66 @@
+# benchmarks/compare.py
+"""
+Compare two benchmark result files (see benchmarks/suite.py) and flag regressions.
+
+A case regresses when its median latency grows by more than --threshold
+(fraction, default 0.10 = 10%) over the baseline. Exits 1 if any case regressed.
+
+Usage:
+    python -m benchmarks.compare benchmarks/baseline.json benchmarks/results.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Any
+
+METRIC = "median_ms"
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float
+) -> list[tuple[str, float, float, float, bool]]:
+    """Rows of (case, baseline_ms, current_ms, relative change, regressed) for shared cases."""
+    rows = []
+    base_results = baseline["results"]
+    for case, stats in sorted(current["results"].items()):
+        if case not in base_results:
+            continue
+        before = base_results[case][METRIC]
+        after = stats[METRIC]
+        change = (after - before) / before if before else 0.0
+        rows.append((case, before, after, change, change > threshold))
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Flag benchmark regressions")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+    with open(args.current) as fh:
+        current = json.load(fh)
+
+    rows = compare(baseline, current, args.threshold)
+    print(f"{'case':<40} {'baseline':>10} {'current':>10} {'change':>8}")
+    for case, before, after, change, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{case:<40} {before:>8.3f}ms {after:>8.3f}ms {change:>+7.1%}{flag}")
+
+    regressions = [row for row in rows if row[4]]
+    if regressions:
+        print(
+            f"\n{len(regressions)} case(s) slower than baseline by more than {args.threshold:.0%}"
+        )
+        return 1
+    print("\nno regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
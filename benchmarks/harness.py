@@ -0,0 +1,33 @@
+# benchmarks/harness.py
+"""Timing helpers shared by the benchmark suite."""
+from __future__ import annotations
+
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+
+async def timeit(
+    fn: Callable[[], Awaitable[Any]],
+    *,
+    iterations: int = 200,
+    warmup: int = 20,
+) -> dict[str, float]:
+    """Run `fn` repeatedly and summarize wall-clock latency in milliseconds."""
+    for _ in range(warmup):
+        await fn()
+    samples: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "mean_ms": statistics.fmean(samples),
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "min_ms": samples[0],
+        "ops_per_s": 1000 / statistics.fmean(samples),
+    }
@@ -0,0 +1,225 @@
+# benchmarks/suite.py
+"""
+Microbenchmarks for EntryService and the journal router against a real Postgres.
+
+The suite creates the schema in BENCH_DATABASE_URL (default: a `journal_bench`
+database next to the app's DATABASE_URL), then for each table size truncates
+`entry`, seeds it with generate_series and times:
+
+  service.create_entry      service.get_entry_by_id     service.get_all_entries
+  service.list_page         service.search              http.get_entry
+  http.list_page
+
+get_all_entries is only timed up to --full-scan-max rows. The HTTP cases go
+through the ASGI app with httpx.AsyncClient, so they include routing,
+validation and serialization. The entry cache is bypassed so every call
+reaches Postgres.
+
+Never point this at a database you care about: it TRUNCATEs `entry`.
+
+Usage:
+    python -m benchmarks.suite --sizes 1000,10000,100000 --out benchmarks/results.json
+    python -m benchmarks.compare benchmarks/baseline.json benchmarks/results.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+from datetime import UTC, datetime
+from typing import Any
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.partitions import DEFAULT_PARTITION, manage_partitions
+from app.main import app
+from app.routers.journal_router import get_entry_service, get_read_entry_service
+from app.schemas.entry import EntryCreate
+from app.services.entry_service import EntryService
+from benchmarks.harness import timeit
+
+SEED_SQL = text(
+    """
+    INSERT INTO entry (id, work, struggle, intention, created_at, updated_at)
+    SELECT gen_random_uuid(),
+           'worked on topic ' || g || ' ' || md5(g::text),
+           'struggled with ' || md5((g * 7)::text),
+           'tomorrow: practice ' || (g % 97),
+           now() - make_interval(secs => g),
+           now() - make_interval(secs => g)
+    FROM generate_series(1, :n) AS g
+    """
+)
+
+
+def bench_database_url() -> str:
+    env = os.getenv("BENCH_DATABASE_URL")
+    if env:
+        return env.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return (
+        make_url(settings.database_url)
+        .set(database="journal_bench")
+        .render_as_string(hide_password=False)
+    )
+
+
+async def ensure_database(url: str) -> None:
+    """CREATE DATABASE for `url` if it does not exist yet (via the `postgres` DB)."""
+    target = make_url(url)
+    admin = create_async_engine(target.set(database="postgres"), isolation_level="AUTOCOMMIT")
+    try:
+        async with admin.connect() as conn:
+            exists = await conn.scalar(
+                text("SELECT 1 FROM pg_database WHERE datname = :name"),
+                {"name": target.database},
+            )
+            if not exists:
+                await conn.execute(text(f'CREATE DATABASE "{target.database}"'))
+    finally:
+        await admin.dispose()
+
+
+async def prepare_schema(engine: Any) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.run_sync(Base.metadata.create_all)
+        # entry is partitioned by month; seeded rows from earlier months land here
+        await conn.execute(
+            text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF entry DEFAULT")
+        )
+    await manage_partitions(engine, ahead=1)
+
+
+async def seed(engine: Any, size: int) -> list[str]:
+    """Reset `entry` to `size` rows; returns a sample of ids to look up."""
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE entry"))
+        await conn.execute(SEED_SQL, {"n": size})
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE entry"))
+        rows = await conn.execute(text("SELECT id FROM entry ORDER BY random() LIMIT 500"))
+        ids = [str(row[0]) for row in rows]
+    return ids or [""]
+
+
+async def run_size(
+    sessions: async_sessionmaker[AsyncSession],
+    ids: list[str],
+    size: int,
+    *,
+    iterations: int,
+    full_scan_max: int,
+) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = {}
+    pick = random.Random(size).choice
+
+    async def with_service(call: Any) -> Any:
+        async with sessions() as session:
+            return await call(EntryService(session))
+
+    payload = EntryCreate(work="bench work", struggle="bench struggle", intention="bench")
+    results["service.create_entry"] = await timeit(
+        lambda: with_service(lambda s: s.create_entry(payload)), iterations=iterations
+    )
+    results["service.get_entry_by_id"] = await timeit(
+        lambda: with_service(lambda s: s.get_entry_by_id(pick(ids))), iterations=iterations
+    )
+    if size <= full_scan_max:
+        results["service.get_all_entries"] = await timeit(
+            lambda: with_service(lambda s: s.get_all_entries()),
+            iterations=max(5, iterations // 20),
+            warmup=2,
+        )
+    results["service.list_page"] = await timeit(
+        lambda: with_service(lambda s: s.list_entries(limit=50)), iterations=iterations
+    )
+    results["service.search"] = await timeit(
+        lambda: with_service(lambda s: s.list_entries(limit=50, q="practice 42")),
+        iterations=iterations,
+    )
+
+    async def service_without_cache() -> Any:
+        async with sessions() as session:
+            yield EntryService(session)
+
+    app.dependency_overrides[get_entry_service] = service_without_cache
+    app.dependency_overrides[get_read_entry_service] = service_without_cache
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as ac:
+            results["http.get_entry"] = await timeit(
+                lambda: ac.get(f"/entries/{pick(ids)}"), iterations=iterations
+            )
+            results["http.list_page"] = await timeit(
+                lambda: ac.get("/entries/", params={"limit": 50}), iterations=iterations
+            )
+    finally:
+        app.dependency_overrides.clear()
+    return results
+
+
+async def main(args: argparse.Namespace) -> None:
+    url = bench_database_url()
+    await ensure_database(url)
+    engine = create_async_engine(url, pool_size=5)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    await prepare_schema(engine)
+
+    report: dict[str, Any] = {
+        "meta": {
+            "created_at": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "database": make_url(url).render_as_string(hide_password=True),
+            "iterations": args.iterations,
+        },
+        "results": {},
+    }
+    try:
+        for size in args.sizes:
+            print(f"seeding {size} rows ...", flush=True)
+            ids = await seed(engine, size)
+            results = await run_size(
+                sessions, ids, size, iterations=args.iterations, full_scan_max=args.full_scan_max
+            )
+            for name, stats in results.items():
+                key = f"{name}@{size}"
+                report["results"][key] = stats
+                print(
+                    f"  {key:<36} median {stats['median_ms']:8.3f} ms"
+                    f"  p95 {stats['p95_ms']:8.3f} ms",
+                    flush=True,
+                )
+    finally:
+        await engine.dispose()
+
+    with open(args.out, "w") as fh:
+        json.dump(report, fh, indent=2, sort_keys=True)
+    print(f"wrote {args.out}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EntryService / router microbenchmarks")
+    parser.add_argument(
+        "--sizes",
+        type=lambda v: [int(x) for x in v.split(",")],
+        default=[1_000, 10_000, 100_000],
+        help="comma-separated table sizes to seed (default: 1000,10000,100000)",
+    )
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument(
+        "--full-scan-max",
+        type=int,
+        default=10_000,
+        help="largest table size at which get_all_entries is timed",
+    )
+    parser.add_argument("--out", default="benchmarks/results.json")
+    asyncio.run(main(parser.parse_args()))
@@ -76,8 +76,8 @@ export default function () {
     const listRes = http.get(`${BASE_URL}/entries/`);
     check(listRes, {
       'list: 200': (r) => record(r, [200]),
-      'list: array': (r) => Array.isArray(r.json()),
-      'list: contains our id': (r) => (r.json() || []).some((e) => e.id === createdId),
+      'list: array': (r) => Array.isArray(r.json('items')),
+      'list: contains our id': (r) => (r.json('items') || []).some((e) => e.id === createdId),
     });
 
     // DELETE
@@ -94,7 +94,7 @@ export default function () {
 
     // Optional cleanup of any stale k6 entries from earlier failed runs
     if (CLEAN_OLD) {
-      const all = listRes.status === 200 ? (listRes.json() || []) : [];
+      const all = listRes.status === 200 ? (listRes.json('items') || []) : [];
       for (const e of all) {
         if (typeof e?.work === 'string' && e.work.startsWith('k6 ')) {
           const r = http.del(`${BASE_URL}/entries/${e.id}`);
@@ -0,0 +1,163 @@
+import http from 'k6/http';
+import { check } from 'k6';
+import { Rate } from 'k6/metrics';
+
+// Capacity test: three open-model workloads driven by arrival rate (req/s),
+// so latency growth shows up as latency instead of as fewer requests.
+//   reads       — GET /entries/{id} + list pages (the bulk of real traffic)
+//   search      — /entries/search with a few query shapes
+//   write_burst — create/update/delete spike in the middle of the run
+//
+// Knobs (env): BASE_URL, RATE_SCALE (multiplies every rate, default 1),
+//              STAGE (duration of each ramp stage, default 30s), SEED (rows to seed, default 200)
+// Run via scripts/smart_k6.sh to get summary JSON + baseline diff.
+
+const BASE_URL = __ENV.BASE_URL || 'http://localhost:8000';
+const ALLOW_PROD = (__ENV.ALLOW_PROD || 'false').toLowerCase() === 'true';
+if (BASE_URL.includes('onrender.com') && !ALLOW_PROD) {
+  throw new Error(
+    `Refusing to run against production (${BASE_URL}). ` +
+    `Set ALLOW_PROD=true if you really intend to run on prod.`
+  );
+}
+
+const SCALE = Number(__ENV.RATE_SCALE || 1);
+const STAGE = __ENV.STAGE || '30s';
+const SEED = Number(__ENV.SEED || 200);
+const rate = (n) => Math.max(1, Math.round(n * SCALE));
+
+const jsonHeaders = { headers: { 'Content-Type': 'application/json' } };
+
+export const options = {
+  scenarios: {
+    reads: {
+      executor: 'ramping-arrival-rate',
+      exec: 'reads',
+      startRate: rate(10),
+      timeUnit: '1s',
+      preAllocatedVUs: 20,
+      maxVUs: 200,
+      stages: [
+        { target: rate(50), duration: STAGE },
+        { target: rate(100), duration: STAGE },
+        { target: rate(100), duration: STAGE },
+        { target: 0, duration: STAGE },
+      ],
+    },
+    search: {
+      executor: 'ramping-arrival-rate',
+      exec: 'search',
+      startRate: rate(2),
+      timeUnit: '1s',
+      preAllocatedVUs: 10,
+      maxVUs: 100,
+      stages: [
+        { target: rate(10), duration: STAGE },
+        { target: rate(20), duration: STAGE },
+        { target: rate(20), duration: STAGE },
+        { target: 0, duration: STAGE },
+      ],
+    },
+    write_burst: {
+      executor: 'ramping-arrival-rate',
+      exec: 'writeBurst',
+      startTime: STAGE, // burst while reads are ramping up
+      startRate: 0,
+      timeUnit: '1s',
+      preAllocatedVUs: 10,
+      maxVUs: 100,
+      stages: [
+        { target: rate(30), duration: '10s' },
+        { target: rate(30), duration: STAGE },
+        { target: 0, duration: '10s' },
+      ],
+    },
+  },
+  summaryTrendStats: ['avg', 'min', 'med', 'max', 'p(90)', 'p(95)', 'p(99)'],
+  thresholds: {
+    unexpected_error_rate: ['rate<0.01'],
+    // Thresholds on every tagged endpoint also make k6 export those sub-metrics
+    'http_req_duration{endpoint:get}': ['p(95)<150', 'p(99)<400'],
+    'http_req_duration{endpoint:list}': ['p(95)<250', 'p(99)<600'],
+    'http_req_duration{endpoint:search}': ['p(95)<400', 'p(99)<1000'],
+    'http_req_duration{endpoint:create}': ['p(95)<300', 'p(99)<800'],
+    'http_req_duration{endpoint:update}': ['p(95)<300', 'p(99)<800'],
+    'http_req_duration{endpoint:delete}': ['p(95)<300', 'p(99)<800'],
+    dropped_iterations: ['count<50'], // arrival rate the SUT could not absorb
+  },
+};
+
+const unexpected_error_rate = new Rate('unexpected_error_rate');
+function record(res, okStatuses) {
+  const ok = okStatuses.includes(res.status);
+  unexpected_error_rate.add(ok ? 0 : 1);
+  return ok;
+}
+
+function tagged(endpoint, name) {
+  return { tags: { endpoint, name: name || endpoint } };
+}
+
+const pick = (arr) => arr[Math.floor(Math.random() * arr.length)];
+
+export function setup() {
+  const items = [];
+  for (let i = 0; i < SEED; i++) {
+    items.push({ work: `k6 load seed ${i} fastapi`, struggle: 'load testing', intention: `practice ${i % 17}` });
+  }
+  const ids = [];
+  for (let i = 0; i < items.length; i += 500) {
+    const res = http.post(`${BASE_URL}/entries/bulk`, JSON.stringify(items.slice(i, i + 500)), jsonHeaders);
+    if (res.status !== 201) throw new Error(`seed failed: ${res.status} ${res.body}`);
+    for (const e of res.json('created')) ids.push(e.id);
+  }
+  return { ids };
+}
+
+export function reads(data) {
+  if (Math.random() < 0.8) {
+    const res = http.get(`${BASE_URL}/entries/${pick(data.ids)}`, tagged('get', 'GET /entries/{id}'));
+    check(res, { 'get: 200': (r) => record(r, [200]) });
+  } else {
+    const res = http.get(`${BASE_URL}/entries/?limit=50`, tagged('list', 'GET /entries/'));
+    check(res, { 'list: 200': (r) => record(r, [200]) });
+  }
+}
+
+const QUERIES = [
+  'q=fastapi',
+  'q=practice%203',
+  'q=load%20testing&sort=relevance',
+  'q=seed&sort=old&limit=20',
+];
+
+export function search() {
+  const res = http.get(`${BASE_URL}/entries/search?${pick(QUERIES)}`, tagged('search', 'GET /entries/search'));
+  check(res, { 'search: 200': (r) => record(r, [200]) });
+}
+
+export function writeBurst() {
+  const created = http.post(
+    `${BASE_URL}/entries/`,
+    JSON.stringify({ work: `k6 load write ${__VU}-${__ITER}`, struggle: 'burst', intention: 'clean up' }),
+    Object.assign({}, jsonHeaders, tagged('create', 'POST /entries/'))
+  );
+  if (!check(created, { 'create: 201': (r) => record(r, [201]) })) return;
+  const id = created.json('id');
+
+  const updated = http.put(
+    `${BASE_URL}/entries/${id}`,
+    JSON.stringify({ work: `k6 load updated ${__VU}-${__ITER}` }),
+    Object.assign({}, jsonHeaders, tagged('update', 'PUT /entries/{id}'))
+  );
+  check(updated, { 'update: 200': (r) => record(r, [200]) });
+
+  const deleted = http.del(`${BASE_URL}/entries/${id}`, null, tagged('delete', 'DELETE /entries/{id}'));
+  check(deleted, { 'delete: 204': (r) => record(r, [204]) });
+}
+
+export function teardown(data) {
+  for (const id of data.ids) {
+    http.del(`${BASE_URL}/entries/${id}`, null, { tags: { endpoint: 'teardown' } });
+  }
+}
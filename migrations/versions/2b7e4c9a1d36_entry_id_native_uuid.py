@@ -0,0 +1,41 @@
+"""Store entry.id as a native uuid
+
+Revision ID: 2b7e4c9a1d36
+Revises: 8f3b2d6c1a57
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b7e4c9a1d36'
+down_revision: Union[str, Sequence[str], None] = '8f3b2d6c1a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 16 bytes instead of a 36-character string, in the heap and in every index
+    # holding id. Existing ids were always str(uuid4()), so they convert as they
+    # are and URLs stay valid; new ids are UUIDv7 (app.core.ids), generated by
+    # the app. Rewrites entry and its indexes under an ACCESS EXCLUSIVE lock.
+    op.alter_column(
+        'entry', 'id',
+        existing_type=sa.String(), type_=postgresql.UUID(as_uuid=True),
+        postgresql_using='id::uuid', existing_nullable=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        'entry', 'id',
+        existing_type=postgresql.UUID(as_uuid=True), type_=sa.String(),
+        postgresql_using='id::text', existing_nullable=False,
+    )
@@ -0,0 +1,96 @@
+"""Add entry_daily_stats rollup maintained by triggers on entry
+
+Revision ID: 5c1e7a9d2f40
+Revises: bc26969c6362
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e7a9d2f40'
+down_revision: Union[str, Sequence[str], None] = 'bc26969c6362'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match app.models.entry_stats.STATS_SLOTS
+STATS_SLOTS = 16
+
+# Adds (sign = 1) or removes (sign = -1) a set of entry rows from the rollup:
+# one upsert per UTC day, on this backend's slot
+APPLY_ROWS = """
+    INSERT INTO entry_daily_stats AS s
+        (day, slot, entries, work_chars, struggle_chars, intention_chars)
+    SELECT (created_at AT TIME ZONE 'UTC')::date, pg_backend_pid() % {slots},
+           {sign} * count(*), {sign} * sum(length(work)),
+           {sign} * sum(length(struggle)), {sign} * sum(length(intention))
+    FROM {rows}
+    GROUP BY 1
+    ON CONFLICT (day, slot) DO UPDATE SET
+        entries = s.entries + EXCLUDED.entries,
+        work_chars = s.work_chars + EXCLUDED.work_chars,
+        struggle_chars = s.struggle_chars + EXCLUDED.struggle_chars,
+        intention_chars = s.intention_chars + EXCLUDED.intention_chars;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('entry_daily_stats',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('slot', sa.SmallInteger(), nullable=False),
+    sa.Column('entries', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+    sa.Column('work_chars', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+    sa.Column('struggle_chars', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+    sa.Column('intention_chars', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'slot')
+    )
+
+    # Statement-level triggers see all rows a statement touched (transition
+    # tables), so a bulk insert costs one upsert per day, not one per row.
+    # A trigger with transition tables can only fire on one event, hence three.
+    op.execute(f"""
+        CREATE FUNCTION entry_daily_stats_apply() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                {APPLY_ROWS.format(slots=STATS_SLOTS, sign=-1, rows='old_rows')}
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                {APPLY_ROWS.format(slots=STATS_SLOTS, sign=1, rows='new_rows')}
+            END IF;
+            RETURN NULL;
+        END $$
+    """)
+    op.execute("""
+        CREATE TRIGGER entry_daily_stats_insert AFTER INSERT ON entry
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION entry_daily_stats_apply()
+    """)
+    op.execute("""
+        CREATE TRIGGER entry_daily_stats_update AFTER UPDATE ON entry
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION entry_daily_stats_apply()
+    """)
+    op.execute("""
+        CREATE TRIGGER entry_daily_stats_delete AFTER DELETE ON entry
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION entry_daily_stats_apply()
+    """)
+
+    # Backfill once. Writes wait for the migration to commit, so no row is
+    # counted twice or missed between the backfill and the triggers.
+    op.execute('LOCK TABLE entry IN SHARE MODE')
+    op.execute(APPLY_ROWS.format(slots=STATS_SLOTS, sign=1, rows='entry'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for event in ('insert', 'update', 'delete'):
+        op.execute(f'DROP TRIGGER IF EXISTS entry_daily_stats_{event} ON entry')
+    op.execute('DROP FUNCTION IF EXISTS entry_daily_stats_apply()')
+    op.drop_table('entry_daily_stats')
@@ -0,0 +1,117 @@
+"""Partition entry by month on created_at
+
+Revision ID: 8f3b2d6c1a57
+Revises: 5c1e7a9d2f40
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from datetime import UTC, date, datetime
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3b2d6c1a57'
+down_revision: Union[str, Sequence[str], None] = '5c1e7a9d2f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months created past the current one; app.db.partitions keeps it topped up
+PARTITIONS_AHEAD = 3
+COLUMNS = 'id, work, struggle, intention, created_at, updated_at'
+TRGM_COLUMNS = ('work', 'struggle', 'intention')
+STATS_TRIGGERS = {
+    'insert': 'REFERENCING NEW TABLE AS new_rows',
+    'update': 'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows',
+    'delete': 'REFERENCING OLD TABLE AS old_rows',
+}
+
+
+def _create_entry(primary_key, **kw) -> None:
+    op.create_table('entry',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('work', sa.String(length=256), nullable=False),
+    sa.Column('struggle', sa.String(length=256), nullable=False),
+    sa.Column('intention', sa.String(length=256), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed("to_tsvector('english'::regconfig, work || ' ' || struggle || ' ' || intention)", persisted=True), nullable=True),
+    sa.PrimaryKeyConstraint(*primary_key),
+    **kw
+    )
+
+
+def _finish_entry(old: str) -> None:
+    """Copy the rows over from `old`, drop it, then index and hook up the new entry."""
+    op.execute(f'INSERT INTO entry ({COLUMNS}) SELECT {COLUMNS} FROM {old}')
+    # Takes the old triggers and indexes with it, freeing their names
+    op.drop_table(old)
+
+    op.create_index('ix_entry_created_at_id', 'entry', ['created_at', 'id'])
+    op.create_index('ix_entry_updated_at', 'entry', ['updated_at'])
+    op.create_index('ix_entry_search_vector', 'entry', ['search_vector'], postgresql_using='gin')
+    for col in TRGM_COLUMNS:
+        op.create_index(
+            f'ix_entry_{col}_trgm', 'entry', [col],
+            postgresql_using='gin', postgresql_ops={col: 'gin_trgm_ops'},
+        )
+    # The copy above ran before these exist, so the rollup is not counted twice
+    for event, referencing in STATS_TRIGGERS.items():
+        op.execute(f"""
+            CREATE TRIGGER entry_daily_stats_{event} AFTER {event.upper()} ON entry
+            {referencing}
+            FOR EACH STATEMENT EXECUTE FUNCTION entry_daily_stats_apply()
+        """)
+
+
+def _set_aside_entry(old: str) -> None:
+    # Writes wait until the migration commits; the copy makes this real downtime
+    # proportional to the table size, so run it in a maintenance window.
+    op.execute('LOCK TABLE entry IN ACCESS EXCLUSIVE MODE')
+    op.rename_table('entry', old)
+    op.execute(f'ALTER INDEX entry_pkey RENAME TO {old}_pkey')
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _set_aside_entry('entry_unpartitioned')
+    # The partition key must be part of every unique constraint, so the
+    # primary key becomes (id, created_at); ids stay unique on their own.
+    _create_entry(('id', 'created_at'), postgresql_partition_by='RANGE (created_at)')
+
+    # One partition per UTC month from the oldest row up to PARTITIONS_AHEAD
+    # months from now; anything outside that range goes to entry_default.
+    current = datetime.now(UTC).date().replace(day=1)
+    first = current
+    if not context.is_offline_mode():
+        # No data to read when generating SQL (--sql): partitions start at the
+        # current month, and rows from earlier months are kept in entry_default.
+        first = op.get_bind().execute(sa.text(
+            "SELECT date_trunc('month', min(created_at) AT TIME ZONE 'UTC')::date FROM entry_unpartitioned"
+        )).scalar() or current
+    month = min(first, current)
+    while month <= _add_months(current, PARTITIONS_AHEAD):
+        op.execute(
+            f"CREATE TABLE entry_{month:%Y_%m} PARTITION OF entry FOR VALUES "
+            f"FROM ('{month} 00:00:00+00') TO ('{_add_months(month, 1)} 00:00:00+00')"
+        )
+        month = _add_months(month, 1)
+    op.execute('CREATE TABLE entry_default PARTITION OF entry DEFAULT')
+
+    _finish_entry('entry_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Partitions detached by app.db.partitions are not copied back
+    _set_aside_entry('entry_partitioned')
+    _create_entry(('id',))
+    _finish_entry('entry_partitioned')
@@ -0,0 +1,50 @@
+"""Add entry ordering indexes (created_at, id) and updated_at
+
+Revision ID: bc26969c6362
+Revises: bdd0d362a25c
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bc26969c6362'
+down_revision: Union[str, Sequence[str], None] = 'bdd0d362a25c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction, so step out of
+    # Alembic's migration transaction. IF NOT EXISTS makes a retry safe after an
+    # interrupted build (drop any INVALID leftover index first in that case).
+    with op.get_context().autocommit_block():
+        # Serves ORDER BY created_at [DESC], id and the keyset seek
+        # (created_at, id) < (:ts, :id). Its leading column also covers plain
+        # created_at lookups, so no separate created_at index is needed.
+        op.create_index(
+            'ix_entry_created_at_id', 'entry', ['created_at', 'id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_entry_updated_at', 'entry', ['updated_at'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_entry_updated_at', table_name='entry',
+            postgresql_concurrently=True, if_exists=True,
+        )
+        op.drop_index(
+            'ix_entry_created_at_id', table_name='entry',
+            postgresql_concurrently=True, if_exists=True,
+        )
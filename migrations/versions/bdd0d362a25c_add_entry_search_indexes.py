@@ -0,0 +1,71 @@
+"""Add entry full-text and trigram search indexes
+
+Adding the STORED generated `search_vector` column rewrites the whole entry
+table (and its indexes) under an ACCESS EXCLUSIVE lock: reads and writes wait
+for a time proportional to the table size, so run it in a maintenance window.
+The GIN indexes are then built CONCURRENTLY, outside that transaction, so the
+(slower) index builds do not hold the table lock.
+
+Revision ID: bdd0d362a25c
+Revises: 73f82b54943b
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bdd0d362a25c'
+down_revision: Union[str, Sequence[str], None] = '73f82b54943b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRGM_COLUMNS = ('work', 'struggle', 'intention')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Generated tsvector kept in sync by Postgres; GIN index backs `@@` matches
+    op.add_column('entry', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('english'::regconfig, work || ' ' || struggle || ' ' || intention)", persisted=True),
+        nullable=True,
+    ))
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # Commits the rewrite above, then builds each index without blocking writes.
+    # IF NOT EXISTS makes a retry safe after an interrupted build (drop any
+    # INVALID leftover index first in that case).
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_entry_search_vector', 'entry', ['search_vector'],
+            postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True,
+        )
+        # Trigram indexes let `ILIKE '%q%'` use an index instead of a sequential scan
+        for col in TRGM_COLUMNS:
+            op.create_index(
+                f'ix_entry_{col}_trgm', 'entry', [col],
+                postgresql_using='gin', postgresql_ops={col: 'gin_trgm_ops'},
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for col in TRGM_COLUMNS:
+            op.drop_index(
+                f'ix_entry_{col}_trgm', table_name='entry',
+                postgresql_concurrently=True, if_exists=True,
+            )
+        op.drop_index(
+            'ix_entry_search_vector', table_name='entry',
+            postgresql_concurrently=True, if_exists=True,
+        )
+    op.drop_column('entry', 'search_vector')
+    # pg_trgm is left installed; other objects in the database may depend on it
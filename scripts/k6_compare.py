@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Diff a k6 --summary-export JSON against a stored baseline.
+
+Compares, for every `http_req_duration{endpoint:...}` sub-metric present in
+both files, p(95) and p(99) latency; exits 1 when one grows by more than
+--threshold (fraction, default 0.15).
+
+The load mix is open-model (arrival-rate executors), so throughput is set by
+the configured rate and says nothing by itself. Saturation shows up instead as
+`dropped_iterations`: the share of scheduled iterations k6 could not start
+because every VU was busy. That regresses when it rises by more than
+--dropped-tolerance (absolute, default 0.01 = 1 percentage point).
+Throughput (`http_reqs` rate) is only compared with --closed-model, for runs
+using VU-based executors.
+
+Usage:
+    scripts/k6_compare.py k6/baselines/load_mix.json k6/results/load_mix.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Any
+
+LATENCY_STATS = ("p(95)", "p(99)")
+
+
+def load_metrics(path: str) -> dict[str, Any]:
+    with open(path) as fh:
+        metrics: dict[str, Any] = json.load(fh)["metrics"]
+    return metrics
+
+
+def dropped_share(metrics: dict[str, Any]) -> float:
+    """Fraction of scheduled iterations k6 dropped (0 when it dropped none)."""
+    dropped = metrics.get("dropped_iterations", {}).get("count", 0)
+    started = metrics.get("iterations", {}).get("count", 0)
+    scheduled = dropped + started
+    return dropped / scheduled if scheduled else 0.0
+
+
+def diff(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float,
+    dropped_tolerance: float = 0.01,
+    closed_model: bool = False,
+) -> list[tuple[str, float, float, float, bool]]:
+    """Rows of (label, baseline, current, change, regressed); change is relative except for
+    the dropped share, where it is the difference in share."""
+    rows = []
+    for name in sorted(current):
+        if not name.startswith("http_req_duration{endpoint:") or name not in baseline:
+            continue
+        for stat in LATENCY_STATS:
+            before, after = baseline[name].get(stat), current[name].get(stat)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before if before else 0.0
+            rows.append((f"{name} {stat} (ms)", before, after, change, change > threshold))
+
+    before, after = dropped_share(baseline), dropped_share(current)
+    rows.append(
+        (
+            "dropped_iterations (share of scheduled)",
+            before,
+            after,
+            after - before,
+            after - before > dropped_tolerance,
+        )
+    )
+
+    if closed_model and "http_reqs" in baseline and "http_reqs" in current:
+        before, after = baseline["http_reqs"]["rate"], current["http_reqs"]["rate"]
+        change = (after - before) / before if before else 0.0
+        rows.append(("http_reqs rate (req/s)", before, after, change, change < -threshold))
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Diff k6 summary against a baseline")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.15)
+    parser.add_argument("--dropped-tolerance", type=float, default=0.01)
+    parser.add_argument(
+        "--closed-model",
+        action="store_true",
+        help="also compare throughput (only meaningful for VU-based executors)",
+    )
+    args = parser.parse_args(argv)
+
+    rows = diff(
+        load_metrics(args.baseline),
+        load_metrics(args.current),
+        args.threshold,
+        dropped_tolerance=args.dropped_tolerance,
+        closed_model=args.closed_model,
+    )
+    print(f"{'metric':<56} {'baseline':>10} {'current':>10} {'change':>8}")
+    for label, before, after, change, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{label:<56} {before:>10.4g} {after:>10.4g} {change:>+7.1%}{flag}")
+
+    regressions = sum(1 for row in rows if row[4])
+    if regressions:
+        print(f"\n{regressions} metric(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    print("\nno regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
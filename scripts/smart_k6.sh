@@ -6,6 +6,16 @@ HOST="${HOST:-0.0.0.0}"
 APP_MODULE="${APP_MODULE:-app.main:app}"
 BASE_URL_DEFAULT="http://localhost:${PORT}"
 
+# Which k6 script to run, where to write its summary, and what to diff it against.
+#   K6_SCRIPT=k6/load_mix.js scripts/smart_k6.sh          # run + diff vs baseline
+#   K6_SCRIPT=k6/load_mix.js UPDATE_BASELINE=1 scripts/smart_k6.sh   # record baseline
+K6_SCRIPT="${K6_SCRIPT:-k6/entries_crud.js}"
+K6_NAME="$(basename "${K6_SCRIPT}" .js)"
+SUMMARY_OUT="${SUMMARY_OUT:-k6/results/${K6_NAME}.json}"
+BASELINE="${BASELINE:-k6/baselines/${K6_NAME}.json}"
+COMPARE_THRESHOLD="${COMPARE_THRESHOLD:-0.15}"
+UPDATE_BASELINE="${UPDATE_BASELINE:-0}"
+
 # Default & sanitize BASE_URL
 BASE_URL="${BASE_URL:-$BASE_URL_DEFAULT}"
 if [[ -z "${BASE_URL}" || "${BASE_URL}" == "-e" ]]; then
@@ -35,5 +45,24 @@ else
   wait_health || { echo "❌ Existing server on :${PORT} failed health check at ${BASE_URL}/healthz"; exit 1; }
 fi
 
-echo "🚦 Running k6 (BASE_URL=${BASE_URL}) ..."
-BASE_URL="${BASE_URL}" k6 run k6/entries_crud.js
+mkdir -p "$(dirname "${SUMMARY_OUT}")"
+echo "🚦 Running k6 ${K6_SCRIPT} (BASE_URL=${BASE_URL}) ..."
+# Keep going on threshold failures so the baseline diff still prints; exit with k6's status at the end.
+K6_STATUS=0
+BASE_URL="${BASE_URL}" k6 run --summary-export "${SUMMARY_OUT}" "${K6_SCRIPT}" || K6_STATUS=$?
+echo "📝 Summary written to ${SUMMARY_OUT}"
+
+if [[ "${UPDATE_BASELINE}" == "1" ]]; then
+  mkdir -p "$(dirname "${BASELINE}")"
+  cp "${SUMMARY_OUT}" "${BASELINE}"
+  echo "📌 Baseline updated: ${BASELINE}"
+elif [[ -f "${BASELINE}" ]]; then
+  echo "📊 Comparing against ${BASELINE} (threshold ${COMPARE_THRESHOLD}) ..."
+  if ! python3 scripts/k6_compare.py "${BASELINE}" "${SUMMARY_OUT}" --threshold "${COMPARE_THRESHOLD}"; then
+    [[ ${K6_STATUS} -eq 0 ]] && K6_STATUS=1
+  fi
+else
+  echo "ℹ️  No baseline at ${BASELINE}; run with UPDATE_BASELINE=1 to record one."
+fi
+
+exit "${K6_STATUS}"
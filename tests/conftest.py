@@ -1,7 +1,13 @@
 # tests/conftest.py
 
+import os
+
 import pytest
 
+# Tests run on several event loops; a pooled engine would hand a connection
+# opened on one loop to another. Must be set before app.core.config is imported.
+os.environ.setdefault("DB_POOL", "null")
+
 
 @pytest.fixture(scope="session")
 def anyio_backend():
@@ -0,0 +1,213 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY, CollectorRegistry
+
+from app.core.admission import (
+    AdaptiveLimiter,
+    AdmissionController,
+    AdmissionMiddleware,
+    Overloaded,
+    register_admission_metrics,
+)
+
+
+async def until(predicate) -> None:
+    while not predicate():
+        await asyncio.sleep(0)
+
+
+@pytest.mark.anyio
+async def test_limiter_queues_past_the_limit_and_hands_slots_over_in_order():
+    limiter = AdaptiveLimiter(initial_limit=1, queue_size=2, max_wait=5)
+    await limiter.acquire()
+    order: list[int] = []
+
+    async def waiter(n: int) -> None:
+        await limiter.acquire()
+        order.append(n)
+
+    tasks = [asyncio.create_task(waiter(n)) for n in (1, 2)]
+    await until(lambda: limiter.queued == 2)
+    assert limiter.in_flight == 1
+
+    limiter.release()
+    await tasks[0]
+    assert order == [1] and limiter.in_flight == 1 and limiter.queued == 1
+    limiter.release()
+    await tasks[1]
+    assert order == [1, 2]
+    limiter.release()
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.anyio
+async def test_limiter_sheds_when_queue_is_full():
+    limiter = AdaptiveLimiter(initial_limit=1, queue_size=0)
+    await limiter.acquire()
+    with pytest.raises(Overloaded) as exc:
+        await limiter.acquire()
+    assert exc.value.reason == "queue_full"
+    assert limiter.rejected["queue_full"] == 1
+    assert limiter.in_flight == 1
+
+
+@pytest.mark.anyio
+async def test_limiter_sheds_when_estimated_wait_exceeds_deadline():
+    limiter = AdaptiveLimiter(initial_limit=2, queue_size=10, max_wait=1.0)
+    await limiter.acquire()
+    await limiter.acquire()
+    limiter.service_time = 1.5  # two slots, each free again in ~1.5 s
+    with pytest.raises(Overloaded) as exc:
+        await limiter.acquire()
+    assert exc.value.reason == "deadline"
+    assert exc.value.retry_after >= 1.5
+    assert limiter.queued == 0
+
+
+@pytest.mark.anyio
+async def test_limiter_gives_up_after_max_wait():
+    limiter = AdaptiveLimiter(initial_limit=1, queue_size=1, max_wait=0.01)
+    await limiter.acquire()
+    with pytest.raises(Overloaded) as exc:
+        await limiter.acquire()
+    assert exc.value.reason == "deadline"
+    assert limiter.queued == 0
+    limiter.release()
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.anyio
+async def test_limiter_cancelled_waiter_leaves_the_queue():
+    limiter = AdaptiveLimiter(initial_limit=1, queue_size=1, max_wait=5)
+    await limiter.acquire()
+    task = asyncio.create_task(limiter.acquire())
+    await until(lambda: limiter.queued == 1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert limiter.queued == 0
+    limiter.release()
+    assert limiter.in_flight == 0
+
+
+def busy(limiter: AdaptiveLimiter) -> AdaptiveLimiter:
+    limiter.in_flight = limiter.capacity
+    return limiter
+
+
+def test_limit_shrinks_when_db_latency_rises():
+    limiter = busy(AdaptiveLimiter(initial_limit=40))
+    for _ in range(20):
+        limiter._adapt(0.002)
+    steady = limiter.limit
+    assert steady > 40  # healthy and saturated: probes upwards
+
+    for _ in range(20):
+        limiter._adapt(0.05)
+    assert limiter.limit < steady / 2
+    assert limiter.short_latency is not None and limiter.long_latency is not None
+    assert limiter.short_latency > limiter.long_latency
+
+
+def test_limit_does_not_grow_while_mostly_idle():
+    limiter = AdaptiveLimiter(initial_limit=40)
+    limiter.in_flight = 5
+    for _ in range(20):
+        limiter._adapt(0.002)
+    assert limiter.limit == 40
+
+
+def test_limit_stays_within_bounds():
+    limiter = busy(AdaptiveLimiter(initial_limit=10, min_limit=8, max_limit=12))
+    for _ in range(50):
+        limiter._adapt(0.001)
+    assert limiter.limit == 12
+    for _ in range(15):
+        limiter._adapt(1.0)
+    assert limiter.limit == 8
+
+
+def make_app(
+    controller: AdmissionController, status_code: int = 503
+) -> tuple[FastAPI, asyncio.Event]:
+    app = FastAPI()
+    gate = asyncio.Event()
+
+    @app.get("/slow/{item_id}")
+    async def slow(item_id: int) -> dict[str, int]:
+        await gate.wait()
+        return {"id": item_id}
+
+    @app.get("/healthz")
+    async def healthz() -> dict[str, str]:
+        await gate.wait()
+        return {"status": "ok"}
+
+    app.add_middleware(
+        AdmissionMiddleware, controller=controller, router=app.router, status_code=status_code
+    )
+    return app, gate
+
+
+def single_slot() -> AdmissionController:
+    return AdmissionController(lambda: AdaptiveLimiter(initial_limit=1, queue_size=0))
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("status_code", [503, 429])
+async def test_middleware_sheds_per_route_with_retry_after(status_code):
+    controller = single_slot()
+    app, gate = make_app(controller, status_code)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        first = asyncio.create_task(ac.get("/slow/1"))
+        await until(lambda: "GET /slow/{item_id}" in controller.limiters)
+        limiter = controller.limiters["GET /slow/{item_id}"]
+        await until(lambda: limiter.in_flight == 1)
+
+        # Another path on the same route shares the limit
+        shed = await ac.get("/slow/2")
+        assert shed.status_code == status_code
+        assert int(shed.headers["retry-after"]) >= 1
+        assert shed.json() == {"detail": "Server is busy, retry later"}
+
+        gate.set()
+        assert (await first).status_code == 200
+    assert limiter.in_flight == 0
+    assert limiter.rejected["queue_full"] == 1
+    assert limiter.service_time is not None
+
+
+@pytest.mark.anyio
+async def test_middleware_skips_exempt_and_unmatched_paths():
+    controller = single_slot()
+    app, gate = make_app(controller)
+    gate.set()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        assert (await ac.get("/healthz")).status_code == 200
+        assert (await ac.get("/missing")).status_code == 404
+    assert controller.limiters == {}
+
+
+def test_register_admission_metrics(monkeypatch):
+    registry = CollectorRegistry()
+    monkeypatch.setattr(REGISTRY, "register", registry.register)
+    controller = AdmissionController(lambda: AdaptiveLimiter(initial_limit=7))
+    limiter = controller.limiter("GET /entries")
+    limiter.in_flight = 2
+    limiter.rejected["deadline"] = 3
+    limiter._adapt(0.004)
+
+    register_admission_metrics(controller)
+    labels = {"route": "GET /entries"}
+    assert registry.get_sample_value("admission_limit", labels) == 7
+    assert registry.get_sample_value("admission_in_flight", labels) == 2
+    assert registry.get_sample_value("admission_queued", labels) == 0
+    assert (
+        registry.get_sample_value("admission_rejected_total", {**labels, "reason": "deadline"}) == 3
+    )
+    assert registry.get_sample_value(
+        "admission_db_latency_seconds", {**labels, "window": "short"}
+    ) == pytest.approx(0.004)
@@ -0,0 +1,26 @@
+import json
+
+from benchmarks.compare import compare, main
+
+
+def report(**medians):
+    return {"results": {case: {"median_ms": ms} for case, ms in medians.items()}}
+
+
+def test_compare_flags_only_regressions_over_threshold():
+    rows = compare(
+        report(**{"a@1": 10.0, "b@1": 10.0, "gone@1": 1.0}),
+        report(**{"a@1": 10.5, "b@1": 12.0, "new@1": 5.0}),
+        threshold=0.10,
+    )
+    assert [(case, regressed) for case, *_, regressed in rows] == [("a@1", False), ("b@1", True)]
+
+
+def test_main_exit_code(tmp_path):
+    base, cur = tmp_path / "base.json", tmp_path / "cur.json"
+    base.write_text(json.dumps(report(**{"a@1": 10.0})))
+    cur.write_text(json.dumps(report(**{"a@1": 9.0})))
+    assert main([str(base), str(cur)]) == 0
+
+    cur.write_text(json.dumps(report(**{"a@1": 20.0})))
+    assert main([str(base), str(cur), "--threshold", "0.5"]) == 1
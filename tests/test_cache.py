@@ -0,0 +1,231 @@
+from contextlib import asynccontextmanager
+
+import pytest
+from prometheus_client import REGISTRY, CollectorRegistry
+
+from app.schemas.entry import EntryOut
+from app.services.cache import CountCache, LRUCache, RedisCache, register_cache_metrics
+
+
+def make_entry(entry_id="123e4567-e89b-12d3-a456-426614174000", **kwargs):
+    base = dict(
+        id=entry_id,
+        work="w",
+        struggle="s",
+        intention="i",
+        created_at="2025-06-18T12:00:00Z",
+        updated_at="2025-06-18T12:00:00Z",
+    )
+    base.update(kwargs)
+    return EntryOut(**base)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """In-memory stand-in for redis.asyncio.Redis (get/mget/set/delete/pipeline only)."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.round_trips = 0
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def mget(self, keys):
+        self.round_trips += 1
+        return [self.data.get(key) for key in keys]
+
+    @asynccontextmanager
+    async def pipeline(self, transaction=True):
+        queued = []
+
+        class Pipeline:
+            def set(self, key, value, px=None, nx=False):
+                queued.append((key, value, px, nx))
+
+            async def execute(pipe):
+                self.round_trips += 1
+                for key, value, px, nx in queued:
+                    await self.set(key, value, px=px, nx=nx)
+
+        yield Pipeline()
+
+    async def set(self, key, value, px=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        self.ttls[key] = px
+        return True
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+class BrokenRedis:
+    async def get(self, key):
+        raise ConnectionError("down")
+
+    async def set(self, key, value, px=None, nx=False):
+        raise ConnectionError("down")
+
+    async def delete(self, key):
+        raise ConnectionError("down")
+
+
+@pytest.mark.anyio
+async def test_lru_hit_and_miss():
+    cache = LRUCache(max_entries=2, ttl=10)
+    entry = make_entry()
+    assert await cache.get("a") is None
+    await cache.set("a", entry)
+    assert await cache.get("a") == entry
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.evictions) == (1, 1, 0)
+
+
+@pytest.mark.anyio
+async def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2, ttl=10)
+    await cache.set("a", make_entry())
+    await cache.set("b", make_entry())
+    await cache.get("a")  # "b" is now the oldest
+    await cache.set("c", make_entry())
+    assert len(cache) == 2
+    assert await cache.get("b") is None
+    assert await cache.get("a") is not None
+    assert cache.stats.evictions == 1
+
+
+@pytest.mark.anyio
+async def test_lru_ttl_expiry():
+    clock = FakeClock()
+    cache = LRUCache(ttl=5, clock=clock)
+    await cache.set("a", make_entry())
+    clock.now = 4.9
+    assert await cache.get("a") is not None
+    clock.now = 5.0
+    assert await cache.get("a") is None
+    assert cache.stats.evictions == 1
+    assert len(cache) == 0
+
+
+@pytest.mark.anyio
+async def test_lru_delete():
+    cache = LRUCache()
+    await cache.set("a", make_entry())
+    await cache.delete("a")
+    await cache.delete("missing")
+    assert await cache.get("a") is None
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("backend", ["lru", "redis"])
+async def test_invalidation_keeps_out_a_fill_that_raced_the_write(backend):
+    clock = FakeClock()
+    client = FakeRedis()
+    cache = LRUCache(ttl=5, clock=clock) if backend == "lru" else RedisCache(client, ttl=5)
+    old = make_entry()
+    await cache.set("a", old)
+    # A read loaded `old` before the write committed and fills after its invalidation
+    await cache.delete("a")
+    await cache.set("a", old)
+    await cache.set_many({"a": old})
+    assert await cache.get("a") is None
+    assert await cache.get_many(["a"]) == [None]
+
+    if backend == "lru":
+        clock.now = 5.0  # the marker lasts one TTL
+        await cache.set("a", old)
+        assert await cache.get("a") == old
+        assert cache.stats.evictions == 0
+    else:
+        assert client.ttls["entry:a"] == 5000
+
+
+@pytest.mark.anyio
+async def test_redis_cache_roundtrip():
+    client = FakeRedis()
+    cache = RedisCache(client, ttl=2.5)
+    entry = make_entry()
+    await cache.set(entry_key := str(entry.id), entry)
+    assert client.ttls["entry:" + entry_key] == 2500
+    assert await cache.get(entry_key) == entry
+    await cache.delete(entry_key)
+    assert await cache.get(entry_key) is None
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+@pytest.mark.anyio
+async def test_redis_cache_errors_are_misses():
+    cache = RedisCache(BrokenRedis())
+    await cache.set("a", make_entry())
+    await cache.set_many({"b": make_entry()})
+    await cache.delete("a")
+    assert await cache.get("a") is None
+    assert await cache.get_many(["a", "b"]) == [None, None]
+    assert cache.stats.misses == 3
+
+
+@pytest.mark.anyio
+async def test_redis_cache_unreadable_values_are_dropped_misses():
+    # e.g. written by a deploy with a different EntryOut
+    client = FakeRedis()
+    cache = RedisCache(client)
+    entry = make_entry()
+    client.data.update({"entry:a": b'{"id": 1}', "entry:b": entry.model_dump_json()})
+    assert await cache.get_many(["a", "b"]) == [None, entry]
+    assert "entry:a" not in client.data
+    client.data["entry:a"] = b"not json"
+    assert await cache.get("a") is None
+    assert "entry:a" not in client.data
+    await cache.set("a", entry)
+    assert await cache.get("a") == entry
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("backend", ["lru", "redis"])
+async def test_get_many_and_set_many(backend):
+    client = FakeRedis()
+    cache = LRUCache() if backend == "lru" else RedisCache(client)
+    a, b = make_entry(), make_entry("223e4567-e89b-12d3-a456-426614174001")
+    await cache.set_many({"a": a, "b": b})
+    assert await cache.get_many(["b", "missing", "a"]) == [b, None, a]
+    assert (cache.stats.hits, cache.stats.misses) == (2, 1)
+    if backend == "redis":
+        assert client.round_trips == 2  # one pipeline, one MGET
+
+
+@pytest.mark.anyio
+async def test_register_cache_metrics(monkeypatch):
+    registry = CollectorRegistry()
+    monkeypatch.setattr(REGISTRY, "register", registry.register)
+    cache = LRUCache(max_entries=1)
+    await cache.set("a", make_entry())
+    await cache.set("b", make_entry())
+    await cache.get("b")
+    await cache.get("a")
+
+    register_cache_metrics(cache)
+    assert registry.get_sample_value("entry_cache_hits_total") == 1
+    assert registry.get_sample_value("entry_cache_misses_total") == 1
+    assert registry.get_sample_value("entry_cache_evictions_total") == 1
+
+
+def test_count_cache_ttl_and_bound():
+    clock = FakeClock()
+    cache = CountCache(ttl=5, max_entries=2, clock=clock)
+    cache.set("", 10)
+    cache.set("q1", 3)
+    cache.set("q2", 1)  # drops the oldest key
+    assert cache.get("") is None
+    assert cache.get("q1") == 3
+    clock.now = 5.0
+    assert cache.get("q1") is None
@@ -0,0 +1,128 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import Request
+
+from app.core.config import Settings
+from app.db import routing
+from app.db.session import create_engine
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_request(headers: dict[str, str] | None = None) -> Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "headers": raw})
+
+
+def session_factory(name: str, connect_error: Exception | None = None) -> MagicMock:
+    def make() -> AsyncMock:
+        session = AsyncMock(name=name)
+        session.info = {}
+        if connect_error is not None:
+            session.connection.side_effect = connect_error
+        factory.created.append(session)
+        return session
+
+    factory = MagicMock(side_effect=make)
+    factory.created = []
+    return factory
+
+
+async def read_session(request: Request):
+    gen = routing.get_read_session(request)
+    session = await gen.__anext__()
+    with pytest.raises(StopAsyncIteration):
+        await gen.__anext__()
+    return session
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def sessions(monkeypatch, clock):
+    primary, replica = session_factory("primary"), session_factory("replica")
+    monkeypatch.setattr(routing, "get_session_factory", lambda: primary)
+    monkeypatch.setattr(routing, "get_replica_session_factory", lambda: replica)
+    health = routing.ReplicaHealth(30, clock=clock)
+    monkeypatch.setattr(routing, "get_replica_health", lambda: health)
+    return primary, replica
+
+
+def test_replica_url_is_optional_and_normalized():
+    assert Settings(DATABASE_REPLICA_URL=None).replica_database_url is None
+    cfg = Settings(DATABASE_REPLICA_URL="postgresql://u:p@replica:5432/journal")
+    assert cfg.replica_database_url == "postgresql+asyncpg://u:p@replica:5432/journal"
+    engine = create_engine(cfg, cfg.replica_database_url, connect_timeout=2)
+    assert engine.url.host == "replica"
+
+
+def test_wants_primary_header_or_cookie():
+    assert not routing.wants_primary(make_request())
+    assert routing.wants_primary(make_request({"X-Read-Your-Writes": "1"}))
+    assert not routing.wants_primary(make_request({"X-Read-Your-Writes": "0"}))
+    assert routing.wants_primary(make_request({"Cookie": f"{routing.READ_PRIMARY_COOKIE}=1"}))
+
+
+def test_replica_health_retries_after_window(clock):
+    health = routing.ReplicaHealth(30, clock=clock)
+    assert health.available()
+    health.mark_down()
+    clock.now += 29
+    assert not health.available()
+    clock.now += 1
+    assert health.available()
+
+
+@pytest.mark.anyio
+async def test_reads_use_replica_and_close_it(sessions):
+    primary, replica = sessions
+    session = await read_session(make_request())
+    assert session is replica.created[0]
+    assert routing.from_replica(session)
+    session.close.assert_awaited_once()
+    assert primary.created == []
+
+
+@pytest.mark.anyio
+async def test_read_your_writes_goes_to_primary(sessions):
+    primary, replica = sessions
+    session = await read_session(make_request({"X-Read-Your-Writes": "true"}))
+    assert session is primary.created[0]
+    assert not routing.from_replica(session)
+    assert replica.created == []
+
+
+@pytest.mark.anyio
+async def test_no_replica_configured_uses_primary(sessions, monkeypatch):
+    primary, _ = sessions
+    monkeypatch.setattr(routing, "get_replica_session_factory", lambda: None)
+    assert await read_session(make_request()) is primary.created[0]
+
+
+@pytest.mark.anyio
+async def test_replica_down_falls_back_then_retries(monkeypatch, sessions, clock, caplog):
+    primary, _ = sessions
+    broken = session_factory("replica", connect_error=ConnectionRefusedError("down"))
+    monkeypatch.setattr(routing, "get_replica_session_factory", lambda: broken)
+
+    assert await read_session(make_request()) is primary.created[0]
+    broken.created[0].close.assert_awaited_once()
+    assert "Read replica unavailable" in caplog.text
+
+    # Within the retry window the replica is not even tried
+    assert await read_session(make_request()) is primary.created[1]
+    assert len(broken.created) == 1
+
+    clock.now += 30
+    await read_session(make_request())
+    assert len(broken.created) == 2
@@ -0,0 +1,115 @@
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy.pool import NullPool
+from sqlalchemy.util import greenlet_spawn
+
+from app.core.config import Settings
+from app.db import instrumentation, metrics, session
+from app.db.instrumentation import prepared_statement_counts
+from app.db.session import TimedQueuePool, create_engine
+
+
+def test_null_pool_mode():
+    engine = create_engine(Settings(db_pool="null"))
+    assert isinstance(engine.sync_engine.pool, NullPool)
+
+
+def test_queue_pool_uses_settings():
+    cfg = Settings(
+        db_pool="queue",
+        db_pool_size=3,
+        db_max_overflow=2,
+        db_pool_timeout=1.5,
+        db_pool_recycle=60,
+    )
+    pool = create_engine(cfg).sync_engine.pool
+    assert isinstance(pool, TimedQueuePool)
+    assert pool.size() == 3
+    assert pool._max_overflow == 2
+    assert pool._timeout == 1.5
+    assert pool._recycle == 60
+    assert pool._pre_ping is True
+
+
+def test_register_pool_metrics_exposes_gauges(monkeypatch):
+    monkeypatch.setattr(metrics, "_pool_wait", None)
+    engine = create_engine(Settings(db_pool="queue", db_pool_size=4))
+    for name in ("db_pool_size", "db_pool_checked_out", "db_pool_overflow"):
+        if name in REGISTRY._names_to_collectors:
+            REGISTRY.unregister(REGISTRY._names_to_collectors[name])
+    for name in ("db_pool_wait_seconds", "db_pool_connect_seconds"):
+        if name in REGISTRY._names_to_collectors:
+            REGISTRY.unregister(REGISTRY._names_to_collectors[name])
+
+    metrics.register_pool_metrics(engine)
+    metrics.observe_pool_wait(0.002)
+    metrics.observe_pool_connect(0.02)
+
+    assert REGISTRY.get_sample_value("db_pool_size") == 4
+    assert REGISTRY.get_sample_value("db_pool_checked_out") == 0
+    assert REGISTRY.get_sample_value("db_pool_overflow") == 0
+    assert REGISTRY.get_sample_value("db_pool_wait_seconds_count") >= 1
+    assert REGISTRY.get_sample_value("db_pool_connect_seconds_count") >= 1
+
+
+@pytest.mark.anyio
+async def test_pool_wait_excludes_opening_connections(monkeypatch):
+    waits: list[float] = []
+    connects: list[float] = []
+    monkeypatch.setattr(metrics, "observe_pool_wait", waits.append)
+    monkeypatch.setattr(metrics, "observe_pool_connect", connects.append)
+
+    def slow_connect() -> MagicMock:
+        time.sleep(0.05)
+        return MagicMock()
+
+    def checkout_twice() -> None:
+        pool = TimedQueuePool(slow_connect, pool_size=1, max_overflow=0)
+        for _ in range(2):  # the first opens the connection, the second reuses it
+            pool.connect().close()
+
+    await greenlet_spawn(checkout_twice)
+    assert len(waits) == 2 and max(waits) < 0.05
+    assert len(connects) == 1 and connects[0] >= 0.05
+
+
+def test_statement_cache_size_reaches_asyncpg(monkeypatch):
+    captured = {}
+
+    def fake_create_async_engine(url, **kwargs):
+        captured.update(kwargs)
+        return real_create_async_engine(url, **kwargs)
+
+    real_create_async_engine = session.create_async_engine
+    monkeypatch.setattr(session, "create_async_engine", fake_create_async_engine)
+    create_engine(Settings(db_pool="null", db_statement_cache_size=64), connect_timeout=2.0)
+    assert captured["connect_args"] == {"prepared_statement_cache_size": 64, "timeout": 2.0}
+
+
+class FakePoolEntry:
+    def __init__(self, statement_cache):
+        self.dbapi_connection = SimpleNamespace(_prepared_statement_cache=statement_cache)
+
+
+def test_statement_cache_metrics_report_tracked_connections():
+    engine = create_engine(Settings(db_pool="queue"))
+    entries = [FakePoolEntry(cache) for cache in ({"a": 1, "b": 2}, {"a": 1}, None)]
+    # What the engine's "connect" listener records for each new connection
+    instrumentation._connections[engine.sync_engine].update(entries)
+    assert sorted(prepared_statement_counts(engine)) == [1, 2]
+
+    existing = REGISTRY._names_to_collectors.get("db_statement_cache_capacity")
+    if existing is not None:
+        REGISTRY.unregister(existing)
+    metrics.register_statement_cache_metrics(engine, 128)
+    try:
+        assert REGISTRY.get_sample_value("db_statement_cache_capacity") == 128
+        assert REGISTRY.get_sample_value("db_statement_cache_statements") == 3
+        assert REGISTRY.get_sample_value("db_statement_cache_fullest") == 2
+    finally:
+        # Leave the name free for the app's own registration at startup
+        REGISTRY.unregister(REGISTRY._names_to_collectors["db_statement_cache_capacity"])
@@ -1,13 +1,15 @@
 from datetime import UTC, datetime
 from unittest.mock import AsyncMock, MagicMock
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 import pytest
 from sqlalchemy.exc import SQLAlchemyError  # NEW: for DB error cases
 
 from app.models.entry import Entry as EntryModel
-from app.schemas.entry import EntryCreate, EntryOut, EntryUpdate
+from app.schemas.entry import EntryCreate, EntryOut, EntryPage, EntryUpdate
+from app.services.cache import CountCache, LRUCache
 from app.services.entry_service import EntryService
+from app.services.pagination import decode_cursor, decode_offset_cursor, encode_cursor
 
 
 # -- Helper for all tests: always provide valid UTC datetimes
@@ -59,49 +61,79 @@ async def test_create_entry(service, fake_db):
     )
     now = datetime.now(UTC)
 
-    # Patch refresh to set created_at/updated_at after "DB commit"
-    async def fake_refresh(entry):
-        entry.created_at = now
-        entry.updated_at = now
-
-    fake_db.refresh.side_effect = fake_refresh
+    # INSERT ... RETURNING hands back the row with server defaults filled in
+    result_mock = MagicMock()
+    result_mock.one.return_value = fake_entry_model(
+        **create_schema.model_dump(), created_at=now, updated_at=now
+    )
+    fake_db.execute.return_value = result_mock
 
     result = await service.create_entry(create_schema)
     assert isinstance(result, EntryOut)
     assert result.work == create_schema.work
     assert result.created_at == now
     assert result.updated_at == now
+    assert fake_db.execute.await_count == 1
+    assert fake_db.execute.call_args.args[1]["id"].version == 7  # time-ordered key
+    fake_db.commit.assert_awaited_once()
+    fake_db.refresh.assert_not_called()
 
 
 @pytest.mark.anyio
 async def test_update_entry_found(service, fake_db):
-    entry = fake_entry_model()
     updated = fake_entry_model(work="Updated work")
+    # UPDATE ... RETURNING yields the row as it is after the update
     result_mock = MagicMock()
-    result_mock.scalar_one_or_none.return_value = entry
+    result_mock.one_or_none.return_value = updated
     fake_db.execute.return_value = result_mock
     fake_db.commit.return_value = None
-    fake_db.refresh.return_value = None
-
-    # Patch get_entry_by_id to simulate the updated entry after refresh
-    service.get_entry_by_id = AsyncMock(return_value=EntryOut.model_validate(updated))
 
     update_schema = EntryUpdate(work="Updated work")
-    result = await service.update_entry(entry.id, update_schema)
+    result = await service.update_entry(updated.id, update_schema)
     assert isinstance(result, EntryOut)
     assert result.work == "Updated work"
+    assert fake_db.execute.await_count == 1
+    fake_db.refresh.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_update_entry_binds_only_changed_fields(service, fake_db):
+    result_mock = MagicMock()
+    result_mock.one_or_none.return_value = fake_entry_model(work="w2", intention="i2")
+    fake_db.execute.return_value = result_mock
+
+    first, second = uuid4(), uuid4()
+    await service.update_entry(str(first), EntryUpdate(intention="i2", work="w2"))
+    stmt, params = fake_db.execute.call_args.args
+    assert params == {"entry_id": first, "v_intention": "i2", "v_work": "w2"}
+    assert "SET work=%(v_work)s, intention=%(v_intention)s" in _compiled_sql(fake_db)
+
+    await service.update_entry(second, EntryUpdate(work="w3", intention="i3"))
+    assert fake_db.execute.call_args.args[0] is stmt  # same field set, same statement
+
+
+@pytest.mark.anyio
+async def test_update_entry_without_fields_reads_current_row(service, fake_db):
+    current = EntryOut.model_validate(fake_entry_model())
+    service.get_entry_by_id = AsyncMock(return_value=current)
+
+    result = await service.update_entry(str(current.id), EntryUpdate())
+    assert result == current
+    fake_db.execute.assert_not_called()
+    fake_db.commit.assert_not_called()
 
 
 @pytest.mark.anyio
 async def test_update_entry_not_found(service, fake_db):
     # Simulate no entry found
     result_mock = MagicMock()
-    result_mock.scalar_one_or_none.return_value = None
+    result_mock.one_or_none.return_value = None
     fake_db.execute.return_value = result_mock
 
     update_schema = EntryUpdate(work="Will not be found")
     result = await service.update_entry("non-existent-id", update_schema)
     assert result is None
+    fake_db.commit.assert_not_called()
 
 
 @pytest.mark.anyio
@@ -124,6 +156,15 @@ async def test_delete_entry_not_found(service, fake_db):
 
     result = await service.delete_entry("non-existent-id")
     assert result is False
+    fake_db.commit.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_malformed_id_matches_nothing_without_a_query(service, fake_db):
+    assert await service.get_entry_by_id("not-a-uuid") is None
+    assert await service.update_entry("not-a-uuid", EntryUpdate(work="w")) is None
+    assert await service.delete_entry("not-a-uuid") is False
+    fake_db.execute.assert_not_called()
 
 
 @pytest.mark.anyio
@@ -160,6 +201,7 @@ async def test_get_all_entries_empty_list(service, fake_db):
 async def test_create_entry_db_error_propagates(service, fake_db):
     """If the DB commit raises, the exception should surface (or adjust if caught)."""
     create_schema = EntryCreate(work="x", struggle="y", intention="z")
+    fake_db.execute.return_value = MagicMock()
     fake_db.commit.side_effect = SQLAlchemyError("boom")
 
     with pytest.raises(SQLAlchemyError):
@@ -179,7 +221,7 @@ async def test_update_entry_db_error_propagates(service, fake_db):
         updated_at=now,
     )
     result_mock = MagicMock()
-    result_mock.scalar_one_or_none.return_value = existing
+    result_mock.one_or_none.return_value = existing
     fake_db.execute.return_value = result_mock
 
     fake_db.commit.side_effect = SQLAlchemyError("fail")
@@ -187,3 +229,350 @@ async def test_update_entry_db_error_propagates(service, fake_db):
 
     with pytest.raises(SQLAlchemyError):
         await service.update_entry(existing.id, update_schema)
+
+
+# ---------------------------
+# Keyset pagination
+# ---------------------------
+
+
+@pytest.mark.anyio
+async def test_list_entries_returns_next_cursor_when_more_rows(service, fake_db):
+    """limit+1 rows back from the DB means there is another page."""
+    entries = [fake_entry_model(id=str(uuid4())) for _ in range(3)]
+    result_mock = MagicMock()
+    result_mock.scalars.return_value.all.return_value = entries
+    fake_db.execute.return_value = result_mock
+
+    page = await service.list_entries(limit=2)
+    assert isinstance(page, EntryPage)
+    assert len(page.items) == 2
+    assert page.next_cursor is not None
+    assert decode_cursor(page.next_cursor) == (entries[1].created_at, str(entries[1].id))
+
+
+@pytest.mark.anyio
+async def test_list_entries_last_page_has_no_cursor(service, fake_db):
+    result_mock = MagicMock()
+    result_mock.scalars.return_value.all.return_value = [fake_entry_model()]
+    fake_db.execute.return_value = result_mock
+
+    page = await service.list_entries(
+        limit=2, cursor=encode_cursor(datetime.now(UTC), str(uuid4()))
+    )
+    assert len(page.items) == 1
+    assert page.next_cursor is None
+
+
+@pytest.mark.anyio
+async def test_list_entries_invalid_cursor_raises(service, fake_db):
+    with pytest.raises(ValueError):
+        await service.list_entries(cursor="not-a-cursor")
+    with pytest.raises(ValueError):
+        await service.list_entries(cursor=encode_cursor(datetime.now(UTC), "not-a-uuid"))
+    fake_db.execute.assert_not_called()
+
+
+def test_cursor_roundtrip():
+    now = datetime.now(UTC)
+    assert decode_cursor(encode_cursor(now, "abc|def")) == (now, "abc|def")
+
+
+@pytest.mark.anyio
+async def test_iter_entries_yields_chunks(service, fake_db):
+    batches = [[fake_entry_model(), fake_entry_model(id=str(uuid4()))], [fake_entry_model()]]
+
+    async def partitions():
+        for batch in batches:
+            yield batch
+
+    stream_result = MagicMock()
+    stream_result.scalars.return_value.partitions = partitions
+    fake_db.stream.return_value = stream_result
+
+    chunks = [chunk async for chunk in service.iter_entries(chunk_size=2)]
+    assert [len(c) for c in chunks] == [2, 1]
+    assert all(isinstance(item, EntryOut) for chunk in chunks for item in chunk)
+    stmt = fake_db.stream.call_args.args[0]
+    assert stmt.get_execution_options()["yield_per"] == 2
+
+
+@pytest.mark.anyio
+async def test_create_entries_chunks_and_commits_once(service, fake_db, monkeypatch):
+    monkeypatch.setattr("app.services.entry_service.BULK_CHUNK_SIZE", 2)
+    entries_in = [EntryCreate(work=f"w{i}", struggle="s", intention="i") for i in range(3)]
+
+    async def fake_execute(stmt, params):
+        result = MagicMock()
+        result.all.return_value = [fake_entry_model(**p) for p in params]
+        return result
+
+    fake_db.execute.side_effect = fake_execute
+
+    result = await service.create_entries(entries_in)
+    assert [e.work for e in result] == ["w0", "w1", "w2"]
+    assert fake_db.execute.await_count == 2
+    fake_db.commit.assert_awaited_once()
+
+
+def _compiled_sql(fake_db) -> str:
+    from sqlalchemy.dialects import postgresql
+
+    stmt = fake_db.execute.call_args.args[0]
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.anyio
+async def test_search_uses_fulltext_and_trigram_filters(service, fake_db):
+    result_mock = MagicMock()
+    result_mock.scalars.return_value.all.return_value = []
+    fake_db.execute.return_value = result_mock
+
+    await service.list_entries(q="joins", sort="new")
+    sql = _compiled_sql(fake_db)
+    assert "entry.search_vector @@ websearch_to_tsquery" in sql
+    assert "entry.work ILIKE" in sql
+    assert "ORDER BY entry.created_at DESC, entry.id DESC" in sql
+
+
+@pytest.mark.anyio
+async def test_search_relevance_ranks_and_pages_by_offset(service, fake_db):
+    entries = [fake_entry_model(id=str(uuid4())) for _ in range(3)]
+    result_mock = MagicMock()
+    result_mock.scalars.return_value.all.return_value = entries
+    fake_db.execute.return_value = result_mock
+
+    page = await service.list_entries(limit=2, q="joins", sort="relevance")
+    assert "ORDER BY ts_rank_cd(entry.search_vector" in _compiled_sql(fake_db)
+    assert len(page.items) == 2
+    assert decode_offset_cursor(page.next_cursor) == 2
+
+    await service.list_entries(limit=2, q="joins", sort="relevance", cursor=page.next_cursor)
+    assert fake_db.execute.call_args.args[1]["offset"] == 2
+
+    with pytest.raises(ValueError):
+        await service.list_entries(
+            q="joins", sort="relevance", cursor=encode_cursor(datetime.now(UTC), "x")
+        )
+
+
+# ---------------------------
+# Read-through cache
+# ---------------------------
+
+
+@pytest.fixture
+def cached_service(fake_db):
+    return EntryService(db=fake_db, cache=LRUCache())
+
+
+@pytest.mark.anyio
+async def test_get_entry_by_id_served_from_cache(cached_service, fake_db):
+    entry = fake_entry_model()
+    result_mock = MagicMock()
+    result_mock.scalar_one_or_none.return_value = entry
+    fake_db.execute.return_value = result_mock
+
+    first = await cached_service.get_entry_by_id(entry.id)
+    second = await cached_service.get_entry_by_id(entry.id)
+    assert first == second
+    assert fake_db.execute.await_count == 1
+
+
+@pytest.mark.anyio
+async def test_update_and_delete_invalidate_cache(cached_service, fake_db):
+    entry = fake_entry_model()
+    await cached_service.cache.set(entry.id, EntryOut.model_validate(entry))
+
+    result_mock = MagicMock()
+    result_mock.one_or_none.return_value = fake_entry_model(work="changed")
+    fake_db.execute.return_value = result_mock
+    await cached_service.update_entry(entry.id, EntryUpdate(work="changed"))
+    assert await cached_service.cache.get(entry.id) is None
+
+    await cached_service.cache.set(entry.id, EntryOut.model_validate(entry))
+    await cached_service.delete_entry(entry.id)
+    assert await cached_service.cache.get(entry.id) is None
+
+
+@pytest.mark.anyio
+async def test_hot_statements_are_prebuilt_and_reused(service, fake_db):
+    """Values travel as parameters, so repeated calls execute the very same statement."""
+    result_mock = MagicMock()
+    result_mock.scalar_one_or_none.return_value = None
+    result_mock.scalars.return_value.all.return_value = []
+    fake_db.execute.return_value = result_mock
+
+    executed = []
+    ids = [uuid4(), uuid4()]
+    for entry_id in ids:
+        await service.get_entry_by_id(str(entry_id))
+        executed.append(fake_db.execute.call_args.args)
+    assert executed[0][0] is executed[1][0]
+    assert [params for _, params in executed] == [{"entry_id": entry_id} for entry_id in ids]
+
+    for q in ("joins", "sql"):
+        await service.list_entries(limit=5, q=q)
+        executed.append(fake_db.execute.call_args.args)
+    assert executed[2][0] is executed[3][0]
+    assert executed[3][1] == {"limit": 6, "q": "sql", "pattern": "%sql%"}
+
+    last_id = uuid4()
+    cursor = encode_cursor(datetime.now(UTC), str(last_id))
+    await service.list_entries(limit=5, cursor=cursor, sort="old")
+    assert fake_db.execute.call_args.args[1] == {
+        "limit": 6,
+        "after_ts": decode_cursor(cursor)[0],
+        "after_id": last_id,
+    }
+    sql = _compiled_sql(fake_db)
+    assert "WHERE (entry.created_at, entry.id) >" in sql
+    # Redundant plain bound so the planner can prune partitions before the cursor
+    assert "AND entry.created_at >= %(after_ts)s" in sql
+
+
+@pytest.mark.anyio
+async def test_count_entries_exact_is_cached_per_query(fake_db):
+    service = EntryService(db=fake_db, counts=CountCache(ttl=10))
+    result_mock = MagicMock()
+    result_mock.scalar_one.return_value = 42
+    fake_db.execute.return_value = result_mock
+
+    assert await service.count_entries() == (42, "exact")
+    assert await service.count_entries() == (42, "exact")
+    assert fake_db.execute.await_count == 1
+    assert "SELECT count(*)" in _compiled_sql(fake_db)
+
+    assert await service.count_entries(q="joins") == (42, "exact")
+    assert fake_db.execute.await_count == 2
+    assert fake_db.execute.call_args.args[1] == {"q": "joins", "pattern": "%joins%"}
+    assert "websearch_to_tsquery" in _compiled_sql(fake_db)
+
+
+@pytest.mark.anyio
+async def test_count_entries_estimated_reads_reltuples(service, fake_db):
+    result_mock = MagicMock()
+    result_mock.scalar_one_or_none.return_value = 1234
+    fake_db.execute.return_value = result_mock
+
+    assert await service.count_entries(mode="estimated") == (1234, "estimated")
+    sql = _compiled_sql(fake_db)
+    assert "sum(pg_class.reltuples)" in sql
+    assert "FROM pg_inherits" in sql
+
+
+@pytest.mark.anyio
+async def test_count_entries_estimated_falls_back_before_analyze(service, fake_db):
+    never_analyzed, count = MagicMock(), MagicMock()
+    never_analyzed.scalar_one_or_none.return_value = None  # no table with reltuples >= 0
+    count.scalar_one.return_value = 7
+    fake_db.execute.side_effect = [never_analyzed, count]
+
+    assert await service.count_entries(mode="estimated") == (7, "exact")
+
+
+@pytest.mark.anyio
+async def test_count_entries_estimated_search_uses_explain(service, fake_db):
+    from sqlalchemy.dialects.postgresql.asyncpg import dialect
+
+    conn = AsyncMock()
+    conn.dialect = dialect()
+    conn.exec_driver_sql.return_value.scalar_one = MagicMock(
+        return_value='[{"Plan": {"Node Type": "Bitmap Heap Scan", "Plan Rows": 87}}]'
+    )
+    fake_db.connection.return_value = conn
+
+    assert await service.count_entries(q="joins", mode="estimated") == (87, "estimated")
+    sql, params = conn.exec_driver_sql.call_args.args
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT entry.id")
+    assert params == ("english", "joins", "%joins%")
+    fake_db.execute.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_list_entries_created_range_is_half_open(service, fake_db):
+    result_mock = MagicMock()
+    result_mock.scalars.return_value.all.return_value = []
+    fake_db.execute.return_value = result_mock
+    after = datetime(2025, 6, 1, tzinfo=UTC)
+    before = datetime(2025, 7, 1, tzinfo=UTC)
+
+    await service.list_entries(q="joins", created_after=after, created_before=before)
+    sql = _compiled_sql(fake_db)
+    assert "entry.created_at >= %(created_after)s" in sql
+    assert "entry.created_at < %(created_before)s" in sql
+    params = fake_db.execute.call_args.args[1]
+    assert params["created_after"] == after
+    assert params["created_before"] == before
+
+    await service.list_entries(created_before=before)
+    assert "created_after" not in _compiled_sql(fake_db)
+
+
+@pytest.mark.anyio
+async def test_count_entries_estimated_with_time_range_explains(service, fake_db):
+    from sqlalchemy.dialects.postgresql.asyncpg import dialect
+
+    conn = AsyncMock()
+    conn.dialect = dialect()
+    conn.exec_driver_sql.return_value.scalar_one = MagicMock(
+        return_value=[{"Plan": {"Plan Rows": 5}}]
+    )
+    fake_db.connection.return_value = conn
+    after = datetime(2025, 6, 1, tzinfo=UTC)
+
+    assert await service.count_entries(created_after=after, mode="estimated") == (5, "estimated")
+    sql, params = conn.exec_driver_sql.call_args.args
+    assert "WHERE entry.created_at >= $1" in sql
+    assert params == (after,)
+
+
+@pytest.mark.anyio
+async def test_entry_stats_averages_rollup_sums(service, fake_db):
+    row = MagicMock(
+        start=datetime(2025, 6, 16).date(),
+        entries=4,
+        work_chars=50,
+        struggle_chars=80,
+        intention_chars=33,
+    )
+    fake_db.execute.return_value = [row]
+
+    stats = await service.entry_stats(bucket="week", created_before=datetime(2025, 7, 1).date())
+    assert stats.bucket == "week"
+    assert stats.buckets[0].entries == 4
+    assert stats.buckets[0].avg_work_length == 12.5
+    assert stats.buckets[0].avg_intention_length == 8.25
+    sql = _compiled_sql(fake_db)
+    assert "FROM entry_daily_stats" in sql
+    assert "date_trunc('week'" in sql
+    assert "entry_daily_stats.day < %(before_day)s" in sql
+    assert "FROM entry " not in sql  # never touches the entry table
+    assert fake_db.execute.call_args.args[1] == {"before_day": datetime(2025, 7, 1).date()}
+
+
+@pytest.mark.anyio
+async def test_get_entries_by_ids_keeps_order_and_reports_missing(cached_service, fake_db):
+    cached, stored = fake_entry_model(id=str(uuid4())), fake_entry_model(id=str(uuid4()))
+    await cached_service.cache.set(cached.id, EntryOut.model_validate(cached))
+    result_mock = MagicMock()
+    result_mock.scalars.return_value = [stored]
+    fake_db.execute.return_value = result_mock
+    unknown = str(uuid4())
+
+    batch = await cached_service.get_entries_by_ids(
+        [stored.id, "not-a-uuid", cached.id, unknown, stored.id]
+    )
+    assert [str(item.id) for item in batch.items] == [stored.id, cached.id]
+    assert batch.missing == ["not-a-uuid", unknown]
+
+    # Only the cache misses reach the database, as one array parameter
+    stmt, params = fake_db.execute.call_args.args
+    assert params == {"entry_ids": [UUID(stored.id), UUID(unknown)]}
+    assert "entry.id = ANY (%(entry_ids)s::UUID[])" in _compiled_sql(fake_db)
+    assert await cached_service.cache.get(stored.id) is not None
+
+    fake_db.execute.reset_mock()
+    again = await cached_service.get_entries_by_ids([cached.id, stored.id])
+    assert [str(item.id) for item in again.items] == [cached.id, stored.id]
+    fake_db.execute.assert_not_called()
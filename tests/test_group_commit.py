@@ -0,0 +1,181 @@
+import asyncio
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.db import instrumentation
+from app.schemas.entry import EntryCreate
+from app.services.entry_service import EntryService
+from app.services.group_commit import GroupCommitter
+
+
+class FakeSessions:
+    """
+    async_sessionmaker stand-in; records the rows of every INSERT it sees and
+    fires the query-count hooks the way the engine would.
+    """
+
+    def __init__(self, fail_when=lambda params: False, commit_error=None, commit_gate=None):
+        self.batches: list[list[str]] = []
+        self.commits = 0
+        self.fail_when = fail_when
+        self.commit_error = commit_error
+        self.commit_gate = commit_gate
+
+    def __call__(self):
+        session = AsyncMock()
+
+        async def execute(stmt, params):
+            context = SimpleNamespace()
+            instrumentation._before_cursor_execute(None, None, "INSERT", params, context, False)
+            instrumentation._after_cursor_execute(None, None, "INSERT", params, context, False)
+            if self.fail_when(params):
+                raise RuntimeError("insert failed")
+            self.batches.append([p["work"] for p in params])
+            now = datetime.now(UTC)
+            result = MagicMock()
+            result.all.return_value = [
+                SimpleNamespace(**p, created_at=now, updated_at=now) for p in params
+            ]
+            return result
+
+        async def commit():
+            if self.commit_gate is not None:
+                await self.commit_gate.wait()
+            self.commits += 1
+            if self.commit_error is not None:
+                raise self.commit_error
+
+        session.execute.side_effect = execute
+        session.commit.side_effect = commit
+        session.__aenter__.return_value = session
+        return session
+
+
+def entry(work: str) -> EntryCreate:
+    return EntryCreate(work=work, struggle="s", intention="i")
+
+
+@pytest.mark.anyio
+async def test_concurrent_creates_share_one_transaction():
+    sessions = FakeSessions()
+    committer = GroupCommitter(sessions, max_items=10, max_wait=0.01)
+
+    results = await asyncio.gather(*(committer.submit(entry(f"w{i}")) for i in range(5)))
+
+    assert [r.work for r in results] == ["w0", "w1", "w2", "w3", "w4"]
+    assert len({r.id for r in results}) == 5
+    assert sessions.batches == [["w0", "w1", "w2", "w3", "w4"]]
+    assert sessions.commits == 1
+    await committer.aclose()
+
+
+@pytest.mark.anyio
+async def test_batches_are_capped_at_max_items():
+    sessions = FakeSessions()
+    committer = GroupCommitter(sessions, max_items=2, max_wait=0.01)
+
+    await asyncio.gather(*(committer.submit(entry(f"w{i}")) for i in range(5)))
+
+    assert [len(b) for b in sessions.batches] == [2, 2, 1]
+    assert sessions.commits == 3
+    await committer.aclose()
+
+
+@pytest.mark.anyio
+async def test_failed_batch_is_retried_per_item():
+    # Any INSERT containing "bad" fails, so only the bad row's caller sees the error
+    sessions = FakeSessions(fail_when=lambda params: any(p["work"] == "bad" for p in params))
+    committer = GroupCommitter(sessions, max_items=10, max_wait=0.01)
+
+    results = await asyncio.gather(
+        committer.submit(entry("a")),
+        committer.submit(entry("bad")),
+        committer.submit(entry("c")),
+        return_exceptions=True,
+    )
+
+    assert results[0].work == "a" and results[2].work == "c"
+    assert isinstance(results[1], RuntimeError)
+    assert sessions.batches == [["a"], ["c"]]
+    await committer.aclose()
+
+
+@pytest.mark.anyio
+async def test_failed_commit_is_not_retried():
+    # The COMMIT may have been applied; retrying per item could insert rows twice
+    error = ConnectionError("connection lost during COMMIT")
+    sessions = FakeSessions(commit_error=error)
+    committer = GroupCommitter(sessions, max_items=10, max_wait=0.01)
+
+    results = await asyncio.gather(
+        committer.submit(entry("a")), committer.submit(entry("b")), return_exceptions=True
+    )
+
+    assert results == [error, error]
+    assert sessions.batches == [["a", "b"]]
+    assert sessions.commits == 1
+    await committer.aclose()
+
+
+@pytest.mark.anyio
+async def test_submit_waits_when_queue_is_full():
+    gate = asyncio.Event()
+    sessions = FakeSessions(commit_gate=gate)
+    committer = GroupCommitter(sessions, max_items=1, max_wait=0, max_pending=1)
+
+    tasks = [asyncio.ensure_future(committer.submit(entry(f"w{i}"))) for i in range(3)]
+    for _ in range(10):
+        await asyncio.sleep(0)
+    # w0 is stuck in COMMIT, w1 fills the queue, w2 waits for room
+    assert committer._queue is not None and committer._queue.full()
+    assert not any(task.done() for task in tasks)
+
+    gate.set()
+    assert [r.work for r in await asyncio.gather(*tasks)] == ["w0", "w1", "w2"]
+    await committer.aclose()
+
+
+@pytest.mark.anyio
+async def test_batch_queries_count_for_every_request_in_it():
+    sessions = FakeSessions()
+    committer = GroupCommitter(sessions, max_items=10, max_wait=0.01)
+
+    async def create(work: str) -> instrumentation.QueryStats:
+        with instrumentation.track_queries() as stats:
+            await committer.submit(entry(work))
+        return stats
+
+    # The worker starts inside "a"'s request, but must not keep counting into it
+    first, second = await asyncio.gather(create("a"), create("b"))
+    third = await create("c")
+    assert sessions.batches == [["a", "b"], ["c"]]
+    assert (first.queries, second.queries, third.queries) == (1, 1, 1)
+    assert first.db_seconds == second.db_seconds > 0
+    await committer.aclose()
+
+
+@pytest.mark.anyio
+async def test_aclose_flushes_queued_items():
+    sessions = FakeSessions()
+    committer = GroupCommitter(sessions, max_items=10, max_wait=60)
+
+    pending = asyncio.ensure_future(committer.submit(entry("late")))
+    await asyncio.sleep(0)
+    await committer.aclose()
+
+    assert (await pending).work == "late"
+    assert sessions.batches == [["late"]]
+
+
+@pytest.mark.anyio
+async def test_service_create_entry_delegates_to_group_commit():
+    db = AsyncMock()
+    committer = MagicMock(spec=GroupCommitter)
+    committer.submit = AsyncMock(return_value="created")
+    service = EntryService(db, group_commit=committer)
+
+    assert await service.create_entry(entry("w")) == "created"
+    db.execute.assert_not_awaited()
@@ -0,0 +1,21 @@
+from datetime import UTC, datetime
+from uuid import RFC_4122
+
+from app.core.ids import uuid7
+
+
+def test_uuid7_layout_and_embedded_time():
+    now = datetime(2026, 10, 18, 12, 30, 15, 123000, tzinfo=UTC)
+    value = uuid7(int(now.timestamp() * 1000) * 1_000_000)
+    assert value.version == 7
+    assert value.variant == RFC_4122
+    assert value.int >> 80 == int(now.timestamp() * 1000)  # unix_ts_ms
+
+
+def test_uuid7_sorts_by_creation_time():
+    base = 1_760_000_000_000_000_000
+    # Same millisecond (sub-ms fraction decides), then later milliseconds
+    stamps = [base, base + 300, base + 500_000, base + 1_000_000, base + 86_400_000_000_000]
+    ids = [uuid7(ns) for ns in stamps]
+    assert ids == sorted(ids)
+    assert len({uuid7(base) for _ in range(1000)}) == 1000  # random bits keep them unique
@@ -0,0 +1,65 @@
+"""
+Cold-start guard: `import app.main` must stay under a time budget and must not
+pull in the optional integrations (they load in the lifespan).
+Budget: IMPORT_TIME_BUDGET_MS (default below); best of a few runs to damp noise.
+"""
+
+import os
+import subprocess  # nosec B404
+import sys
+
+import pytest
+
+DEFAULT_BUDGET_MS = 1500
+RUNS = 3
+LAZY_MODULES = ("prometheus_client", "prometheus_fastapi_instrumentator", "sentry_sdk", "redis")
+
+
+def import_app_main() -> tuple[float, set[str]]:
+    """(cumulative import time of app.main in ms, modules loaded) from a fresh interpreter."""
+    code = "import sys, app.main; print(' '.join(sys.modules))"
+    proc = subprocess.run(  # nosec B603
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    line = next(ln for ln in proc.stderr.splitlines() if ln.rstrip().endswith("| app.main"))
+    cumulative_us = int(line.split("|")[1])
+    return cumulative_us / 1000, set(proc.stdout.split())
+
+
+@pytest.fixture(scope="module")
+def import_runs() -> list[tuple[float, set[str]]]:
+    return [import_app_main() for _ in range(RUNS)]
+
+
+def test_import_app_main_within_budget(import_runs):
+    budget = float(os.getenv("IMPORT_TIME_BUDGET_MS", DEFAULT_BUDGET_MS))
+    best = min(ms for ms, _ in import_runs)
+    assert best <= budget, f"import app.main took {best:.0f} ms (budget {budget:.0f} ms)"
+
+
+def test_optional_integrations_not_imported(import_runs):
+    _, modules = import_runs[0]
+    assert not modules & set(LAZY_MODULES)
+
+
+def test_no_engine_built_at_import(import_runs):
+    # Engines are created on first use; building one loads the asyncpg driver
+    _, modules = import_runs[0]
+    assert "asyncpg" not in modules
+
+
+def test_import_app_main_does_not_read_settings():
+    # An invalid setting would fail Settings(); importing must not build it
+    code = "import app.main, app.core.config as c; print(c.get_settings.cache_info().currsize)"
+    proc = subprocess.run(  # nosec B603
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "DB_PORT": "not-a-port"},
+    )
+    assert proc.stdout.strip() == "0"
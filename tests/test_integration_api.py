@@ -1,7 +1,15 @@
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
 import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
 
+from app.core.ids import uuid7
+from app.db.partitions import manage_partitions, partition_name
+from app.db.session import get_engine
 from app.main import app
+from app.services.warmup import warm_connection
 
 
 # Ensure the whole module shares a single asyncio backend/loop
@@ -53,7 +61,7 @@ async def test_list_entries_includes_created_entry(client: AsyncClient):
         # list
         list_resp = await client.get("/entries/")
         assert list_resp.status_code == 200
-        items = list_resp.json()
+        items = list_resp.json()["items"]
         assert any(it["id"] == entry_id for it in items)
     finally:
         # cleanup
@@ -99,3 +107,168 @@ async def test_delete_is_idempotent_or_404_on_second_try(client: AsyncClient):
     # second delete (some APIs return 404, others 204/200)
     del2 = await client.delete(f"/entries/{entry_id}")
     assert del2.status_code in (200, 204, 404)
+
+
+@pytest.mark.anyio
+async def test_entries_search_endpoint(client: AsyncClient):
+    # create 3 entries
+    ids = []
+    for i in range(3):
+        r = await client.post(
+            "/entries/",
+            json={"work": f"learn fastapi {i}", "struggle": "testing", "intention": "practice"},
+        )
+        assert r.status_code == 201
+        ids.append(r.json()["id"])
+
+    try:
+        # filter by q
+        r = await client.get("/entries/search", params={"q": "learn fastapi"})
+        assert r.status_code == 200
+        items = r.json()["items"]
+        assert len(items) >= 3
+        assert any("learn fastapi" in x["work"] for x in items)
+
+        # keyset pagination: walk pages of 2 and make sure nothing repeats
+        seen: list[str] = []
+        params = {"q": "learn fastapi", "limit": 2, "sort": "new"}
+        while True:
+            r = await client.get("/entries/search", params=params)
+            assert r.status_code == 200
+            page = r.json()
+            assert len(page["items"]) <= 2
+            seen.extend(x["id"] for x in page["items"])
+            if not page["next_cursor"]:
+                break
+            params["cursor"] = page["next_cursor"]
+        assert len(seen) == len(set(seen))
+        assert set(ids) <= set(seen)
+    finally:
+        # cleanup (best-effort)
+        for id_ in ids:
+            await client.delete(f"/entries/{id_}")
+
+
+@pytest.mark.anyio
+async def test_server_timing_counts_real_queries(client: AsyncClient):
+    resp = await client.get("/entries/", params={"limit": 1})
+    assert resp.status_code == 200
+    db_part = resp.headers["server-timing"].split(", ")[0]
+    # one SELECT for the page (plus any pre-ping / connection setup)
+    assert 'desc="0 queries"' not in db_part
+
+
+@pytest.mark.anyio
+async def test_warm_connection_leaves_no_rows(client: AsyncClient):
+    before = (await client.get("/entries/", params={"limit": 100})).json()["items"]
+    async with get_engine().connect() as conn:
+        await warm_connection(conn)
+    after = (await client.get("/entries/", params={"limit": 100})).json()["items"]
+    assert [e["id"] for e in after] == [e["id"] for e in before]
+
+
+@pytest.mark.anyio
+async def test_total_count_modes(client: AsyncClient):
+    r = await client.post("/entries/", json={"work": "count me", "struggle": "s", "intention": "i"})
+    entry_id = r.json()["id"]
+    try:
+        exact = await client.get("/entries/search", params={"q": "count me", "count": "exact"})
+        assert exact.headers["x-total-count-mode"] == "exact"
+        assert int(exact.headers["x-total-count"]) >= 1
+
+        estimated = await client.get(
+            "/entries/search", params={"q": "count me", "count": "estimated"}
+        )
+        assert estimated.headers["x-total-count-mode"] == "estimated"
+        assert int(estimated.headers["x-total-count"]) >= 1
+
+        listed = await client.get("/entries/", params={"count": "estimated"})
+        assert listed.headers["x-total-count-mode"] in (
+            "estimated",
+            "exact",
+        )  # exact before ANALYZE
+    finally:
+        await client.delete(f"/entries/{entry_id}")
+
+
+@pytest.mark.anyio
+async def test_stats_rollup_follows_writes(client: AsyncClient):
+    today = datetime.now(UTC).date()
+    params = {
+        "created_after": today.isoformat(),
+        "created_before": (today + timedelta(days=1)).isoformat(),
+    }
+
+    async def entries_today() -> tuple[int, float]:
+        buckets = (await client.get("/entries/stats", params=params)).json()["buckets"]
+        return (buckets[0]["entries"], buckets[0]["avg_work_length"]) if buckets else (0, 0.0)
+
+    before_count, _ = await entries_today()
+    single = await client.post(
+        "/entries/", json={"work": "x" * 10, "struggle": "s", "intention": "i"}
+    )
+    bulk = await client.post(
+        "/entries/bulk", json=[{"work": "y" * 10, "struggle": "s", "intention": "i"}]
+    )
+    ids = [single.json()["id"], bulk.json()["created"][0]["id"]]
+    try:
+        count, _ = await entries_today()
+        assert count == before_count + 2
+
+        await client.put(f"/entries/{ids[0]}", json={"work": "z" * 200})
+        count, avg_work = await entries_today()
+        assert count == before_count + 2  # an update moves lengths, not counts
+        assert avg_work > 0
+    finally:
+        for entry_id in ids:
+            await client.delete(f"/entries/{entry_id}")
+    assert (await entries_today())[0] == before_count
+
+
+@pytest.mark.anyio
+async def test_partitions_ready_ahead_and_rows_routed():
+    # The migration already created this month and the next ones
+    created, retired = await manage_partitions(get_engine(), ahead=2, dry_run=True)
+    assert created == [] and retired == []
+
+    probe = {"id": uuid7()}
+    async with get_engine().begin() as conn:
+        await conn.execute(
+            text("INSERT INTO entry (id, work, struggle, intention) VALUES (:id, 'w', 's', 'i')"),
+            probe,
+        )
+        where = await conn.execute(
+            text("SELECT tableoid::regclass::text FROM entry WHERE id = :id"), probe
+        )
+        assert where.scalar_one() == partition_name(datetime.now(UTC).date())
+        await conn.execute(text("DELETE FROM entry WHERE id = :id"), probe)
+
+
+@pytest.mark.anyio
+async def test_created_ids_are_time_ordered_uuids(client: AsyncClient):
+    payload = {"work": "v7", "struggle": "v7", "intention": "v7"}
+    ids = [UUID((await client.post("/entries/", json=payload)).json()["id"]) for _ in range(3)]
+    try:
+        assert all(entry_id.version == 7 for entry_id in ids)
+        assert ids == sorted(ids)
+        assert (await client.get(f"/entries/{str(ids[0]).upper()}")).status_code == 200
+        assert (await client.get("/entries/not-a-uuid")).status_code == 404
+    finally:
+        for entry_id in ids:
+            await client.delete(f"/entries/{entry_id}")
+
+
+@pytest.mark.anyio
+async def test_batch_get_preserves_order_and_reports_missing(client: AsyncClient):
+    payload = {"work": "batch", "struggle": "batch", "intention": "batch"}
+    ids = [(await client.post("/entries/", json=payload)).json()["id"] for _ in range(2)]
+    unknown = str(uuid7())
+    try:
+        resp = await client.post("/entries/batch-get", json={"ids": [ids[1], unknown, ids[0]]})
+        assert resp.status_code == 200
+        body = resp.json()
+        assert [item["id"] for item in body["items"]] == [ids[1], ids[0]]
+        assert body["missing"] == [unknown]
+    finally:
+        for entry_id in ids:
+            await client.delete(f"/entries/{entry_id}")
@@ -0,0 +1,47 @@
+import pytest
+from starlette.testclient import TestClient
+
+from app.core.integrations import MiddlewareSlot
+from app.main import app
+
+
+class Tag:
+    """Middleware that records its name in the ASGI scope."""
+
+    def __init__(self, app, name: str) -> None:
+        self.app = app
+        self.name = name
+
+    async def __call__(self, scope, receive, send):
+        scope.setdefault("tags", []).append(self.name)
+        await self.app(scope, receive, send)
+
+
+async def endpoint(scope, receive, send):
+    scope.setdefault("tags", []).append("endpoint")
+
+
+async def call(asgi) -> list[str]:
+    scope: dict = {"type": "http"}
+    await asgi(scope, None, None)
+    return scope["tags"]
+
+
+@pytest.mark.anyio
+async def test_slot_applies_middleware_added_before_and_after_bind():
+    slot = MiddlewareSlot()
+    slot.add_middleware(Tag, name="early")
+    asgi = slot.bind(endpoint)
+    assert await call(asgi) == ["early", "endpoint"]
+
+    slot.add_middleware(Tag, name="late")  # e.g. from lifespan, after startup
+    assert await call(asgi) == ["late", "early", "endpoint"]
+
+
+def test_lifespan_sets_up_prometheus():
+    with TestClient(app) as client:
+        client.get("/healthz")
+        response = client.get("/metrics")
+    assert response.status_code == 200
+    assert 'http_requests_total{handler="/healthz"' in response.text
+    assert 'db_queries_per_request_count{route="/healthz"}' in response.text
@@ -1,11 +1,20 @@
-from unittest.mock import AsyncMock
+import csv
+import io
+import json
+from contextlib import asynccontextmanager
+from datetime import UTC, date, datetime
+from unittest.mock import AsyncMock, MagicMock, call
 
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+from app.core.etag import entry_etag, etag_matches, page_etag
+from app.db import routing
+from app.db.session import get_session_factory
 from app.main import app
-from app.routers.journal_router import get_entry_service
-from app.schemas.entry import EntryOut
+from app.routers.journal_router import BATCH_GET_MAX_IDS, get_entry_service, get_read_entry_service
+from app.schemas.entry import EntryBatch, EntryOut, EntryPage, EntryStats, EntryStatsBucket
+from app.services.cache import LRUCache
 from app.services.entry_service import EntryService
 
 
@@ -14,6 +23,7 @@ from app.services.entry_service import EntryService
 def override_entry_service():
     mock_service = AsyncMock(spec=EntryService)
     app.dependency_overrides[get_entry_service] = lambda: mock_service
+    app.dependency_overrides[get_read_entry_service] = lambda: mock_service
     yield mock_service
     app.dependency_overrides = {}
 
@@ -78,15 +88,70 @@ async def test_get_entry_by_id_not_found(override_entry_service):
 async def test_get_all_entries(override_entry_service):
     stub1 = make_stub_entry()
     stub2 = make_stub_entry(id="223e4567-e89b-12d3-a456-426614174001", work="Something else")
-    override_entry_service.get_all_entries.return_value = [stub1, stub2]
+    override_entry_service.list_entries.return_value = EntryPage(
+        items=[stub1, stub2], next_cursor="abc"
+    )
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
-        response = await ac.get("/entries/")
+        response = await ac.get("/entries/", params={"limit": 2})
     assert response.status_code == 200
     data = response.json()
-    assert isinstance(data, list)
-    assert len(data) == 2
+    assert isinstance(data["items"], list)
+    assert len(data["items"]) == 2
+    assert data["next_cursor"] == "abc"
+    override_entry_service.list_entries.assert_awaited_once_with(
+        limit=2, cursor=None, created_after=None, created_before=None
+    )
+
+
+@pytest.mark.anyio
+async def test_list_entries_invalid_cursor(override_entry_service):
+    override_entry_service.list_entries.side_effect = ValueError("Invalid cursor")
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/entries/", params={"cursor": "garbage"})
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_search_entries(override_entry_service):
+    stub = make_stub_entry(work="learn fastapi")
+    override_entry_service.list_entries.return_value = EntryPage(items=[stub])
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get(
+            "/entries/search", params={"q": "fastapi", "sort": "old", "cursor": "c1"}
+        )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"][0]["work"] == "learn fastapi"
+    assert data["next_cursor"] is None
+    override_entry_service.list_entries.assert_awaited_once_with(
+        limit=50, cursor="c1", q="fastapi", sort="old", created_after=None, created_before=None
+    )
+
+
+@pytest.mark.anyio
+async def test_search_entries_relevance_sort(override_entry_service):
+    override_entry_service.list_entries.return_value = EntryPage(items=[])
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        ok = await ac.get("/entries/search", params={"q": "joins", "sort": "relevance"})
+        bad = await ac.get("/entries/search", params={"q": "joins", "sort": "random"})
+    assert ok.status_code == 200
+    assert bad.status_code == 422
+    override_entry_service.list_entries.assert_awaited_once_with(
+        limit=50,
+        cursor=None,
+        q="joins",
+        sort="relevance",
+        created_after=None,
+        created_before=None,
+    )
 
 
 @pytest.mark.anyio
@@ -166,33 +231,328 @@ async def test_create_entry_422_field_too_long(override_entry_service):
         response = await ac.post("/entries/", json=payload)
     assert response.status_code == 422
 
-import pytest
 
-@pytest.mark.asyncio
-async def test_entries_search_endpoint(async_client):
-    # create 3 entries
-    ids = []
-    for i in range(3):
-        r = await async_client.post("/entries/", json={
-            "work": f"learn fastapi {i}",
-            "struggle": "testing",
-            "intention": "practice"
-        })
-        assert r.status_code == 201
-        ids.append(r.json()["id"])
-
-    # filter by q
-    r = await async_client.get("/entries/search", params={"q": "fastapi"})
-    assert r.status_code == 200
-    items = r.json()
-    assert isinstance(items, list) and len(items) >= 3
-    assert any("learn fastapi" in x["work"] for x in items)
-
-    # pagination
-    r = await async_client.get("/entries/search", params={"limit": 2, "offset": 0, "sort": "new"})
-    assert r.status_code == 200
-    assert len(r.json()) <= 2
-
-    # cleanup (best-effort)
-    for id_ in ids:
-        await async_client.delete(f"/entries/{id_}")
+@pytest.fixture
+def export_chunks(monkeypatch):
+    """Feed the export stream from canned chunks instead of a DB cursor."""
+    chunks = [[make_stub_entry()], [make_stub_entry(id="223e4567-e89b-12d3-a456-426614174001")]]
+
+    async def fake_iter_entries(self, chunk_size=1000):
+        for chunk in chunks:
+            yield chunk
+
+    @asynccontextmanager
+    async def fake_session():
+        yield AsyncMock()
+
+    monkeypatch.setattr(EntryService, "iter_entries", fake_iter_entries)
+    app.dependency_overrides[get_session_factory] = lambda: fake_session
+    return chunks
+
+
+@pytest.mark.anyio
+async def test_export_entries_ndjson(export_chunks):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/entries/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[1])["id"] == "223e4567-e89b-12d3-a456-426614174001"
+
+
+@pytest.mark.anyio
+async def test_export_entries_csv(export_chunks):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/entries/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["id", "work", "struggle", "intention", "created_at", "updated_at"]
+    assert len(rows) == 3
+    assert rows[1][1] == "Did some cloud learning"
+
+
+@pytest.mark.anyio
+async def test_create_entries_bulk_reports_item_errors(override_entry_service):
+    stub = make_stub_entry()
+    override_entry_service.create_entries.return_value = [stub]
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        payload = [
+            {"work": "ok", "struggle": "ok", "intention": "ok"},
+            {"work": "a" * 257, "struggle": "ok", "intention": "ok"},
+        ]
+        response = await ac.post("/entries/bulk", json=payload)
+    assert response.status_code == 201
+    data = response.json()
+    assert len(data["created"]) == 1
+    assert data["errors"][0]["index"] == 1
+    assert data["errors"][0]["errors"][0]["loc"] == ["work"]
+    (sent,) = override_entry_service.create_entries.await_args.args
+    assert [e.work for e in sent] == ["ok"]
+
+
+@pytest.mark.anyio
+async def test_create_entries_bulk_all_invalid(override_entry_service):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post("/entries/bulk", json=[{"work": "x"}])
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["index"] == 0
+    override_entry_service.create_entries.assert_not_awaited()
+
+
+# ---------------------------
+# ETag / If-None-Match
+# ---------------------------
+
+
+@pytest.mark.anyio
+async def test_get_entry_etag_and_304(override_entry_service):
+    stub = make_stub_entry()
+    override_entry_service.get_entry_by_id.return_value = stub
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        first = await ac.get(f"/entries/{stub.id}")
+        etag = first.headers["etag"]
+        again = await ac.get(f"/entries/{stub.id}", headers={"If-None-Match": etag})
+        weak = await ac.get(f"/entries/{stub.id}", headers={"If-None-Match": f'"x", W/{etag}'})
+        stale = await ac.get(f"/entries/{stub.id}", headers={"If-None-Match": '"stale"'})
+    assert first.status_code == 200
+    assert etag == entry_etag(stub.id, stub.updated_at)
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+    assert weak.status_code == 304
+    assert stale.status_code == 200
+
+
+@pytest.mark.anyio
+async def test_get_entry_etag_changes_with_updated_at(override_entry_service):
+    old = make_stub_entry()
+    new = make_stub_entry(updated_at="2025-06-19T12:00:00")
+    override_entry_service.get_entry_by_id.return_value = new
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get(
+            f"/entries/{new.id}",
+            headers={"If-None-Match": entry_etag(old.id, old.updated_at)},
+        )
+    assert response.status_code == 200
+
+
+@pytest.mark.anyio
+async def test_list_entries_aggregate_etag(override_entry_service):
+    page = EntryPage(items=[make_stub_entry()], next_cursor="abc")
+    override_entry_service.list_entries.return_value = page
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        first = await ac.get("/entries/")
+        again = await ac.get("/entries/", headers={"If-None-Match": first.headers["etag"]})
+        override_entry_service.list_entries.return_value = EntryPage(
+            items=[make_stub_entry(updated_at="2025-06-19T12:00:00")], next_cursor="abc"
+        )
+        changed = await ac.get("/entries/", headers={"If-None-Match": first.headers["etag"]})
+    assert first.headers["etag"] == page_etag(page)
+    assert again.status_code == 304
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != first.headers["etag"]
+
+
+def test_etag_matches_wildcard_and_absent():
+    assert etag_matches("*", '"a"')
+    assert not etag_matches(None, '"a"')
+    assert not etag_matches("", '"a"')
+
+
+@pytest.mark.anyio
+async def test_writes_pin_reads_to_primary_when_replica_configured(
+    override_entry_service, monkeypatch
+):
+    override_entry_service.create_entry.return_value = make_stub_entry()
+    override_entry_service.delete_entry.return_value = True
+    payload = {"work": "w", "struggle": "s", "intention": "i"}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post("/entries/", json=payload)
+        assert routing.READ_PRIMARY_COOKIE not in response.cookies  # no replica, no cookie
+
+        monkeypatch.setattr(routing, "get_replica_session_factory", object)
+        response = await ac.post("/entries/", json=payload)
+        assert response.cookies[routing.READ_PRIMARY_COOKIE] == "1"
+        assert "Max-Age=5" in response.headers["set-cookie"]
+
+        response = await ac.delete("/entries/123")
+        assert response.status_code == 204
+        assert routing.READ_PRIMARY_COOKIE in response.cookies
+
+
+def fake_read_session(entry: EntryOut) -> AsyncMock:
+    """Session whose single-entry lookup returns `entry`."""
+    session = AsyncMock()
+    session.info = {}
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = entry
+    session.execute.return_value = result
+    return session
+
+
+@pytest.mark.anyio
+async def test_lagging_replica_never_fills_the_entry_cache(monkeypatch):
+    # The primary has the updated row; the replica still returns the old one
+    old, new = make_stub_entry(), make_stub_entry(work="Updated")
+    monkeypatch.setattr(routing, "get_session_factory", lambda: lambda: fake_read_session(new))
+    monkeypatch.setattr(
+        routing, "get_replica_session_factory", lambda: lambda: fake_read_session(old)
+    )
+    health = routing.ReplicaHealth(30)
+    monkeypatch.setattr(routing, "get_replica_health", lambda: health)
+    cache = LRUCache()
+    monkeypatch.setitem(get_read_entry_service.__globals__, "get_entry_cache", lambda: cache)
+    del app.dependency_overrides[get_read_entry_service]
+    path = f"/entries/{old.id}"
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        # Right after the write invalidated the cache: the replica's row is served, not cached
+        response = await ac.get(path)
+        assert response.json()["work"] == old.work
+        assert await cache.get(str(old.id)) is None
+
+        response = await ac.get(path, headers={"X-Read-Your-Writes": "1"})
+        assert response.json()["work"] == "Updated"
+
+        # Read-your-writes skips the cache even if it holds an older row
+        await cache.set(str(old.id), old)
+        response = await ac.get(path, headers={"Cookie": f"{routing.READ_PRIMARY_COOKIE}=1"})
+        assert response.json()["work"] == "Updated"
+
+        # Everyone else still reads through it
+        response = await ac.get(path)
+        assert response.json()["work"] == old.work
+        assert cache.stats.hits == 1
+
+
+@pytest.mark.anyio
+async def test_total_count_headers_are_opt_in(override_entry_service):
+    override_entry_service.list_entries.return_value = EntryPage(items=[make_stub_entry()])
+    override_entry_service.count_entries.return_value = (1200, "estimated")
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        plain = await ac.get("/entries/")
+        counted = await ac.get("/entries/search", params={"q": "sql", "count": "estimated"})
+        not_modified = await ac.get(
+            "/entries/", params={"count": "exact"}, headers={"If-None-Match": plain.headers["etag"]}
+        )
+        bad = await ac.get("/entries/", params={"count": "approximate"})
+
+    assert "x-total-count" not in plain.headers
+    assert counted.headers["x-total-count"] == "1200"
+    assert counted.headers["x-total-count-mode"] == "estimated"
+    assert not_modified.status_code == 304
+    assert not_modified.headers["x-total-count"] == "1200"
+    assert bad.status_code == 422
+    assert override_entry_service.count_entries.await_args_list == [
+        call(q="sql", created_after=None, created_before=None, mode="estimated"),
+        call(q=None, created_after=None, created_before=None, mode="exact"),
+    ]
+
+
+@pytest.mark.anyio
+async def test_created_range_filters_reach_list_and_count(override_entry_service):
+    override_entry_service.list_entries.return_value = EntryPage(items=[])
+    override_entry_service.count_entries.return_value = (0, "exact")
+    params = {
+        "created_after": "2025-06-01T00:00:00Z",
+        "created_before": "2025-07-01T00:00:00Z",
+        "count": "exact",
+    }
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/entries/", params=params)
+        bad = await ac.get("/entries/", params={"created_after": "last tuesday"})
+    assert response.status_code == 200
+    after = datetime(2025, 6, 1, tzinfo=UTC)
+    before = datetime(2025, 7, 1, tzinfo=UTC)
+    override_entry_service.list_entries.assert_awaited_once_with(
+        limit=50, cursor=None, created_after=after, created_before=before
+    )
+    override_entry_service.count_entries.assert_awaited_once_with(
+        q=None, created_after=after, created_before=before, mode="exact"
+    )
+    assert bad.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_entry_stats(override_entry_service):
+    override_entry_service.entry_stats.return_value = EntryStats(
+        bucket="week",
+        buckets=[
+            EntryStatsBucket(
+                start=date(2025, 6, 16),
+                entries=4,
+                avg_work_length=12.5,
+                avg_struggle_length=20.0,
+                avg_intention_length=8.25,
+            )
+        ],
+    )
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get(
+            "/entries/stats", params={"bucket": "week", "created_after": "2025-06-01"}
+        )
+        bad = await ac.get("/entries/stats", params={"bucket": "month"})
+    assert response.status_code == 200
+    assert response.json() == {
+        "bucket": "week",
+        "buckets": [
+            {
+                "start": "2025-06-16",
+                "entries": 4,
+                "avg_work_length": 12.5,
+                "avg_struggle_length": 20.0,
+                "avg_intention_length": 8.25,
+            }
+        ],
+    }
+    override_entry_service.entry_stats.assert_awaited_once_with(
+        bucket="week", created_after=date(2025, 6, 1), created_before=None
+    )
+    assert bad.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_batch_get_entries(override_entry_service):
+    first = make_stub_entry()
+    second = make_stub_entry(id="223e4567-e89b-12d3-a456-426614174001")
+    override_entry_service.get_entries_by_ids.return_value = EntryBatch(
+        items=[second, first], missing=["nope"]
+    )
+    ids = [str(second.id), "nope", str(first.id)]
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post("/entries/batch-get", json={"ids": ids})
+        too_many = await ac.post(
+            "/entries/batch-get", json={"ids": ["x"] * (BATCH_GET_MAX_IDS + 1)}
+        )
+        empty = await ac.post("/entries/batch-get", json={"ids": []})
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["id"] for item in body["items"]] == [str(second.id), str(first.id)]
+    assert body["missing"] == ["nope"]
+    override_entry_service.get_entries_by_ids.assert_awaited_once_with(ids)
+    assert too_many.status_code == 422
+    assert empty.status_code == 422
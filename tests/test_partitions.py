@@ -0,0 +1,69 @@
+from datetime import UTC, date, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from app.db.partitions import (
+    add_months,
+    create_partition,
+    month_bounds,
+    partition_month,
+    partition_name,
+    plan,
+)
+from app.models.entry import Entry
+
+
+def test_month_arithmetic_and_names():
+    assert add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert month_bounds(date(2026, 12, 15)) == (
+        datetime(2026, 12, 1, tzinfo=UTC),
+        datetime(2027, 1, 1, tzinfo=UTC),
+    )
+    assert partition_name(date(2026, 3, 1)) == "entry_2026_03"
+    assert partition_month("entry_2026_03") == date(2026, 3, 1)
+    assert partition_month("entry_default") is None
+
+
+def test_plan_creates_missing_months_ahead():
+    existing = ["entry_default", "entry_2026_10", "entry_2026_12"]
+    missing, expired = plan(existing, date(2026, 10, 18), ahead=3)
+    assert missing == [date(2026, 11, 1), date(2027, 1, 1)]
+    assert expired == []
+
+
+def test_plan_retires_only_months_past_retention():
+    existing = ["entry_default", "entry_2026_05", "entry_2026_06", "entry_2026_07", "entry_2026_10"]
+    missing, expired = plan(existing, date(2026, 10, 18), ahead=0, retain_months=4)
+    assert missing == []
+    # Keeps June..October: the current month and the 4 before it
+    assert expired == ["entry_2026_05"]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("parked", [0, 2])
+async def test_create_partition_moves_rows_out_of_default(parked):
+    conn = AsyncMock()
+    count = MagicMock()
+    count.scalar_one.return_value = parked
+    conn.execute.return_value = count
+
+    assert await create_partition(conn, date(2026, 11, 1)) == parked
+
+    statements = [str(c.args[0]) for c in conn.execute.call_args_list]
+    ddl = next(sql for sql in statements if "PARTITION OF" in sql)
+    assert ddl == (
+        "CREATE TABLE entry_2026_11 PARTITION OF entry FOR VALUES "
+        "FROM ('2026-11-01T00:00:00+00:00') TO ('2026-12-01T00:00:00+00:00')"
+    )
+    moved_back = [sql for sql in statements if sql.startswith(("DELETE", "INSERT"))]
+    assert len(moved_back) == (2 if parked else 0)
+
+
+def test_entry_table_is_range_partitioned_on_created_at():
+    ddl = str(CreateTable(Entry.__table__).compile(dialect=postgresql.dialect()))
+    assert "PRIMARY KEY (id, created_at)" in ddl
+    assert "PARTITION BY RANGE (created_at)" in ddl
@@ -0,0 +1,36 @@
+import pickle
+
+from app.core.config import Settings
+from app.serve import available_cpus, build_config
+
+
+def test_available_cpus_honours_cgroup_quota(tmp_path):
+    cpu_max = tmp_path / "cpu.max"
+    cpu_max.write_text("150000 100000\n")
+    assert available_cpus(cpu_max) == min(2, available_cpus(tmp_path / "missing"))
+
+    cpu_max.write_text("max 100000\n")
+    assert available_cpus(cpu_max) == available_cpus(tmp_path / "missing") >= 1
+
+
+def test_build_config_from_settings():
+    cfg = Settings(
+        web_concurrency=3,
+        web_host="0.0.0.0",  # nosec B104
+        web_port=9000,
+        web_max_requests=500,
+        web_graceful_timeout=10,
+    )
+    config = build_config(cfg)
+    assert config.workers == 3
+    assert (config.host, config.port) == ("0.0.0.0", 9000)
+    assert config.limit_max_requests == 500
+    assert config.timeout_graceful_shutdown == 10
+    assert config.loop == "uvloop" and config.http == "httptools"
+    pickle.dumps(config)  # workers are spawned, so the config must pickle
+
+
+def test_build_config_defaults_to_cpu_count_without_recycling():
+    config = build_config(Settings(web_concurrency=None, web_max_requests=0))
+    assert config.workers == available_cpus()
+    assert config.limit_max_requests is None
@@ -0,0 +1,124 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import Settings
+from app.core.server_timing import QueryStatsMiddleware
+from app.db import instrumentation, metrics
+from app.db.session import create_engine
+
+
+def fake_query(context: SimpleNamespace) -> None:
+    """Fire the engine hooks the way a cursor execute would."""
+    instrumentation._before_cursor_execute(None, None, "SELECT 1", (), context, False)
+    instrumentation._after_cursor_execute(None, None, "SELECT 1", (), context, False)
+
+
+def make_app(warn_threshold: int = 0, header: bool = True) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, warn_threshold=warn_threshold, header=header)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int) -> dict[str, int]:
+        for _ in range(item_id):
+            fake_query(SimpleNamespace())
+        return {"id": item_id}
+
+    return app
+
+
+async def get(app: FastAPI, path: str):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        return await ac.get(path)
+
+
+def test_create_engine_instruments_once():
+    engine = create_engine(Settings(db_pool="null"))
+    instrumentation.instrument_engine(engine)  # second call is a no-op
+    target = engine.sync_engine
+    assert event.contains(target, "before_cursor_execute", instrumentation._before_cursor_execute)
+    assert len(target.dispatch.after_cursor_execute) == 1
+
+
+def test_queries_outside_scope_are_ignored():
+    context = SimpleNamespace()
+    fake_query(context)
+    assert instrumentation.current_stats() is None
+    assert vars(context) == {}
+
+    with instrumentation.track_queries() as stats:
+        fake_query(context)
+        fake_query(context)
+    assert stats.queries == 2
+    assert stats.db_seconds >= 0
+    assert instrumentation.current_stats() is None
+
+
+@pytest.mark.anyio
+async def test_failed_statement_counted_and_leaves_nothing_on_the_connection():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    instrumentation.instrument_engine(engine)
+    try:
+        async with engine.connect() as conn:
+            with instrumentation.track_queries() as stats:
+                with pytest.raises(DBAPIError):
+                    await conn.exec_driver_sql("SELECT * FROM missing_table")
+                await conn.exec_driver_sql("SELECT 1")
+            connection_info = dict(conn.info)
+    finally:
+        await engine.dispose()
+    assert stats.queries == 2
+    assert connection_info == {}
+
+
+@pytest.mark.anyio
+async def test_server_timing_header_reports_query_count():
+    response = await get(make_app(), "/items/3")
+    assert response.status_code == 200
+    db, app_part = response.headers["server-timing"].split(", ")
+    assert db.startswith("db;dur=") and db.endswith('desc="3 queries"')
+    assert app_part.startswith("app;dur=")
+
+
+@pytest.mark.anyio
+async def test_server_timing_header_can_be_disabled():
+    response = await get(make_app(header=False), "/items/1")
+    assert "server-timing" not in response.headers
+
+
+@pytest.mark.anyio
+async def test_warns_when_query_threshold_exceeded(caplog):
+    app = make_app(warn_threshold=2)
+    with caplog.at_level(logging.WARNING, logger="app.core.server_timing"):
+        await get(app, "/items/2")
+        assert not caplog.records
+        await get(app, "/items/5")
+    assert "GET /items/{item_id} ran 5 queries (threshold 2" in caplog.text
+
+
+@pytest.mark.anyio
+async def test_request_db_metrics_labelled_by_route(monkeypatch):
+    monkeypatch.setattr(metrics, "_request_queries", None)
+    monkeypatch.setattr(metrics, "_request_db_time", None)
+    for name in ("db_queries_per_request", "db_time_per_request_seconds"):
+        if name in REGISTRY._names_to_collectors:
+            REGISTRY.unregister(REGISTRY._names_to_collectors[name])
+    metrics.register_request_db_metrics()
+
+    app = make_app()
+    await get(app, "/items/4")
+    await get(app, "/nope")
+
+    labels = {"route": "/items/{item_id}"}
+    assert REGISTRY.get_sample_value("db_queries_per_request_count", labels) == 1
+    assert REGISTRY.get_sample_value("db_queries_per_request_sum", labels) == 4
+    assert REGISTRY.get_sample_value("db_time_per_request_seconds_count", labels) == 1
+    assert REGISTRY.get_sample_value("db_queries_per_request_count", {"route": "<unmatched>"}) == 1
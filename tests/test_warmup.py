@@ -0,0 +1,85 @@
+import asyncio
+import logging
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.testclient import TestClient
+
+from app.core.config import Settings
+from app.db.session import create_engine
+from app.main import app
+from app.services import warmup
+
+UNREACHABLE = "postgresql+asyncpg://u:p@127.0.0.1:1/nowhere"
+
+
+def test_warm_schemas():
+    warmup.warm_schemas()
+
+
+@pytest.mark.anyio
+async def test_warm_pool_skips_null_pool():
+    engine = create_engine(Settings(db_pool="null"), UNREACHABLE)
+    assert await warmup.warm_pool(engine, 5) == 0
+
+
+@pytest.mark.anyio
+async def test_warm_pool_opens_distinct_connections_up_to_pool_size(monkeypatch):
+    engine = create_engine(Settings(db_pool="queue", db_pool_size=3), UNREACHABLE)
+    seen = []
+
+    class FakeConnect:
+        async def __aenter__(self):
+            conn = object()
+            seen.append(conn)
+            await asyncio.sleep(0)
+            return conn
+
+        async def __aexit__(self, *exc):
+            return None
+
+    async def fake_warm_connection(conn, *, writes=True):
+        assert writes is False
+
+    monkeypatch.setattr(type(engine), "connect", lambda self: FakeConnect())
+    monkeypatch.setattr(warmup, "warm_connection", fake_warm_connection)
+
+    assert await warmup.warm_pool(engine, 10, writes=False) == 3
+    assert len({id(c) for c in seen}) == 3
+
+
+@pytest.mark.anyio
+async def test_warm_up_failure_is_logged_not_raised(caplog):
+    engine = create_engine(Settings(db_pool="queue", db_pool_size=1), UNREACHABLE)
+    with caplog.at_level(logging.WARNING, logger="app.services.warmup"):
+        assert await warmup.warm_up(engine, connections=1, timeout=5) is False
+    assert "Warm-up incomplete" in caplog.text
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_warm_up_times_out(monkeypatch):
+    async def slow_pool(engine, connections, *, writes=True):
+        await asyncio.sleep(10)
+        return connections
+
+    monkeypatch.setattr(warmup, "warm_pool", slow_pool)
+    engine = create_engine(Settings(db_pool="null"), UNREACHABLE)
+    assert await warmup.warm_up(engine, connections=1, timeout=0.01) is False
+
+
+@pytest.mark.anyio
+async def test_readyz_only_after_startup():
+    # ASGITransport does not run the lifespan, so the worker never became ready
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/readyz")
+    assert response.status_code == 503
+    assert response.json() == {"status": "starting"}
+
+
+def test_readyz_after_lifespan_warm_up():
+    with TestClient(app) as client:
+        response = client.get("/readyz")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready"}
+    assert app.state.ready is False  # reset during shutdown